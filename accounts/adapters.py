@@ -38,8 +38,11 @@ class CustomSocialAccountAdapter(DefaultSocialAccountAdapter):
             nickname = base_nickname
             counter = 1
             
-            # 닉네임이 중복되면 숫자를 붙여서 고유하게 만들기
-            while UserProfile.objects.filter(nickname=nickname).exists():
+            # 닉네임이 중복되면 숫자를 붙여서 고유하게 만들기 (사용 중인 닉네임은 한 번에 조회)
+            taken = set(
+                UserProfile.objects.filter(nickname__startswith=base_nickname).values_list('nickname', flat=True)
+            )
+            while nickname in taken:
                 nickname = f"{base_nickname}_{counter}"
                 counter += 1
             
@@ -0,0 +1,140 @@
+"""
+프로필 이미지 처리
+- 요청 안에서는 검증 후 원본만 저장하고 바로 응답 (처리 전까지는 원본 URL을 그대로 보여줌)
+- 작업 큐(jobs, manage.py run_worker)에서 디코딩 → EXIF 회전 반영/메타데이터 제거 → 정사각형으로 잘라 AVATAR_SIZES로 축소 → WebP로 저장
+- 처리가 끝나면 프로필 URL을 큰 사이즈로 바꾸고 profiles/<user_id>/ 의 예전 파일은 삭제
+
+사용 순서:
+    path = store_upload(file, user.id)       # 검증 + 원본 저장 (ValueError)
+    profile.profile_image_url = storage_url(path)
+    profile.save()
+    process_later(user.id, path)              # 프로필을 저장한 뒤에 추가해야 처리 결과가 덮어써지지 않음
+"""
+import os
+import posixpath
+import re
+import time
+from io import BytesIO
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from jobs.queue import enqueue
+
+from .models import UserProfile
+
+MAX_MB = 5
+MAX_PIXELS = 40_000_000  # 디코딩 전에 거르는 해상도 상한 (압축 폭탄 방지)
+AVATAR_SIZES = (256, 96)  # 첫 번째가 profile_image_url, 나머지는 작은 표시용
+AVATAR_FORMAT, AVATAR_EXT = ('WEBP', 'webp') if features.check('webp') else ('JPEG', 'jpg')
+AVATAR_QUALITY = 82
+
+# 파일 이름 앞의 토큰: 밀리초 시각(12자리 hex) + 난수 → 이름 순서 = 업로드 순서
+TOKEN_RE = re.compile(r'^([0-9a-f]{18})-')
+
+
+def storage_url(path):
+    return default_storage.url(path) if hasattr(default_storage, "url") else f"{settings.MEDIA_URL}{path}"
+
+
+def user_dir(user_id):
+    return f"profiles/{user_id}"
+
+
+def new_token():
+    return f"{time.time_ns() // 1_000_000:012x}{uuid4().hex[:6]}"
+
+
+def store_upload(file, user_id):
+    """업로드 파일 검증 후 원본 그대로 저장 → storage 경로 (이미지가 아니면 ValueError)"""
+    if not str(file.content_type).startswith("image/"):
+        raise ValueError("이미지 파일만 업로드 가능합니다.")
+    if file.size > MAX_MB * 1024 * 1024:
+        raise ValueError(f"{MAX_MB}MB 이하만 업로드 가능합니다.")
+
+    # 헤더만 읽어서 실제 이미지인지, 해상도가 너무 크지 않은지 확인 (전체 디코딩은 백그라운드에서)
+    try:
+        with Image.open(file) as img:
+            width, height = img.size
+    except Image.DecompressionBombError:
+        # PIL 자체 상한(MAX_IMAGE_PIXELS의 2배)을 넘으면 open에서 바로 예외 (OSError가 아님)
+        raise ValueError("이미지 해상도가 너무 큽니다.")
+    except (UnidentifiedImageError, OSError):
+        raise ValueError("이미지 파일만 업로드 가능합니다.")
+    if width * height > MAX_PIXELS:
+        raise ValueError("이미지 해상도가 너무 큽니다.")
+    file.seek(0)
+
+    ext = os.path.splitext(file.name)[1].lower()
+    return default_storage.save(f"{user_dir(user_id)}/{new_token()}-orig{ext}", file)
+
+
+def render_avatars(data):
+    """원본 바이트 → {size: 인코딩된 바이트} (정사각형 중앙 crop, EXIF 등 메타데이터는 다시 저장하면서 빠짐)"""
+    with Image.open(BytesIO(data)) as img:
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ('RGBA', 'LA', 'P') and AVATAR_FORMAT == 'WEBP'
+        img = img.convert('RGBA' if has_alpha else 'RGB')
+        side = min(img.size)
+        img = ImageOps.fit(img, (side, side), Image.Resampling.LANCZOS)
+        outputs = {}
+        for size in AVATAR_SIZES:
+            buf = BytesIO()
+            img.resize((size, size), Image.Resampling.LANCZOS).save(buf, AVATAR_FORMAT, quality=AVATAR_QUALITY)
+            outputs[size] = buf.getvalue()
+    return outputs
+
+
+def collect_garbage(user_id, current_token):
+    """profiles/<user_id>/ 에서 현재 이미지보다 먼저 올린 파일(+ 예전 uuid 이름 파일) 삭제"""
+    try:
+        _, files = default_storage.listdir(user_dir(user_id))
+    except FileNotFoundError:
+        return 0
+    removed = 0
+    for name in files:
+        match = TOKEN_RE.match(name)
+        # 토큰이 더 큰 파일은 이 작업 이후에 올라온 업로드이므로 건드리지 않음
+        if match and match.group(1) >= current_token:
+            continue
+        default_storage.delete(f"{user_dir(user_id)}/{name}")
+        removed += 1
+    return removed
+
+
+def process_avatar(user_id, path):
+    """원본(path)을 아바타 크기별 파일로 변환하고, 프로필이 아직 이 원본을 가리키면 교체 + 예전 파일 정리"""
+    token = TOKEN_RE.match(posixpath.basename(path)).group(1)
+    with default_storage.open(path, 'rb') as f:
+        data = f.read()
+    saved = []
+    for size, content in render_avatars(data).items():
+        saved.append(default_storage.save(f"{user_dir(user_id)}/{token}-{size}.{AVATAR_EXT}", ContentFile(content)))
+
+    updated = UserProfile.objects.filter(user_id=user_id, profile_image_url=storage_url(path)).update(
+        profile_image_url=storage_url(saved[0])
+    )
+    if not updated:
+        # 처리하는 사이에 다른 이미지로 바뀜 → 만든 파일은 버림
+        for name in saved + [path]:
+            default_storage.delete(name)
+        return None
+    default_storage.delete(path)
+    collect_garbage(user_id, token)
+    return saved[0]
+
+
+def process_later(user_id, path):
+    """process_avatar를 작업 큐에 추가 (실패하면 재시도, 끝내 실패하면 원본 URL이 그대로 남음)"""
+    return enqueue('accounts.process_avatar', user_id=user_id, path=path)
+
+
+def small_avatar_url(url):
+    """처리된 프로필 이미지면 작은 사이즈 URL, 아니면 그대로"""
+    large, small = f"-{AVATAR_SIZES[0]}.{AVATAR_EXT}", f"-{AVATAR_SIZES[-1]}.{AVATAR_EXT}"
+    if url and url.endswith(large):
+        return url[:-len(large)] + small
+    return url
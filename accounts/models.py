@@ -15,6 +15,12 @@ class UserProfile(models.Model):
 
     def __str__(self):
         return self.nickname
+
+    @property
+    def profile_image_small_url(self):
+        """작은 표시용 프로필 이미지 (accounts/avatars.py 처리 전이면 원본 URL)"""
+        from .avatars import small_avatar_url
+        return small_avatar_url(self.profile_image_url)
     
     # 시간 필드
     created_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,16 @@
+from jobs.queue import task
+
+from .avatars import process_avatar
+from .withdrawal import delete_user_data
+
+
+@task('accounts.process_avatar')
+def process_avatar_task(job, user_id, path):
+    """업로드된 프로필 원본을 아바타 크기별 WebP로 변환 (accounts/avatars.py)"""
+    job.set_progress(result=process_avatar(user_id, path))
+
+
+@task('accounts.delete_user')
+def delete_user_task(job, user_id):
+    """탈퇴한 사용자의 데이터를 batch 단위로 삭제 (accounts/withdrawal.py)"""
+    delete_user_data(user_id, progress=job.set_progress)
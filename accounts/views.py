@@ -1,7 +1,5 @@
 # accounts/views.py
 import json
-import os
-from uuid import uuid4
 
 from django.contrib.auth.models import User
 from django.contrib.auth import login
@@ -10,26 +8,10 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect
 from django.http import JsonResponse
 
-from django.conf import settings
-from django.core.files.storage import default_storage
-
+from .avatars import process_later, storage_url, store_upload
 from .models import UserProfile
 
 
-MAX_MB = 5
-
-def _save_image_and_get_url(file, user_id):
-    if not str(file.content_type).startswith("image/"):
-        raise ValueError("이미지 파일만 업로드 가능합니다.")
-    if file.size > MAX_MB * 1024 * 1024:
-        raise ValueError(f"{MAX_MB}MB 이하만 업로드 가능합니다.")
-
-    ext = os.path.splitext(file.name)[1].lower()
-    path = f"profiles/{user_id}/{uuid4()}{ext}"
-    saved = default_storage.save(path, file)
-    return default_storage.url(saved) if hasattr(default_storage, "url") else f"{settings.MEDIA_URL}{saved}"
-
-
 @csrf_exempt
 @login_required(login_url='/accounts/login/')
 def profile(request):
@@ -57,11 +39,15 @@ def profile(request):
             profile.user_gender = request.POST.get("user_gender") or profile.user_gender
             profile.user_age    = request.POST.get("user_age") or profile.user_age
 
+            upload = None
             if request.FILES.get("profile_image"):
-                image_url = _save_image_and_get_url(request.FILES["profile_image"], request.user.id)
-                profile.profile_image_url = image_url
+                upload = store_upload(request.FILES["profile_image"], request.user.id)
+                profile.profile_image_url = storage_url(upload)
 
             profile.save()
+            # 리사이즈/재인코딩은 백그라운드에서 (프로필 저장 후에 예약)
+            if upload:
+                process_later(request.user.id, upload)
 
             return redirect('/mypage/?saved=1')
 
@@ -108,13 +94,16 @@ def signup(request):
             profile.user_gender = gender
             profile.user_age = age
 
+            upload = None
             if request.FILES.get("profile_image"):
-                image_url = _save_image_and_get_url(request.FILES["profile_image"], user.id)
-                profile.profile_image_url = image_url
+                upload = store_upload(request.FILES["profile_image"], user.id)
+                profile.profile_image_url = storage_url(upload)
             else:
                 profile.profile_image_url = None
 
             profile.save()
+            if upload:
+                process_later(user.id, upload)
 
             login(request, user)
             return redirect("/")
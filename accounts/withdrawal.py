@@ -0,0 +1,118 @@
+"""
+회원 탈퇴
+- 요청 안에서는 계정 비활성화(is_active=False) + 로그아웃만 하고 삭제는 작업 큐(accounts.delete_user)로 넘김
+  (비활성 계정은 ModelBackend가 세션을 인정하지 않으므로 다른 기기 세션도 바로 끊김)
+- 작업에서는 User를 참조하는 테이블(식단, 즐겨찾기, 프로필, allauth, admin 로그 ...)을 모델 메타데이터로 찾아
+  자식 테이블부터 batch_size 행씩 raw SQL로 삭제 → Django collector처럼 전체 행을 메모리에 올리지 않음
+- 재시도해도 이미 지운 행은 건너뛰므로 안전함
+"""
+from django.contrib.auth import get_user_model, logout
+from django.core.files.storage import default_storage
+from django.db import connection, models
+
+from jobs.queue import enqueue
+
+from .avatars import user_dir
+
+DELETE_BATCH_SIZE = 5000
+MAX_DEPTH = 4
+
+
+def withdraw(request):
+    """현재 사용자를 비활성화하고 로그아웃한 뒤 삭제 작업 추가 → Job"""
+    user = request.user
+    get_user_model().objects.filter(pk=user.pk).update(is_active=False)
+    logout(request)
+    return enqueue('accounts.delete_user', user_id=user.pk)
+
+
+def deletion_plan(model, path='', depth=0):
+    """
+    model 행을 지우기 전에 처리해야 할 (모델, 조회 경로, FK 필드, 동작) 목록을 자식부터 순서대로
+    - 동작: 'delete'(CASCADE) / 'set_null'(SET_NULL)
+    - 다대다 중간 테이블처럼 숨겨진 역참조도 포함
+    """
+    if depth >= MAX_DEPTH:
+        raise RuntimeError(f"참조 깊이가 너무 깊습니다: {model._meta.label}")
+    plan = []
+    for rel in model._meta.get_fields(include_hidden=True):
+        if not (rel.auto_created and not rel.concrete and (rel.one_to_many or rel.one_to_one)):
+            continue
+        related = rel.related_model
+        lookup = f"{rel.field.name}__{path}" if path else rel.field.name
+        on_delete = rel.on_delete
+        if on_delete is models.CASCADE:
+            plan += deletion_plan(related, lookup, depth + 1)
+            plan.append((related, lookup, rel.field, 'delete'))
+        elif on_delete is models.SET_NULL:
+            plan.append((related, lookup, rel.field, 'set_null'))
+        elif on_delete is models.DO_NOTHING:
+            continue
+        else:
+            raise RuntimeError(f"일괄 삭제할 수 없는 참조입니다: {related._meta.label}.{rel.field.name} ({on_delete.__name__})")
+    return plan
+
+
+def _batch_sql(model, lookup, user_id, batch_size):
+    """lookup=user_id 인 행의 pk를 최대 batch_size개 고르는 서브쿼리 SQL"""
+    pks = model._base_manager.filter(**{lookup: user_id}).values('pk')[:batch_size]
+    return pks.query.sql_with_params()
+
+
+def delete_in_batches(model, lookup, user_id, batch_size, set_null_field=None, on_batch=None):
+    """조건에 맞는 행이 없을 때까지 batch_size 행씩 DELETE(또는 UPDATE ... SET NULL) → 처리한 행 수"""
+    qn = connection.ops.quote_name
+    table, pk = qn(model._meta.db_table), qn(model._meta.pk.column)
+    total = 0
+    while True:
+        sql, params = _batch_sql(model, lookup, user_id, batch_size)
+        if set_null_field is None:
+            statement = f"DELETE FROM {table} WHERE {pk} IN (SELECT * FROM ({sql}) AS batch)"
+        else:
+            statement = f"UPDATE {table} SET {qn(set_null_field.column)} = NULL WHERE {pk} IN (SELECT * FROM ({sql}) AS batch)"
+        # autocommit: batch마다 바로 커밋 → 락을 짧게 유지
+        with connection.cursor() as cur:
+            cur.execute(statement, params)
+            count = cur.rowcount
+        total += count
+        if on_batch and count:
+            on_batch(total)
+        if count < batch_size:
+            return total
+
+
+def delete_user_data(user_id, batch_size=DELETE_BATCH_SIZE, progress=None):
+    """user_id의 모든 의존 행과 사용자 행, 프로필 이미지 파일 삭제 → {테이블: 삭제한 행 수}"""
+    User = get_user_model()
+    deleted = {}
+
+    def report(step):
+        if progress:
+            progress(step=step, deleted=deleted)
+
+    for model, lookup, field, action in deletion_plan(User):
+        label = model._meta.db_table
+
+        def on_batch(total, label=label):
+            deleted[label] = total
+            report(label)
+
+        count = delete_in_batches(
+            model, lookup, user_id, batch_size,
+            set_null_field=field if action == 'set_null' else None,
+            on_batch=on_batch,
+        )
+        deleted[label] = count
+
+    deleted[User._meta.db_table] = User._base_manager.filter(pk=user_id)._raw_delete(connection.alias)
+
+    # 프로필 이미지 파일
+    try:
+        _, files = default_storage.listdir(user_dir(user_id))
+    except FileNotFoundError:
+        files = []
+    for name in files:
+        default_storage.delete(f"{user_dir(user_id)}/{name}")
+    deleted['files'] = len(files)
+    report('done')
+    return deleted
@@ -1,3 +1,29 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from foods.catalog import bump_catalog_version
+from foods.models import Food
+from diets.models import Diet
+from monitoring.tests import QueryBudgetTestCase
+
+
+class AnalysisCacheTests(QueryBudgetTestCase):
+
+    FOODS = 1
+
+    def setUp(self):
+        super().setUp()
+        self.today = datetime.date.today()
+        Diet.objects.create(user=self.user, food=self.foods[0], meal='아침', date=self.today)
+        self.client.force_login(self.user)
+        self.url = f'/analysis/result/?start_date={self.today}&end_date={self.today}'
+
+    def calorie(self):
+        return self.client.get(self.url).context['avg_calorie_per_day']
+
+    def test_recomputed_after_catalog_change(self):
+        before = self.calorie()
+        # 재임포트/rescore_foods처럼 시그널 없는 bulk 수정 + 카탈로그 버전 올림
+        Food.objects.filter(pk=self.foods[0].pk).update(calorie=500.0)
+        self.assertEqual(self.calorie(), before)
+        bump_catalog_version()
+        self.assertNotEqual(self.calorie(), before)
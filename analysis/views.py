@@ -1,6 +1,10 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from diets.models import Diet
+from diets.versions import diet_version
+from foods.catalog import catalog_version
+from django.core.cache import cache
+from monitoring.metrics import record_cache
 from datetime import datetime, timedelta
 from django.db.models import Sum, F, Count, Q
 from django.db.models.functions import Coalesce
@@ -189,6 +193,22 @@ def get_real_nutrient(food, nutrient_name):
         return nutrient / 100 * serving_size
     return nutrient / standard_amount * serving_size
 
+ANALYSIS_CACHE_SECONDS = 3600
+
+# 분석 결과 캐시: 키가 (사용자, 기간, 식단 버전, 카탈로그 버전)이라 식단/프로필이 바뀌거나(diets/signals.py)
+# 식품 영양 정보/등급이 바뀌면(재임포트, rescore_foods, 관리자 수정 - foods/catalog.py) 자동으로 새로 계산됨
+# 템플릿도 같은 키로 fragment 캐시하므로 두 버전을 context에 넣어 둠
+def cached_analysis(kind, user, start_date, end_date, build):
+    version = diet_version(user.id)
+    catalog = catalog_version()
+    key = f"analysis:{kind}:{user.id}:{start_date}:{end_date}:{version}:{catalog}"
+    context = cache.get(key)
+    record_cache(f"analysis_{kind}", context is not None)
+    if context is None:
+        context = build(user, start_date, end_date)
+        cache.set(key, context, ANALYSIS_CACHE_SECONDS)
+    return {**context, "diet_version": version, "catalog_version": catalog, "cache_seconds": ANALYSIS_CACHE_SECONDS}
+
 #메인 분석 페이지 뷰
 @login_required
 def analysis_main(request):
@@ -205,12 +225,20 @@ def analysis_main(request):
     # 분석 시작 날짜가 끝 날짜보다 뒤인 경우 예외처리
     if start_date > end_date:
         return HttpResponseBadRequest("분석 시작 날짜는 끝 날짜보다 이전이어야 합니다.")
-    
+
+    context = cached_analysis('main', user, start_date, end_date, main_context)
+
+    #나중에 프론트에서 main.html 같은 템플릿 만들고 나면 아래 주석처리 해놓은 render 함수로 바꿔 사용해주세요!
+    return render(request, "analysis/analysis_main.html", context)
+    # return JsonResponse(context, json_dumps_params={'ensure_ascii': False})
+
+
+def main_context(user, start_date, end_date):
     day_difference = (end_date - start_date).days + 1 #몇 일 차이인지 계산(양 끝 날짜 포함)
 
     #자주 쓰게 될 쿼리셋을 미리 조회해서 저장해둠
     diet_query_set = Diet.objects.select_related('food').filter(
-        user=request.user,
+        user=user,
         date__range=(start_date, end_date)
     )
 
@@ -336,10 +364,7 @@ def analysis_main(request):
         "start_date": start_date.strftime('%Y-%m-%d'),
         "end_date": end_date.strftime('%Y-%m-%d'),
     }
-
-    #나중에 프론트에서 main.html 같은 템플릿 만들고 나면 아래 주석처리 해놓은 render 함수로 바꿔 사용해주세요!
-    return render(request, "analysis/analysis_main.html", context)
-    # return JsonResponse(context, json_dumps_params={'ensure_ascii': False})
+    return context
 
 
 # 표준편차를 입력 받아서 분석 메세지를 반환하는 함수
@@ -365,11 +390,19 @@ def analysis_diet(request):
     # 분석 시작 날짜가 끝 날짜보다 뒤인 경우 예외처리
     if start_date > end_date:
         return HttpResponseBadRequest("분석 시작 날짜는 끝 날짜보다 이전이어야 합니다.")
-    
+
+    context = cached_analysis('diet', request.user, start_date, end_date, diet_context)
+
+    #나중에 프론트에서 diet_analysis.html 같은 템플릿 만들고 나면 아래 주석처리 해놓은 render 함수로 바꿔 사용해주세요!
+    return render(request, "analysis/analysis_diet.html", context)
+    #return JsonResponse(context, json_dumps_params={'ensure_ascii': False})
+
+
+def diet_context(user, start_date, end_date):
     day_difference = (end_date - start_date).days + 1 #몇 일 차이인지 계산(양 끝 날짜 포함)
 
     diet_query_set = Diet.objects.select_related('food').filter(
-        user=request.user,
+        user=user,
         date__range=(start_date, end_date)
     ).order_by('date')
 
@@ -468,10 +501,7 @@ def analysis_diet(request):
         },
         "meal_pattern_analysis": meal_pattern_analysis,
     }
-
-    #나중에 프론트에서 diet_analysis.html 같은 템플릿 만들고 나면 아래 주석처리 해놓은 render 함수로 바꿔 사용해주세요!
-    return render(request, "analysis/analysis_diet.html", context)
-    #return JsonResponse(context, json_dumps_params={'ensure_ascii': False})
+    return context
 
 
 NUTRIENTS = [
@@ -174,7 +174,10 @@ def NutritionalScore(food):
 
 # 식품의 영양점수를 기반으로 레터그레이드를 반환하는 함수 (A~E)
 def letterGrade(food):
-    score = NutritionalScore(food)
+    return scoreToGrade(NutritionalScore(food))
+
+# 이미 계산된 영양점수를 레터그레이드로 변환하는 함수 (점수를 두 번 계산하지 않기 위함)
+def scoreToGrade(score):
     if score <= 5:
         return "E"
     elif score <= 10:
@@ -0,0 +1,65 @@
+"""
+운영용 정적 파일 저장소 (config/settings/production.py STORAGES)
+- ManifestStaticFilesStorage: collectstatic 때 파일 이름에 내용 해시를 붙임 (main.css → main.3f2a9c1d04be.css)
+  → 내용이 바뀌면 URL도 바뀌므로 nginx에서 1년 캐시 (nginx.conf의 /static/ 해시 파일 location)
+- 압축할 수 있는 파일은 .gz / .br을 미리 만들어 둠 → nginx gzip_static(brotli_static)이 요청마다 압축하지 않고 바로 전송
+- brotli 패키지가 없으면 .gz만 생성
+"""
+import gzip
+import logging
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - requirements.txt에 있지만 없어도 동작
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESS_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.map', '.txt', '.html', '.xml', '.ico')
+MIN_COMPRESS_BYTES = 256  # 이보다 작으면 헤더 비용이 더 큼
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # manifest에 없는 파일(예: 템플릿이 참조하는데 static/에 없는 diets/images/default-food.jpg)이어도
+            # 페이지가 500이 되지 않게 원래 이름으로 대체
+            logger.warning("정적 파일 manifest에 없음: %s", name)
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # 원래 이름(JS에 하드코딩된 /static/... 경로용)과 해시 이름 모두 압축
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(COMPRESS_EXTENSIONS) and self.exists(name):
+                for compressed in self.compress(name):
+                    yield name, compressed, True
+
+    def compress(self, name):
+        """name.gz / name.br 생성 → 만든 파일 이름 목록 (원본보다 작을 때만)"""
+        with self.open(name) as f:
+            data = f.read()
+        if len(data) < MIN_COMPRESS_BYTES:
+            return []
+
+        created = []
+        encoders = [('.gz', lambda raw: gzip.compress(raw, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            encoders.append(('.br', lambda raw: brotli.compress(raw, quality=11)))
+        for suffix, encode in encoders:
+            body = encode(data)
+            if len(body) >= len(data):
+                continue
+            path = self.path(name + suffix)
+            with open(path, 'wb') as f:
+                f.write(body)
+            created.append(name + suffix)
+        return created
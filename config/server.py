@@ -0,0 +1,25 @@
+"""
+gunicorn 워커 구성 (gunicorn.conf.py와 config/settings/production.py가 같이 사용 - Django 없이 import 가능)
+- SERVER_MODE=wsgi (기본): gthread 워커, 워커마다 스레드 GUNICORN_THREADS개가 요청을 동시에 처리
+  (GUNICORN_THREADS=1이면 예전처럼 sync 워커)
+- SERVER_MODE=asgi: uvicorn 워커 (동시 처리는 이벤트 루프가 담당)
+- WEB_CONCURRENCY(워커 수) 기본값: 이 컨테이너가 쓸 수 있는 CPU 수 (최소 2)
+  → 동시 처리는 스레드/이벤트 루프가 하므로 CPU보다 많은 프로세스를 띄워 메모리를 쓰지 않음
+"""
+import os
+
+SERVER_MODE = os.getenv('SERVER_MODE', 'wsgi').lower()
+if SERVER_MODE not in ('wsgi', 'asgi'):
+    raise RuntimeError(f"SERVER_MODE는 wsgi 또는 asgi 여야 합니다: {SERVER_MODE}")
+
+
+def cpu_count():
+    """CPU affinity(컨테이너 cpuset) 기준 CPU 수"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY') or max(2, cpu_count()))
+THREADS = int(os.getenv('GUNICORN_THREADS', '4')) if SERVER_MODE == 'wsgi' else 1
@@ -34,6 +34,8 @@ INSTALLED_APPS = [
     'analysis',
     'products',
     'search',
+    'jobs',
+    'monitoring',
 ]
 
 SITE_ID = 1
@@ -52,6 +54,9 @@ SOCIALACCOUNT_ADAPTER = "accounts.adapters.CustomSocialAccountAdapter"
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'monitoring.metrics.MetricsMiddleware',
+    'monitoring.profiler.ProfilerMiddleware',
+    'monitoring.queries.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -114,6 +119,50 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# 캐시 (개발용 - 배포는 production.py에서 Redis/파일 캐시로 교체)
+# - default: 검색 토큰, 식품 카드/분석 fragment 캐시
+# - versions: 카탈로그·식단·즐겨찾기 버전 토큰 (foods/catalog.py) - fragment가 밀려날 때 같이 지워지지 않도록 분리
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'default'},
+    'versions': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'versions',
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 1_000_000},
+    },
+}
+
+# 요청별 SQL 쿼리 집계 (monitoring/queries.py)
+# - 뷰 이름별 최대 쿼리 수, 넘으면 경고 로그 (QUERY_BUDGET_STRICT = True면 예외 → 테스트에서 사용)
+# - 같은 모양 SQL이 N_PLUS_ONE_THRESHOLD번 이상 반복되면 N+1 경고
+# - 예산은 로그인 + 캐시가 빈 첫 요청 기준 (세션, 사용자, 프로필, 카탈로그 스냅샷 2개, 카드 식품 → main_page 6개)
+#   각 앱 tests.py가 QUERY_BUDGET_STRICT로 콜드/웜 요청을 확인
+QUERY_BUDGETS = {
+    'main:main_page': 6,
+    'search:normal_search': 4,
+    'search:search_before': 5,
+    'search:diet_search': 6,
+    'products:product-detail': 4,
+    'diets.views.diet_search': 3,
+}
+N_PLUS_ONE_THRESHOLD = 5
+QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT', 'False') == 'True'
+
+# /metrics (monitoring/metrics.py): Authorization: Bearer <METRICS_TOKEN> 또는 스태프 로그인
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# 느린 요청 샘플링 프로파일러 (monitoring/profiler.py) - PROFILE_REQUESTS=True일 때만 동작
+# - PROFILE_SAMPLE_RATE 비율의 요청 + PROFILE_SLOW_MS(ms, 0이면 사용 안 함)보다 오래 걸린 요청의 스택을 저장
+PROFILE_REQUESTS = os.getenv('PROFILE_REQUESTS', 'False') == 'True'
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0.0'))
+PROFILE_SLOW_MS = float(os.getenv('PROFILE_SLOW_MS', '1000'))
+PROFILE_INTERVAL_MS = float(os.getenv('PROFILE_INTERVAL_MS', '5'))
+PROFILE_KEEP_PER_VIEW = int(os.getenv('PROFILE_KEEP_PER_VIEW', '20'))
+PROFILE_DIR = os.getenv('PROFILE_DIR', str(BASE_DIR / 'profiling'))
+
+# 작업 큐 (jobs 앱): True면 enqueue 시점에 바로 실행 → run_worker 없이 개발할 때
+JOBS_EAGER = os.getenv('JOBS_EAGER', 'False') == 'True'
+
 SOCIALACCOUNT_LOGIN_ON_GET = True
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
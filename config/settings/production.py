@@ -1,5 +1,6 @@
 # config/settings/production.py
 from .base import *
+from config.server import SERVER_MODE, THREADS, WEB_CONCURRENCY
 
 DEBUG = False
 ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', '').split(',')
@@ -16,6 +17,90 @@ DATABASES = {
     }
 }
 
+# DB 연결 재사용 (DB_POOL)
+# - pool (기본): psycopg3 연결 풀, 워커 프로세스마다 최대 DB_POOL_MAX_SIZE개 (꺼낼 때 health check)
+# - persistent: 스레드마다 연결 하나를 CONN_MAX_AGE초 동안 재사용 (요청 시작 시 health check)
+# - off: 요청마다 새로 연결 (TCP + 인증 비용을 매번 지불)
+# 풀 크기 기본값: gthread 워커는 스레드 수만큼(최소 2), ASGI 워커는 DB_MAX_CONNECTIONS를 워커 수로 나눈 만큼
+#   → 전체 연결 수(WEB_CONCURRENCY x 풀 크기)가 Postgres max_connections 안에 들어가게 DB_MAX_CONNECTIONS로 조정
+#   (워커/스레드 수는 gunicorn.conf.py와 같은 값 - config/server.py)
+DB_POOL = os.getenv('DB_POOL', 'pool')
+DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', '40'))
+
+if DB_POOL == 'pool':
+    _pool_budget = max(2, DB_MAX_CONNECTIONS // WEB_CONCURRENCY)
+    _default_max = _pool_budget if SERVER_MODE == 'asgi' else min(max(2, THREADS), _pool_budget)
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', _default_max)),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),  # 풀이 꽉 찼을 때 기다리는 최대 시간
+            'max_idle': 300,
+            'max_lifetime': 1800,
+        },
+    }
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True  # 풀에서 꺼낼 때 끊긴 연결인지 확인
+elif DB_POOL == 'persistent':
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('CONN_MAX_AGE', '60'))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+elif DB_POOL != 'off':
+    raise ValueError(f"DB_POOL은 pool, persistent, off 중 하나여야 합니다: {DB_POOL}")
+
+# 캐시: 워커 프로세스(와 작업 큐 워커)가 같이 보는 공유 캐시
+# - 검색 토큰, 식품 카드/분석 fragment 캐시 (default), 카탈로그·식단·즐겨찾기 버전 토큰 (versions - foods/catalog.py)
+# - 기본 LocMem은 프로세스마다 따로라 다른 워커에서 만든 검색 토큰/버전 변경이 보이지 않음
+# - REDIS_URL(redis://host:port, DB 번호 없이)이 있으면 Redis (docker-compose의 redis 서비스)
+#   maxmemory-policy volatile-lru → 만료 시간이 있는 fragment/검색 토큰만 밀려나고 만료 없는 버전 토큰은 남음
+#   default는 DB 0, versions는 DB 1 (cache.clear()가 FLUSHDB라서 같은 DB면 버전 토큰도 같이 지워짐)
+# - 없으면 파일 캐시 (서버 한 대일 때만): set마다 _cull이 캐시 디렉터리 전체를 나열하므로 항목이 많을수록 쓰기가 느려지고
+#   MAX_ENTRIES를 넘으면 무작위로 1/3을 지움 → 버전 토큰은 항목 수가 적은 별도 디렉터리에 두어 cull 대상에서 뺌
+REDIS_URL = os.getenv('REDIS_URL', '').rstrip('/')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': f'{REDIS_URL}/0',
+            'TIMEOUT': 600,
+        },
+        'versions': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': f'{REDIS_URL}/1',
+            'TIMEOUT': None,
+        },
+    }
+else:
+    CACHE_DIR = Path(os.getenv('CACHE_DIR', str(BASE_DIR / 'cache')))
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(CACHE_DIR / 'default'),
+            'TIMEOUT': 600,
+            'OPTIONS': {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '20000'))},
+        },
+        'versions': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(CACHE_DIR / 'versions'),
+            'TIMEOUT': None,
+            'OPTIONS': {'MAX_ENTRIES': 10_000_000},  # 사용자 수 x 2 정도라 cull 되지 않음
+        },
+    }
+
+# 정적 파일: 해시 이름 + 미리 압축한 .gz/.br (common/storage.py) → nginx가 1년 캐시 + gzip_static
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'common.storage.CompressedManifestStaticFilesStorage'},
+}
+
+# 템플릿 로더: 파싱한 템플릿을 프로세스 안에 보관 (DEBUG=False면 Django 기본값과 같지만 명시)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
 # 로깅 설정 (임시로 추가 - 디버깅용)
 LOGGING = {
     'version': 1,
@@ -19,6 +19,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from accounts import views
+from monitoring import views as monitoring_views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -30,6 +31,8 @@ urlpatterns = [
     path('products/', include('products.urls')),
     path('mypage/', include('mypage.urls')),
     path('search/', include('search.urls')),
+    path('monitoring/', include('monitoring.urls')),
+    path('metrics', monitoring_views.metrics, name='metrics'),
 ]
 
 # 에러 핸들러 설정
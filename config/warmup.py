@@ -0,0 +1,78 @@
+"""
+gunicorn preload 워밍업 (gunicorn.conf.py 훅에서 호출)
+- warm_master: 마스터가 fork 전에 한 번 → 워커들이 copy-on-write로 공유
+  - URL 패턴, 템플릿 컴파일 결과(cached loader), 카탈로그 스냅샷(foods/snapshot.py)
+  - 끝나면 DB 연결/풀을 닫음 (psycopg 풀은 백그라운드 스레드와 소켓을 가지고 있어서 fork한 프로세스끼리 공유하면 안 됨)
+  - gc.freeze(): 이미 만든 객체를 GC 대상에서 빼서 GC가 공유 페이지를 건드려 복사되지 않게 함
+- warm_worker: 워커가 fork된 직후 → 마스터에서 복사된 연결을 버리고, 첫 요청 전에 DB 풀을 채움
+"""
+import gc
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def template_names():
+    """DIRS + 앱 templates/ 아래의 모든 .html (APP_DIRS=False + 명시한 loader여도 같은 위치)"""
+    from django.apps import apps
+
+    roots = [str(d) for d in settings.TEMPLATES[0]['DIRS']]
+    roots += [os.path.join(app.path, 'templates') for app in apps.get_app_configs()]
+    for root in roots:
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith('.html'):
+                    yield os.path.relpath(os.path.join(dirpath, filename), root)
+
+
+def release_db_connections():
+    """이 프로세스의 DB 연결과 연결 풀을 닫음"""
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+        if hasattr(connection, 'close_pool'):
+            connection.close_pool()
+
+
+def warm_master():
+    """→ {'templates': 컴파일한 템플릿 수, 'snapshot_foods': 스냅샷 식품 수, 'seconds': 소요 시간}"""
+    from foods.snapshot import get_snapshot
+
+    started = time.perf_counter()
+    get_resolver().reverse_dict  # URL 패턴 import + 역방향 매핑
+    compiled = 0
+    for name in template_names():
+        try:
+            get_template(name)
+            compiled += 1
+        except (TemplateDoesNotExist, TemplateSyntaxError):
+            continue
+    try:
+        snapshot = get_snapshot()
+        foods = len(snapshot.top_foods)
+    except Exception:
+        # DB가 아직 준비되지 않았어도 서버는 시작 (워커가 첫 요청에서 다시 만듦)
+        logger.exception("카탈로그 스냅샷 워밍업 실패")
+        foods = 0
+    release_db_connections()
+    gc.collect()
+    gc.freeze()
+    return {'templates': compiled, 'snapshot_foods': foods, 'seconds': round(time.perf_counter() - started, 2)}
+
+
+def warm_worker():
+    release_db_connections()
+    try:
+        # 풀 생성 + min_size만큼 연결 → 첫 요청이 연결 비용을 내지 않음
+        connection = connections['default']
+        connection.ensure_connection()
+        connection.close()
+    except Exception:
+        logger.exception("워커 DB 연결 워밍업 실패")
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import UserProfile
+
+from .models import Diet
+from .versions import bump_diet_version
+
+
+@receiver([post_save, post_delete], sender=Diet)
+def diet_changed(sender, instance, **kwargs):
+    # 분석 페이지 캐시 무효화
+    bump_diet_version(instance.user_id)
+
+
+@receiver(post_save, sender=UserProfile)
+def profile_changed(sender, instance, **kwargs):
+    # 권장 섭취량이 성별/나이에 따라 달라짐
+    bump_diet_version(instance.user_id)
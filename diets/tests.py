@@ -1,3 +1,8 @@
-from django.test import TestCase
+from monitoring.tests import QueryBudgetTestCase
 
-# Create your tests here.
+
+class DietSearchQueryBudgetTests(QueryBudgetTestCase):
+
+    def test_diet_search(self):
+        cold, _ = self.assertWithinBudget('/diets/search/?keyword=테스트', 'diets.views.diet_search', user=self.user)
+        self.assertEqual(len(cold.json()['foods']), self.FOODS)
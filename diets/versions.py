@@ -0,0 +1,18 @@
+"""
+사용자별 식단 버전 (분석 페이지 캐시 무효화용)
+- 식단(Diet)이 추가/수정/삭제되거나 프로필(성별/나이 → 권장 섭취량)이 바뀌면 버전을 새로 발급 (diets/signals.py)
+- 분석 캐시 키: (사용자, 기간, 식단 버전, 카탈로그 버전)
+"""
+from foods.catalog import bump_cache_version, cache_version
+
+
+def _key(user_id):
+    return f"diet_version:{user_id}"
+
+
+def diet_version(user_id):
+    return cache_version(_key(user_id))
+
+
+def bump_diet_version(user_id):
+    bump_cache_version(_key(user_id))
@@ -38,7 +38,7 @@ def safe_float(value, default=0.0):
 def food_to_dict(food):
     ret = {
         "food_id": safe_str(getattr(food, "food_id", "")),
-        "food_img": safe_str(getattr(food, "image_url", "") or getattr(food, "food_img", "") or ""),
+        "food_img": safe_str(getattr(food, "display_image_url", "") or getattr(food, "food_img", "") or ""),
         "food_name": safe_str(getattr(food, "food_name", "") or ""),
         "food_category": safe_str(getattr(food, "food_category", "") or ""),
         "calorie": safe_float(getattr(food, "calorie", 0)),
@@ -182,7 +182,7 @@ def diet_list(request):
                 "food_id": str(cur_food.food_id),
                 "food_name" : cur_food.food_name,
                 "company_name": cur_food.company_name,
-                "food_img": cur_food.image_url or cur_food.food_img
+                "food_img": cur_food.display_image_url or cur_food.food_img
                 })
             cnt += 1 #식품 카운팅
         idx -= 1 #다음으로 최근에 먹은 식사로 이동
@@ -199,12 +199,12 @@ def diet_search_page(request):
     return render(request, 'diets/diets_search.html')
 
 @login_required
-#유저가 식품 이름으로 검색하는 기능
-def diet_search(request):
-    user = request.user
+#유저가 식품 이름으로 검색하는 기능 (비동기 뷰)
+async def diet_search(request):
+    user = await request.auser()
     keyword = request.GET.get('keyword', '').strip() #유저가 검색한 키워드
 
-    foods = list(Food.objects.filter(food_name__icontains=keyword)) #keyword를 포함하는 Food 모델 모두 가져오기
+    foods = [food async for food in Food.objects.filter(food_name__icontains=keyword)] #keyword를 포함하는 Food 모델 모두 가져오기
     ret = {'user_id': user.id, 'foods': []} #프론트로 넘겨줄 mock data
 
     # 검색 결과 조회된 food를 하나씩 순회
@@ -213,7 +213,7 @@ def diet_search(request):
         food_data['food_id'] = str(food.food_id)
         food_data['food_name'] = food.food_name
         food_data['company_name'] = food.company_name
-        food_data['food_img'] = food.image_url or food.food_img
+        food_data['food_img'] = food.display_image_url or food.food_img
         ret['foods'].append(food_data) #food_data 에 정보를 모두 담았으니 ret['foods']에 추가
 
     #To FE: 템플릿 작업 시작하면 지금 return문 지우고 바로 아래에 주석처리 해둔 return문 채워서 사용해주세요!!!
@@ -4,10 +4,10 @@ from .models import Food
 
 @admin.register(Food)
 class FoodAdmin(admin.ModelAdmin):
-    list_display = ['food_id', 'food_name', 'company_name', 'food_category', 'lprice']
-    list_filter = ['food_category', 'company_name']
+    list_display = ['food_id', 'food_name', 'company_name', 'food_category', 'lprice', 'is_active']
+    list_filter = ['is_active', 'food_category', 'company_name']
     search_fields = ['food_name', 'company_name', 'representative_food']
-    readonly_fields = ['food_id']
+    readonly_fields = ['food_id', 'content_hash', 'retired_at']
     
     fieldsets = (
         ('기본 정보', {
@@ -29,10 +29,14 @@ class FoodAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('가격 정보', {
-            'fields': ('lprice', 'discount_price', 'shop_url', 'image_url'),
+            'fields': ('lprice', 'discount_price', 'shop_url', 'image_url', 'thumbnail_path'),
             'classes': ('collapse',)
         }),
         ('기타 정보', {
             'fields': ('serving_size', 'weight')
         }),
+        ('임포트 정보', {
+            'fields': ('is_active', 'retired_at', 'content_hash'),
+            'classes': ('collapse',)
+        }),
     )
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+식품 카탈로그 버전 (fragment 캐시 무효화용)
+- 캐시 키에 버전을 넣어 두고, 식품 데이터가 바뀌면 버전만 새로 발급 → 예전 항목은 지울 필요 없이 만료로 사라짐
+- 버전을 올리는 곳: Food 저장/삭제 시그널(관리자 화면 등), scripts/food_loader.py 적재,
+  rescore_foods / build_thumbnails 명령 (bulk 작업은 시그널이 없으므로 직접 호출)
+- 버전 토큰은 'versions' 캐시에 저장: fragment 캐시(default)가 꽉 차서 밀려나도 버전은 남아 ETag/캐시 키가 흔들리지 않음
+- 캐시가 프로세스마다 따로면(LocMem) 다른 워커에 전달되지 않으므로 배포 환경은 공유 캐시 사용 (production.py CACHES)
+- HTTP 캐시 검증값(ETag/Last-Modified)도 이 버전으로 만듦 (foods/conditional.py)
+"""
+import datetime
+import hashlib
+import time
+
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+from django.utils.functional import SimpleLazyObject, empty
+
+from monitoring.metrics import record_cache
+
+CATALOG_VERSION_KEY = 'catalog_version'
+
+versions = ConnectionProxy(caches, 'versions')
+
+
+def _new_version():
+    # 발급 시각(ns)의 16진수 → HTTP Last-Modified로도 사용 (version_time)
+    return f"{time.time_ns():x}"
+
+
+def version_time(version):
+    """버전 토큰이 발급된 시각 (UTC datetime)"""
+    return datetime.datetime.fromtimestamp(int(version, 16) / 1e9, tz=datetime.timezone.utc)
+
+
+def cache_version(key):
+    """key에 저장된 버전 토큰 (없으면 새로 발급, 만료 없음)"""
+    version = versions.get(key)
+    if version is None:
+        version = _new_version()
+        if not versions.add(key, version, None):
+            # 다른 워커가 먼저 발급한 경우 그 값을 사용
+            version = versions.get(key, version)
+    return version
+
+
+def bump_cache_version(key):
+    versions.set(key, _new_version(), None)
+
+
+def catalog_version():
+    return cache_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version():
+    bump_cache_version(CATALOG_VERSION_KEY)
+
+
+def favorites_version(user_id):
+    """사용자별 즐겨찾기 버전 (카드/상세의 하트 표시가 바뀌었는지 - foods/signals.py에서 올림)"""
+    return cache_version(f"favorites_version:{user_id}")
+
+
+def bump_favorites_version(user_id):
+    bump_cache_version(f"favorites_version:{user_id}")
+
+
+def card_grid_key(food_ids, favorite_ids=()):
+    """상품 카드 묶음 fragment 캐시 키: (식품 ID 목록, 즐겨찾기 표시, 카탈로그 버전)"""
+    digest = hashlib.md5()
+    digest.update(",".join(map(str, food_ids)).encode())
+    digest.update(b"|" + ",".join(sorted(map(str, favorite_ids))).encode())
+    return f"{catalog_version()}:{digest.hexdigest()}"
+
+
+def lazy_cards(build):
+    """fragment 캐시가 hit이면 템플릿이 목록을 읽지 않으므로 build()도 실행되지 않음"""
+    return SimpleLazyObject(build)
+
+
+def record_cards(cache_name, cards):
+    """렌더링 후 호출: 목록을 만들지 않았으면 fragment 캐시 hit"""
+    record_cache(cache_name, cards._wrapped is empty)
@@ -0,0 +1,79 @@
+"""
+카탈로그 응답의 HTTP 캐시 (ETag / Last-Modified / 304)
+- 검증값은 응답 내용이 아니라 버전으로 만듦: (URL, 응답 형식, 카탈로그 버전, 로그인 사용자면 사용자 + 즐겨찾기 버전)
+  → 뷰를 실행하기 전에 비교할 수 있어서 304면 DB 조회/렌더링을 건너뜀
+- 비로그인: Cache-Control public, max-age=CATALOG_MAX_AGE → 브라우저/nginx proxy_cache가 재사용
+- 로그인: private, no-cache → 브라우저가 매번 ETag로 재검증 (즐겨찾기 표시가 사용자마다 다름)
+- JSON은 strong ETag, HTML은 weak ETag (CSRF 토큰이 렌더링마다 달라서 바이트 단위로는 같지 않음)
+- extra(시간 구간 등 버전 밖의 값)가 있으면 Last-Modified를 보내지 않음
+  → 버전 시각만으로는 구간이 바뀐 것을 알 수 없어서 If-Modified-Since만 보내는 클라이언트가 지난 구간의 304를 받게 됨
+- 사용: @catalog_conditional(json=True) / @catalog_conditional(json=wants_json, vary=('Accept',))
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from .catalog import catalog_version, favorites_version, version_time
+
+CATALOG_MAX_AGE = 60
+
+
+def catalog_validators(request, user, is_json, extra=()):
+    """(ETag, Last-Modified timestamp - extra가 있으면 None)"""
+    versions = [catalog_version()]
+    if user.is_authenticated:
+        versions.append(favorites_version(user.pk))
+    parts = [request.get_full_path(), 'json' if is_json else 'html', str(user.pk or ''), *versions, *map(str, extra)]
+    digest = hashlib.sha1("\x1f".join(parts).encode()).hexdigest()[:32]
+    etag = f'"{digest}"' if is_json else f'W/"{digest}"'
+    if extra:
+        return etag, None
+    return etag, int(max(version_time(v) for v in versions).timestamp())
+
+
+def catalog_conditional(json=False, vary=(), extra=None):
+    """
+    json: bool 또는 request → bool (같은 URL에서 JSON/HTML을 고르는 뷰)
+    vary: 응답 형식을 고르는 데 쓰는 요청 헤더 (Vary에 추가)
+    extra: request → 검증값에 더할 값 목록 (예: 추천 목록이 바뀌는 시간 구간, 이때는 ETag로만 검증)
+    """
+    def decorator(view):
+        def pre(request, user):
+            is_json = json(request) if callable(json) else json
+            etag, last_modified = catalog_validators(request, user, is_json, extra(request) if extra else ())
+            return get_conditional_response(request, etag=etag, last_modified=last_modified), etag, last_modified
+
+        def post(request, response, user, etag, last_modified):
+            if request.method not in ('GET', 'HEAD') or response.status_code not in (200, 304):
+                return response
+            response.headers.setdefault('ETag', etag)
+            if last_modified is not None:
+                response.headers.setdefault('Last-Modified', http_date(last_modified))
+            if user.is_authenticated:
+                patch_cache_control(response, private=True, no_cache=True)
+            else:
+                patch_cache_control(response, public=True, max_age=CATALOG_MAX_AGE)
+            patch_vary_headers(response, ('Cookie', *vary))
+            return response
+
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def inner(request, *args, **kwargs):
+                user = await request.auser()
+                response, etag, last_modified = pre(request, user)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return post(request, response, user, etag, last_modified)
+        else:
+            @wraps(view)
+            def inner(request, *args, **kwargs):
+                user = request.user
+                response, etag, last_modified = pre(request, user)
+                if response is None:
+                    response = view(request, *args, **kwargs)
+                return post(request, response, user, etag, last_modified)
+        return inner
+    return decorator
@@ -0,0 +1,126 @@
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import httpx
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from foods.catalog import bump_catalog_version
+from foods.models import Food
+from foods.thumbnails import DEFAULT_SIZE, store_thumbnail
+
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+SAVE_BATCH = 1000  # 이 수만큼 식품이 모이면 DB에 기록 (중간에 멈춰도 그때까지 만든 썸네일은 남음)
+
+
+def fetch_image(client, url, timeout):
+    """원본 이미지 바이트 (200 + image/* 가 아니거나 MAX_IMAGE_BYTES보다 크면 None - 큰 본문은 끝까지 받지 않음)"""
+    try:
+        with client.stream('GET', url, follow_redirects=True, timeout=timeout) as resp:
+            if resp.status_code != 200 or not resp.headers.get('content-type', '').startswith('image/'):
+                return None
+            if int(resp.headers.get('content-length') or 0) > MAX_IMAGE_BYTES:
+                return None
+            chunks, received = [], 0
+            for chunk in resp.iter_bytes():
+                received += len(chunk)
+                if received > MAX_IMAGE_BYTES:  # Content-Length가 없거나 틀린 응답
+                    return None
+                chunks.append(chunk)
+    except (httpx.HTTPError, httpx.InvalidURL, ValueError):
+        return None
+    return b''.join(chunks)
+
+
+def build_one(client, url, size, timeout):
+    """URL 하나 → (상태, 상대 경로) - 상태: created / exists / fetch_failed / decode_failed"""
+    data = fetch_image(client, url, timeout)
+    if data is None:
+        return 'fetch_failed', None
+    try:
+        relpath, created = store_thumbnail(data, size)
+    except Exception:
+        return 'decode_failed', None
+    return ('created' if created else 'exists'), relpath
+
+
+def save_thumbnails(pairs):
+    """[(food_id, 상대 경로)] → Food.thumbnail_path 기록 (배치마다 별도 트랜잭션) → 기록한 수"""
+    if not pairs:
+        return 0
+    updates = [Food(food_id=food_id, thumbnail_path=relpath) for food_id, relpath in pairs]
+    with transaction.atomic():
+        Food.all_objects.bulk_update(updates, ['thumbnail_path'], batch_size=SAVE_BATCH)
+    bump_catalog_version()  # 카드 이미지 주소가 바뀜
+    return len(updates)
+
+
+class Command(BaseCommand):
+    help = "Food.image_url 원본 이미지를 한 번씩만 받아 WebP 썸네일(MEDIA_ROOT/thumbnails)을 만들고 Food.thumbnail_path에 기록합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=DEFAULT_SIZE, help="썸네일 긴 변 길이(px)")
+        parser.add_argument('--workers', type=int, default=16, help="동시에 받는 이미지 수")
+        parser.add_argument('--timeout', type=float, default=5.0, help="이미지 하나당 요청 제한 시간(초)")
+        parser.add_argument('--limit', type=int, default=None, help="처리할 URL 수 제한 (테스트용)")
+        parser.add_argument('--refresh', action='store_true', help="이미 썸네일이 있는 식품도 다시 만듦")
+
+    def handle(self, *args, **options):
+        size = options['size']
+        started = time.perf_counter()
+
+        # 같은 image_url을 쓰는 식품은 한 번만 받음
+        foods = Food.all_objects.exclude(Q(image_url__isnull=True) | Q(image_url=''))
+        if not options['refresh']:
+            foods = foods.filter(Q(thumbnail_path__isnull=True) | Q(thumbnail_path=''))
+        by_url = defaultdict(list)
+        for food_id, url in foods.values_list('food_id', 'image_url').iterator(chunk_size=5000):
+            by_url[url.strip()].append(food_id)
+
+        # 다른 식품이 이미 같은 URL로 만든 썸네일은 그대로 재사용 (요청 없음)
+        # URL 목록을 IN 절로 넘기지 않고 썸네일이 있는 식품을 훑으면서 공백을 뗀 URL로 비교
+        known = {}
+        if not options['refresh']:
+            done = Food.all_objects.exclude(Q(image_url__isnull=True) | Q(image_url='')).exclude(
+                Q(thumbnail_path__isnull=True) | Q(thumbnail_path='')
+            )
+            for url, relpath in done.values_list('image_url', 'thumbnail_path').iterator(chunk_size=5000):
+                url = url.strip()
+                if url in by_url:
+                    known.setdefault(url, relpath)
+
+        urls = [url for url in by_url if url not in known]
+        if options['limit']:
+            urls = urls[:options['limit']]
+        self.stdout.write(f"대상 식품 {sum(len(ids) for ids in by_url.values())}개, 고유 URL {len(by_url)}개 "
+                          f"(기존 썸네일 재사용 {len(known)}개, 새로 받을 URL {len(urls)}개)")
+
+        stats = Counter()
+        saved = 0
+        pending = [(food_id, relpath) for url, relpath in known.items() for food_id in by_url[url]]
+        limits = httpx.Limits(max_connections=options['workers'], max_keepalive_connections=options['workers'])
+        with httpx.Client(limits=limits, headers={'User-Agent': 'healthtant-thumbnailer'}) as client, \
+                ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = {executor.submit(build_one, client, url, size, options['timeout']): url for url in urls}
+            for i, fut in enumerate(as_completed(futures), 1):
+                status, relpath = fut.result()
+                stats[status] += 1
+                if relpath:
+                    pending.extend((food_id, relpath) for food_id in by_url[futures[fut]])
+                if len(pending) >= SAVE_BATCH:
+                    saved += save_thumbnails(pending)
+                    pending = []
+                if i % 1000 == 0:
+                    self.stdout.write(f"진행: {i}/{len(urls)}개 URL (식품 {saved}개 기록)")
+        saved += save_thumbnails(pending)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"새 파일 {stats['created']}개, 같은 내용 파일 재사용 {stats['exists']}개, "
+            f"받기 실패 {stats['fetch_failed']}개, 이미지 아님 {stats['decode_failed']}개"
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"식품 {saved}개에 썸네일 기록, {elapsed:.1f}초 ({len(urls) / elapsed if elapsed else 0:.0f} URLs/s)"
+        ))
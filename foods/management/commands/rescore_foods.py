@@ -0,0 +1,139 @@
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from foods.catalog import bump_catalog_version
+from foods.models import Food
+from common.nutrition_score import NutritionalScore, scoreToGrade
+
+# 점수 계산에 필요한 컬럼만 읽어옴 (Food 전체를 메모리에 올리지 않기 위함)
+SCORE_FIELDS = [
+    'calorie', 'carbohydrate', 'protein', 'fat', 'sugar',
+    'saturated_fatty_acids', 'trans_fatty_acids', 'dietary_fiber', 'salt',
+    'serving_size', 'weight', 'food_category',
+]
+GRADES = ['A', 'B', 'C', 'D', 'E']
+
+
+def _score_chunk(rows):
+    """(food_id, 기존 점수, 기존 등급, *SCORE_FIELDS) 튜플 리스트를 받아 새 점수/등급을 계산 (프로세스 풀에서 실행)"""
+    results = []
+    for row in rows:
+        food_id, old_score, old_grade = row[:3]
+        food = SimpleNamespace(**dict(zip(SCORE_FIELDS, row[3:])))
+        score = NutritionalScore(food)
+        results.append((food_id, old_score, old_grade, float(score), scoreToGrade(score)))
+    return results
+
+
+def iter_food_chunks(chunk_size):
+    """food_id(PK) 기준 keyset 페이지네이션으로 카탈로그 전체를 chunk 단위로 스트리밍"""
+    fields = ['food_id', 'nutrition_score', 'nutri_score_grade'] + SCORE_FIELDS
+    last_id = None
+    while True:
+        qs = Food.all_objects.order_by('food_id')
+        if last_id is not None:
+            qs = qs.filter(food_id__gt=last_id)
+        rows = list(qs.values_list(*fields)[:chunk_size])
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield rows
+
+
+def write_scores(changed):
+    """변경된 (food_id, score, grade)만 한 번의 UPDATE ... FROM (VALUES ...)로 반영"""
+    if not changed:
+        return
+    table = Food._meta.db_table
+    if connection.vendor == 'postgresql':
+        values = ",".join(["(%s, %s::double precision, %s)"] * len(changed))
+        params = [v for row in changed for v in row]
+        sql = f"""
+            UPDATE {table} AS f
+            SET nutrition_score = v.score, nutri_score_grade = v.grade
+            FROM (VALUES {values}) AS v(food_id, score, grade)
+            WHERE f.food_id = v.food_id
+        """
+        with connection.cursor() as cur:
+            cur.execute(sql, params)
+    else:
+        # 로컬 SQLite에서는 VALUES 별칭 문법이 없으므로 bulk_update로 대체
+        Food.all_objects.bulk_update(
+            [Food(food_id=fid, nutrition_score=score, nutri_score_grade=grade) for fid, score, grade in changed],
+            ['nutrition_score', 'nutri_score_grade'],
+            batch_size=500,
+        )
+
+
+class Command(BaseCommand):
+    help = "common/nutrition_score.py 기준으로 전체 식품의 nutrition_score / nutri_score_grade를 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000, help="한 번에 읽고 쓰는 행 수")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="점수 계산 프로세스 수 (1이면 현재 프로세스에서 계산)")
+        parser.add_argument('--dry-run', action='store_true', help="DB에 쓰지 않고 변경 통계만 출력")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        workers = max(1, options['workers'])
+        dry_run = options['dry_run']
+
+        started = time.perf_counter()
+        transitions = Counter()
+        total = changed_total = 0
+
+        def apply(results):
+            nonlocal total, changed_total
+            changed = []
+            for food_id, old_score, old_grade, score, grade in results:
+                transitions[(old_grade or '-', grade)] += 1
+                if old_score != score or old_grade != grade:
+                    changed.append((food_id, score, grade))
+            total += len(results)
+            changed_total += len(changed)
+            if not dry_run:
+                with transaction.atomic():
+                    write_scores(changed)
+            self.stdout.write(f"진행: {total}개 처리, {changed_total}개 변경")
+
+        if workers == 1:
+            for rows in iter_food_chunks(chunk_size):
+                apply(_score_chunk(rows))
+        else:
+            # 다음 chunk를 읽는 동안 이전 chunk들을 계산하도록 in-flight 작업 수를 제한
+            with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+                pending = deque()
+                for rows in iter_food_chunks(chunk_size):
+                    pending.append(executor.submit(_score_chunk, rows))
+                    if len(pending) >= workers * 2:
+                        apply(pending.popleft().result())
+                while pending:
+                    apply(pending.popleft().result())
+
+        if changed_total and not dry_run:
+            bump_catalog_version()  # 점수 순서가 바뀌었으므로 식품 카드 fragment 캐시 무효화
+
+        elapsed = time.perf_counter() - started
+        self.print_matrix(transitions)
+        mode = "DRY-RUN (DB 변경 없음)" if dry_run else "반영 완료"
+        self.stdout.write(self.style.SUCCESS(
+            f"{mode}: 전체 {total}개 중 {changed_total}개 변경, {elapsed:.1f}초 ({total / elapsed if elapsed else 0:.0f} rows/s)"
+        ))
+
+    def print_matrix(self, transitions):
+        """기존 등급(행) → 새 등급(열) 전이 행렬 출력"""
+        olds = GRADES + sorted({old for old, _ in transitions} - set(GRADES))
+        self.stdout.write("\n=== 등급 전이 (행: 기존, 열: 새 등급) ===")
+        self.stdout.write("      " + "".join(f"{g:>9}" for g in GRADES))
+        for old in olds:
+            counts = [transitions.get((old, new), 0) for new in GRADES]
+            if not any(counts):
+                continue
+            self.stdout.write(f"{old:>6}" + "".join(f"{c:>9}" for c in counts))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:00
+
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foods', '0011_remove_food_mallname'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='food',
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='food',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='food',
+            name='is_active',
+            field=models.BooleanField(db_default=True, db_index=True, default=True),
+        ),
+        migrations.AddField(
+            model_name='food',
+            name='retired_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
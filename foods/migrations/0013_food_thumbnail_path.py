@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foods', '0012_food_content_hash_is_active_retired_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='food',
+            name='thumbnail_path',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
@@ -1,6 +1,14 @@
+from django.conf import settings
 from django.db import models
 import uuid
 
+
+class ActiveFoodManager(models.Manager):
+    """증분 임포트로 퇴역(is_active=False) 처리된 식품을 제외하는 매니저"""
+    def get_queryset(self):
+        return super().get_queryset().filter(is_active=True)
+
+
 class Food(models.Model):
     food_id = models.CharField(
     primary_key=True,
@@ -56,6 +64,19 @@ class Food(models.Model):
     shop_url = models.URLField(null=True, blank=True)
     image_url = models.URLField(null=True, blank=True)
 
+    # 증분 임포트용 필드 (scripts/food_loader.py)
+    content_hash = models.CharField(max_length=64, null=True, blank=True)  # 원본 행 내용 해시 (변경 감지용)
+    is_active = models.BooleanField(default=True, db_default=True, db_index=True)  # CSV에서 사라진 식품은 삭제 대신 퇴역 처리
+    retired_at = models.DateTimeField(null=True, blank=True)
+
+    # 로컬 썸네일 (manage.py build_thumbnails, MEDIA_ROOT 기준 상대 경로) - image_url이 바뀌면 적재 시 비워짐
+    thumbnail_path = models.CharField(max_length=255, null=True, blank=True)
+
+    # 기본 매니저는 퇴역 식품까지 포함 (admin, 식단/즐겨찾기 기록 조회용)
+    all_objects = models.Manager()
+    # 검색/추천 등 목록 조회는 판매 중인 식품만
+    objects = ActiveFoodManager()
+
     class Meta:
         db_table = 'food'
         verbose_name = "식품"
@@ -63,6 +84,13 @@ class Food(models.Model):
 
     def __str__(self):
         return self.food_name
+
+    @property
+    def display_image_url(self):
+        """목록/카드에 보여줄 이미지: 로컬 썸네일이 있으면 썸네일, 없으면 원본 image_url"""
+        if self.thumbnail_path:
+            return settings.MEDIA_URL + self.thumbnail_path
+        return self.image_url
     
 
 from django.contrib.auth import get_user_model
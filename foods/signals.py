@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog import bump_catalog_version, bump_favorites_version
+from .models import FavoriteFood, Food
+
+
+@receiver([post_save, post_delete], sender=Food)
+def food_changed(sender, **kwargs):
+    # 식품 카드 fragment 캐시 / 카탈로그 ETag 무효화
+    bump_catalog_version()
+
+
+@receiver([post_save, post_delete], sender=FavoriteFood)
+def favorite_changed(sender, instance, **kwargs):
+    # 로그인 사용자 응답의 ETag 무효화 (하트 표시)
+    bump_favorites_version(instance.user_id)
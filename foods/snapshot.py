@@ -0,0 +1,51 @@
+"""
+읽기 전용 카탈로그 스냅샷 (프로세스 메모리)
+- 추천 목록처럼 모든 요청이 같은 값을 읽는 구조를 카탈로그 버전마다 한 번만 만듦 (요청마다 쿼리하지 않음)
+- gunicorn preload: 마스터가 fork 전에 만들어 두면(config/warmup.py) 워커들이 copy-on-write로 같은 메모리를 공유
+- 카탈로그 버전이 바뀌면(foods/catalog.py) 각 프로세스가 다음 요청에서 다시 만듦
+- 안의 Food 객체는 여러 스레드가 같이 읽으므로 수정하지 말 것
+"""
+import threading
+from dataclasses import dataclass
+
+from .catalog import catalog_version
+from .models import Food
+
+TOP_FOODS_SIZE = 50
+MAIN_FOODS_SIZE = 10
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    version: str
+    top_foods: tuple  # 영양 점수 상위 식품 (search_before 추천 후보)
+    main_food_ids: tuple  # 이미지가 있는 상위 식품 ID (main_page 카드)
+
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def build_snapshot(version):
+    top_foods = tuple(Food.objects.order_by('-nutrition_score')[:TOP_FOODS_SIZE])
+    main_food_ids = tuple(
+        Food.objects
+        .exclude(image_url__isnull=True)
+        .exclude(image_url='')
+        .order_by('-nutrition_score')
+        .values_list('food_id', flat=True)[:MAIN_FOODS_SIZE]
+    )
+    return CatalogSnapshot(version, top_foods, main_food_ids)
+
+
+def get_snapshot():
+    """현재 카탈로그 버전의 스냅샷 (버전이 바뀌었으면 다시 만듦)"""
+    global _snapshot
+    version = catalog_version()
+    snapshot = _snapshot
+    if snapshot is None or snapshot.version != version:
+        with _lock:
+            if _snapshot is None or _snapshot.version != version:
+                _snapshot = build_snapshot(version)
+            snapshot = _snapshot
+    return snapshot
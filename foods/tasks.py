@@ -0,0 +1,24 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from jobs.queue import task
+
+
+def _run_command(job, name, **options):
+    """관리 명령을 실행하고 출력 마지막 몇 줄을 progress에 남김"""
+    out = StringIO()
+    call_command(name, stdout=out, **options)
+    job.set_progress(output=out.getvalue().strip().splitlines()[-5:])
+
+
+@task('foods.rescore_foods', max_attempts=1)
+def rescore_foods_task(job, **options):
+    """전체 식품 영양 점수 재계산 (manage.py rescore_foods)"""
+    _run_command(job, 'rescore_foods', **options)
+
+
+@task('foods.build_thumbnails')
+def build_thumbnails_task(job, **options):
+    """상품 썸네일 생성 (manage.py build_thumbnails) - 이미 만든 썸네일은 건너뛰므로 재시도해도 안전"""
+    _run_command(job, 'build_thumbnails', **options)
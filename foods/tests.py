@@ -1,3 +1,95 @@
-from django.test import TestCase
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import httpx
+import pandas as pd
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from monitoring.tests import clear_caches, make_food
+from scripts.food_loader import load_frame
+from scripts.tests import start_stub
+
+from .management.commands import build_thumbnails
+from .models import Food
+
+
+class BuildThumbnailsTests(TestCase):
+    """manage.py build_thumbnails - 이미지 CDN 대신 scripts/stub_server.py 사용"""
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media_root = media.name
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.base = start_stub(self, latency_ms=0)
+        clear_caches()
+
+    def build(self):
+        call_command('build_thumbnails', workers=4, stdout=StringIO())
+
+    def thumbnail_files(self):
+        return [name for _, _, names in os.walk(os.path.join(self.media_root, 'thumbnails')) for name in names]
+
+    def test_same_image_makes_one_file(self):
+        # 3과 53은 stub에서 같은 바이트의 JPEG (n % 50), 4는 다른 이미지
+        make_food(1, image_url=f'{self.base}/img/3.jpg')
+        make_food(2, image_url=f' {self.base}/img/3.jpg ')  # 같은 URL (앞뒤 공백)
+        make_food(3, image_url=f'{self.base}/img/53.jpg')
+        make_food(4, image_url=f'{self.base}/img/4.jpg')
+        self.build()
+
+        paths = dict(Food.all_objects.values_list('pk', 'thumbnail_path'))
+        self.assertTrue(all(paths.values()), paths)
+        self.assertEqual(paths['T000001'], paths['T000002'])
+        self.assertEqual(paths['T000001'], paths['T000003'])
+        self.assertNotEqual(paths['T000001'], paths['T000004'])
+        self.assertEqual(len(self.thumbnail_files()), 2)
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, paths['T000004'])))
+
+    def test_rejected_images_are_not_recorded(self):
+        make_food(1, image_url=f'{self.base}/img/11.jpg')         # text/html
+        make_food(2, image_url=f'{self.base}/img/20.jpg')         # 404
+        make_food(3, image_url=f'{self.base}/broken/img/3.jpg')   # image/jpeg인데 디코딩 불가
+        make_food(4, image_url=f'{self.base}/img/4.jpg')          # 너무 큼 (한도를 100바이트로)
+        with mock.patch.object(build_thumbnails, 'MAX_IMAGE_BYTES', 100):
+            self.build()
+        self.assertFalse(Food.all_objects.exclude(thumbnail_path__isnull=True).exists())
+        self.assertEqual(self.thumbnail_files(), [])
+
+    def test_oversize_body_without_length_is_not_read_to_the_end(self):
+        sent = []
+
+        def body():
+            for _ in range(100):
+                sent.append(1)
+                yield b'x' * 1024
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, headers={'content-type': 'image/jpeg'},
+                                                                       content=body()))
+        with httpx.Client(transport=transport) as client, \
+                mock.patch.object(build_thumbnails, 'MAX_IMAGE_BYTES', 10 * 1024):
+            self.assertIsNone(build_thumbnails.fetch_image(client, 'http://cdn.example/a.jpg', timeout=1))
+        self.assertLess(len(sent), 100)
+
+    def test_loader_clears_thumbnail_when_image_url_changes(self):
+        make_food(1, image_url=f'{self.base}/img/3.jpg')
+        make_food(2, image_url=f'{self.base}/img/4.jpg')
+        self.build()
+        kept = Food.all_objects.get(pk='T000002').thumbnail_path
+
+        # 다시 적재: 1번만 이미지 URL이 바뀜
+        rows = pd.DataFrame(Food.all_objects.order_by('pk').values())
+        rows = rows.drop(columns=['thumbnail_path', 'is_active', 'retired_at'])
+        rows.loc[rows['food_id'] == 'T000001', 'image_url'] = f'{self.base}/img/5.jpg'
+        load_frame(rows, list(rows.columns), loader='executemany')
+
+        self.assertIsNone(Food.all_objects.get(pk='T000001').thumbnail_path)
+        self.assertEqual(Food.all_objects.get(pk='T000002').thumbnail_path, kept)
+
+        self.build()
+        self.assertTrue(Food.all_objects.get(pk='T000001').thumbnail_path)
@@ -0,0 +1,52 @@
+"""
+상품 이미지 썸네일 (manage.py build_thumbnails 에서 사용)
+- 원본 이미지 바이트의 sha256을 파일 이름으로 써서 MEDIA_ROOT/thumbnails/<크기>/<앞 2글자>/<해시>.webp 에 저장
+- URL이 달라도 내용이 같은 이미지는 파일 하나만 만들고, 이미 있는 파일은 다시 인코딩하지 않음
+- Food.thumbnail_path에는 MEDIA_ROOT 기준 상대 경로만 저장 (nginx /media/ 로 바로 서빙)
+"""
+import hashlib
+import os
+from io import BytesIO
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+THUMBNAIL_DIR = 'thumbnails'
+DEFAULT_SIZE = 320
+WEBP_QUALITY = 80
+
+
+def thumbnail_relpath(digest, size=DEFAULT_SIZE):
+    return f"{THUMBNAIL_DIR}/{size}/{digest[:2]}/{digest}.webp"
+
+
+def make_thumbnail(data, size=DEFAULT_SIZE, quality=WEBP_QUALITY):
+    """이미지 바이트 → 긴 변이 size 이하인 WebP 바이트 (EXIF 회전 반영, 메타데이터 제거)"""
+    with Image.open(BytesIO(data)) as img:
+        img = ImageOps.exif_transpose(img)
+        img = img.convert('RGBA' if img.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        img.thumbnail((size, size), Image.Resampling.LANCZOS)
+        buf = BytesIO()
+        img.save(buf, 'WEBP', quality=quality, method=4)
+    return buf.getvalue()
+
+
+def store_thumbnail(data, size=DEFAULT_SIZE):
+    """
+    원본 바이트로 썸네일을 만들어 저장 → (상대 경로, 새로 만들었는지)
+    디코딩할 수 없는 이미지면 PIL.UnidentifiedImageError 등 예외를 그대로 올림
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    relpath = thumbnail_relpath(digest, size)
+    path = os.path.join(settings.MEDIA_ROOT, relpath)
+    if os.path.exists(path):
+        return relpath, False
+
+    thumb = make_thumbnail(data, size)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # 다른 워커가 같은 파일을 쓰는 중이어도 반쯤 쓴 파일이 보이지 않도록 임시 파일 → rename
+    tmp = f"{path}.{os.getpid()}.{id(thumb)}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(thumb)
+    os.replace(tmp, path)
+    return relpath, True
@@ -0,0 +1,67 @@
+"""
+gunicorn 설정 (gunicorn -c gunicorn.conf.py)
+- SERVER_MODE=wsgi (기본): gthread 워커, 워커마다 GUNICORN_THREADS개 스레드가 요청을 동시에 처리
+- SERVER_MODE=asgi: uvicorn 워커로 config.asgi 실행 → async 뷰(main_page, normal_search, product_detail, diet_search)는
+  DB를 기다리는 동안 같은 워커가 다른 요청을 처리함 (동기 뷰는 스레드에서 실행)
+- 워커/스레드 수 기본값은 CPU 수 기준 (config/server.py), 환경변수로 조정 (WEB_CONCURRENCY, GUNICORN_THREADS ...)
+- preload (GUNICORN_PRELOAD=1, 기본): 마스터가 Django를 한 번 로드하고 워밍업(config/warmup.py)한 뒤 fork
+  → 워커끼리 코드/템플릿/카탈로그 스냅샷 메모리를 copy-on-write로 공유하고,
+    max_requests로 재시작된 워커도 import 없이 바로 요청을 받음
+  → 코드를 바꾸면 HUP이 아니라 재시작 필요 (HUP은 마스터가 이미 로드한 코드로 워커만 다시 fork)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config.server import SERVER_MODE, THREADS, WEB_CONCURRENCY
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'config.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'config.wsgi:application'
+    worker_class = 'gthread' if THREADS > 1 else 'sync'
+    threads = THREADS
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = WEB_CONCURRENCY
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = 50
+preload_app = os.getenv('GUNICORN_PRELOAD', '1') == '1'
+
+
+# 워커별 지표 파일 관리 (monitoring/metrics.py)
+def on_starting(server):
+    from monitoring import metrics
+    metrics.reset()
+
+
+def when_ready(server):
+    # preload면 앱이 이미 로드된 마스터에서 fork 전에 한 번 실행
+    if not preload_app:
+        return
+    from config.warmup import warm_master
+    server.log.info("워밍업: %s", warm_master())
+
+
+def post_fork(server, worker):
+    # fork 직후 워커 프로세스에서 실행: 마스터에서 복사된 지표/DB 연결을 버리고 DB 풀을 채움
+    # (지표 flush 스레드와 프로파일러 샘플러 스레드는 pid가 바뀌면 첫 사용 때 새로 시작)
+    from monitoring import metrics
+    metrics.REGISTRY.after_fork()
+    if preload_app:
+        from config.warmup import warm_worker
+        warm_worker()
+
+
+def worker_exit(server, worker):
+    # 워커 프로세스 안에서 실행: 마지막 값을 파일에 남김
+    from monitoring import metrics
+    metrics.REGISTRY.flush()
+
+
+def child_exit(server, worker):
+    from monitoring import metrics
+    metrics.mark_process_dead(worker.pid)
@@ -0,0 +1,32 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'task', 'status', 'attempts', 'max_attempts', 'run_at', 'started_at', 'finished_at', 'locked_by']
+    list_filter = ['status', 'task']
+    search_fields = ['task', 'last_error']
+    readonly_fields = ['created_at', 'started_at', 'finished_at', 'locked_at', 'locked_by', 'progress', 'last_error']
+    actions = ['retry_now']
+
+    fieldsets = (
+        ('작업', {
+            'fields': ('task', 'payload', 'status')
+        }),
+        ('실행', {
+            'fields': ('attempts', 'max_attempts', 'run_at', 'locked_at', 'locked_by', 'progress')
+        }),
+        ('결과', {
+            'fields': ('created_at', 'started_at', 'finished_at', 'last_error')
+        }),
+    )
+
+    @admin.action(description="선택한 작업 지금 다시 실행")
+    def retry_now(self, request, queryset):
+        count = queryset.exclude(status=Job.RUNNING).update(
+            status=Job.QUEUED, run_at=timezone.now(), attempts=0, locked_at=None, locked_by='',
+        )
+        self.message_user(request, f"{count}개 작업을 대기열에 다시 넣었습니다.")
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+    verbose_name = "백그라운드 작업"
+
+    def ready(self):
+        # 각 앱의 tasks.py에서 @task로 등록한 작업을 불러옴
+        autodiscover_modules('tasks')
@@ -0,0 +1,25 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.queue import REGISTRY, enqueue
+
+
+class Command(BaseCommand):
+    help = "등록된 작업을 대기열에 추가합니다. (cron 등에서 사용, 예: enqueue_job foods.build_thumbnails --payload '{\"size\": 320}')"
+
+    def add_arguments(self, parser):
+        parser.add_argument('task', help="작업 이름")
+        parser.add_argument('--payload', default='{}', help="작업 인자 (JSON object)")
+
+    def handle(self, *args, **options):
+        if options['task'] not in REGISTRY:
+            raise CommandError(f"등록되지 않은 작업입니다. 가능한 작업: {', '.join(sorted(REGISTRY))}")
+        try:
+            payload = json.loads(options['payload'])
+        except json.JSONDecodeError as e:
+            raise CommandError(f"--payload JSON 오류: {e}")
+        if not isinstance(payload, dict):
+            raise CommandError("--payload는 JSON object여야 합니다.")
+        job = enqueue(options['task'], **payload)
+        self.stdout.write(self.style.SUCCESS(f"추가됨: {job}"))
@@ -0,0 +1,27 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import stats
+
+
+class Command(BaseCommand):
+    help = "작업 큐 지표(대기/실행 중 개수, 대기 지연, 작업별 상태와 최근 평균 실행 시간)를 출력합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help="JSON으로 출력 (모니터링 수집용)")
+
+    def handle(self, *args, **options):
+        data = stats()
+        if options['json']:
+            self.stdout.write(json.dumps(data, ensure_ascii=False))
+            return
+
+        self.stdout.write(f"대기 {data['queued']}개, 실행 중 {data['running']}개, 가장 오래 기다린 작업 {data['lag_seconds']}초")
+        for name, row in sorted(data['tasks'].items()):
+            statuses = ", ".join(f"{k} {row[k]}" for k in ('queued', 'running', 'done', 'failed') if row.get(k))
+            recent = ""
+            if row.get('recent_finished'):
+                recent = (f" | 최근 1시간 {row['recent_finished']}개 종료, 실패 {row['recent_failed']}개, "
+                          f"평균 {row['recent_avg_seconds']}초")
+            self.stdout.write(f"  {name}: {statuses or '-'}{recent}")
@@ -0,0 +1,82 @@
+import os
+import signal
+import socket
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from jobs.queue import HEARTBEAT_SECONDS, REGISTRY, claim_next, requeue_stale, run_job
+
+
+class Command(BaseCommand):
+    help = "job 테이블의 대기 작업을 가져와 실행합니다. (여러 프로세스를 띄워도 작업이 겹치지 않음)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="대기 작업이 없을 때 다시 확인하기까지 쉬는 시간(초)")
+        parser.add_argument('--batch', type=int, default=1, help="한 번에 가져오는 작업 수")
+        parser.add_argument('--lock-timeout', type=int, default=900,
+                            help="이 시간(초) 동안 heartbeat가 없는 실행 중 작업은 워커가 죽은 것으로 보고 다시 대기열로")
+        parser.add_argument('--burst', action='store_true', help="대기 작업을 모두 처리하면 종료")
+        parser.add_argument('--max-jobs', type=int, default=None, help="이 개수만큼 처리하면 종료 (메모리 누수 대비 재시작용)")
+        parser.add_argument('--stats-every', type=float, default=60.0, help="처리 통계 출력 주기(초)")
+
+    def handle(self, *args, **options):
+        if options['lock_timeout'] < 3 * HEARTBEAT_SECONDS:
+            raise CommandError(f"--lock-timeout은 heartbeat 주기({HEARTBEAT_SECONDS}초)의 3배 이상이어야 합니다")
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = False
+        # SIGTERM(docker stop)을 받으면 지금 작업까지만 끝내고 종료
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        self.stdout.write(f"worker {worker} 시작, 등록된 작업: {', '.join(sorted(REGISTRY)) or '-'}")
+        counts = Counter()
+        seconds = Counter()
+        processed = 0
+        last_stats = last_reap = time.monotonic()
+
+        while not self.stopping:
+            close_old_connections()
+            now = time.monotonic()
+            if now - last_reap >= 30:
+                requeued, failed = requeue_stale(options['lock_timeout'])
+                if requeued or failed:
+                    self.stdout.write(self.style.WARNING(f"오래 잠긴 작업: 재시도 {requeued}개, 실패 처리 {failed}개"))
+                last_reap = now
+
+            jobs = claim_next(worker, options['batch'])
+            if not jobs:
+                if options['burst']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            for job in jobs:
+                started = time.perf_counter()
+                status = run_job(job)
+                elapsed = time.perf_counter() - started
+                counts[(job.task, status)] += 1
+                seconds[job.task] += elapsed
+                processed += 1
+                self.stdout.write(f"{job.task}#{job.pk} {status} ({elapsed:.2f}초, 시도 {job.attempts}/{job.max_attempts})")
+
+            if time.monotonic() - last_stats >= options['stats_every']:
+                self.print_stats(counts, seconds)
+                last_stats = time.monotonic()
+            if options['max_jobs'] and processed >= options['max_jobs']:
+                break
+
+        self.print_stats(counts, seconds)
+        self.stdout.write(f"worker {worker} 종료 (처리 {processed}개)")
+
+    def stop(self, signum, frame):
+        self.stopping = True
+
+    def print_stats(self, counts, seconds):
+        tasks = sorted({name for name, _ in counts})
+        for name in tasks:
+            done = sum(n for (t, _), n in counts.items() if t == name)
+            by_status = ", ".join(f"{status} {n}" for (t, status), n in sorted(counts.items()) if t == name)
+            self.stdout.write(f"  {name}: {by_status}, 평균 {seconds[name] / done:.2f}초")
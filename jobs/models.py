@@ -0,0 +1,63 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    DB 테이블 기반 작업 큐의 작업 하나 (jobs/queue.py의 enqueue로 추가, manage.py run_worker가 처리)
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, '대기'),
+        (RUNNING, '실행 중'),
+        (DONE, '완료'),
+        (FAILED, '실패'),
+    ]
+
+    task = models.CharField(max_length=100, db_index=True)  # @task로 등록한 이름
+    payload = models.JSONField(default=dict, blank=True)  # 작업 함수에 keyword 인자로 넘김
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_at = models.DateTimeField(default=timezone.now)  # 이 시각 이후에 실행 (재시도 backoff)
+
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True, default='')
+    last_error = models.TextField(blank=True, default='')
+    progress = models.JSONField(default=dict, blank=True)  # 긴 작업의 진행 상황 (job.set_progress)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'job'
+        verbose_name = "작업"
+        verbose_name_plural = "작업들"
+        indexes = [models.Index(fields=['status', 'run_at'])]
+
+    def __str__(self):
+        return f'{self.task}#{self.pk} ({self.status})'
+
+    def set_progress(self, **values):
+        """진행 상황을 progress에 합쳐서 바로 저장 (admin/상태 조회에서 확인) + heartbeat"""
+        self.progress = {**self.progress, **values}
+        Job.objects.filter(pk=self.pk).update(progress=self.progress)
+        self.heartbeat()
+
+    def heartbeat(self):
+        """실행 중인 작업의 locked_at 갱신 → requeue_stale이 아직 살아 있는 작업을 다시 대기열에 넣지 않음
+        (이 워커가 잡고 있을 때만 갱신 → 갱신된 행 수)"""
+        return Job.objects.filter(pk=self.pk, status=Job.RUNNING, locked_by=self.locked_by).update(
+            locked_at=timezone.now(),
+        )
+
+    @property
+    def duration(self):
+        if self.started_at and self.finished_at:
+            return (self.finished_at - self.started_at).total_seconds()
+        return None
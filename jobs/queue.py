@@ -0,0 +1,187 @@
+"""
+작업 큐 (외부 브로커 없이 job 테이블 사용)
+- 작업 등록: 각 앱의 tasks.py에서 @task('앱.이름')  → 함수는 fn(job, **payload) 형태로 호출됨
+- 작업 추가: enqueue('앱.이름', **payload)  → 요청은 바로 반환하고 manage.py run_worker가 처리
+- PostgreSQL은 SELECT ... FOR UPDATE SKIP LOCKED로 여러 워커가 겹치지 않게 가져감
+  SQLite(로컬)는 FOR UPDATE가 없으므로 상태 조건부 UPDATE로 한 워커만 가져가게 함
+- 실패하면 max_attempts까지 지수 backoff로 재시도, 워커가 죽어서 오래 잠긴 작업은 다시 대기열로
+  (실행 중에는 heartbeat 스레드와 set_progress가 locked_at을 갱신하므로 오래 걸리는 작업은 잠금이 풀리지 않음)
+- settings.JOBS_EAGER = True면 enqueue 시점에 바로 실행 (워커 없이 로컬 개발할 때)
+"""
+import logging
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Avg, Count, F, Min, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+REGISTRY = {}
+RETRY_BASE_SECONDS = 10
+RETRY_MAX_SECONDS = 3600
+HEARTBEAT_SECONDS = 60  # run_worker --lock-timeout은 이보다 충분히 길어야 함
+
+
+def task(name, max_attempts=3):
+    """작업 함수 등록 데코레이터"""
+    def decorator(fn):
+        if name in REGISTRY and REGISTRY[name][0] is not fn:
+            raise ValueError(f"이미 등록된 작업 이름입니다: {name}")
+        REGISTRY[name] = (fn, max_attempts)
+        return fn
+    return decorator
+
+
+def enqueue(name, run_at=None, **payload):
+    """작업 추가 → Job (payload는 JSON으로 저장되므로 기본 타입만)"""
+    if name not in REGISTRY:
+        raise ValueError(f"등록되지 않은 작업입니다: {name}")
+    job = Job.objects.create(
+        task=name,
+        payload=payload,
+        max_attempts=REGISTRY[name][1],
+        run_at=run_at or timezone.now(),
+    )
+    if getattr(settings, 'JOBS_EAGER', False):
+        run_job(claim_job(job.pk, 'eager'), heartbeat_interval=None)
+    return job
+
+
+def claim_job(pk, worker):
+    """대기 중인 작업 하나를 RUNNING으로 바꿔서 가져감 (다른 워커가 먼저 가져갔으면 None)"""
+    now = timezone.now()
+    claimed = Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+        status=Job.RUNNING, locked_at=now, locked_by=worker,
+        started_at=now, attempts=F('attempts') + 1,
+    )
+    return Job.objects.get(pk=pk) if claimed else None
+
+
+def claim_next(worker, batch=1):
+    """실행할 시각이 된 작업을 run_at 순서로 최대 batch개 가져감"""
+    due = Job.objects.filter(status=Job.QUEUED, run_at__lte=timezone.now()).order_by('run_at', 'id')
+    if not connection.features.has_select_for_update_skip_locked:
+        # SQLite: 트랜잭션 안에서 읽은 뒤 쓰면 잠금 승격이 실패하므로 잠금 없이 후보만 읽고 조건부 UPDATE로 가져감
+        jobs = [claim_job(pk, worker) for pk in due.values_list('id', flat=True)[:batch]]
+    else:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list('id', flat=True)[:batch])
+            jobs = [claim_job(pk, worker) for pk in ids]
+    return [job for job in jobs if job is not None]
+
+
+def retry_delay(attempts):
+    return min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+
+
+@contextmanager
+def heartbeat(job, interval):
+    """블록이 실행되는 동안 interval초마다 별도 스레드(자체 DB 연결)에서 job.heartbeat()"""
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(interval):
+                try:
+                    job.heartbeat()
+                except Exception:
+                    logger.exception("작업 heartbeat 실패: %s", job)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f"job-heartbeat-{job.pk}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def finish_job(job, **fields):
+    """최종 상태 기록 (이 워커가 아직 잡고 있을 때만 → 기록한 행 수)
+    requeue_stale 뒤에 다른 워커가 가져간 작업이면 그 워커의 RUNNING 상태를 덮어쓰지 않음"""
+    updated = Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by).update(
+        locked_at=None, locked_by='', finished_at=timezone.now(), **fields,
+    )
+    if not updated:
+        logger.warning("작업 결과를 기록하지 않음: %s (잠금 시간 초과로 대기열에 돌아갔거나 다른 워커가 실행 중)", job)
+    return updated
+
+
+def run_job(job, heartbeat_interval=HEARTBEAT_SECONDS):
+    """작업 실행 후 결과 기록 → 최종 상태 (DONE / QUEUED(재시도 예약) / FAILED)
+    heartbeat_interval: 실행 중 locked_at 갱신 주기(초), None이면 갱신하지 않음 (JOBS_EAGER)"""
+    entry = REGISTRY.get(job.task)
+    try:
+        if entry is None:
+            raise LookupError(f"등록되지 않은 작업입니다: {job.task}")
+        if heartbeat_interval:
+            with heartbeat(job, heartbeat_interval):
+                entry[0](job, **job.payload)
+        else:
+            entry[0](job, **job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("작업 실패: %s (시도 %s/%s)\n%s", job, job.attempts, job.max_attempts, error)
+        if entry is not None and job.attempts < job.max_attempts:
+            status, run_at = Job.QUEUED, timezone.now() + timedelta(seconds=retry_delay(job.attempts))
+        else:
+            status, run_at = Job.FAILED, job.run_at
+        finish_job(job, status=status, run_at=run_at, last_error=error[-10000:])
+        return status
+
+    finish_job(job, status=Job.DONE)
+    return Job.DONE
+
+
+def requeue_stale(lock_timeout):
+    """lock_timeout초 넘게 heartbeat가 없는 RUNNING 작업(워커 종료 등)을 대기열로 되돌림 (시도 횟수를 다 썼으면 FAILED)"""
+    cutoff = timezone.now() - timedelta(seconds=lock_timeout)
+    stale = Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff)
+    error = f"워커 응답 없음 ({lock_timeout}초 초과)"
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.FAILED, locked_at=None, locked_by='', last_error=error, finished_at=timezone.now(),
+    )
+    requeued = stale.update(status=Job.QUEUED, locked_at=None, locked_by='', last_error=error)
+    return requeued, failed
+
+
+def stats(window=timedelta(hours=1)):
+    """큐 지표: 작업별 상태 개수, 대기 중 가장 오래된 작업의 지연, 최근 window 동안의 평균 실행 시간/실패 수"""
+    now = timezone.now()
+    by_task = {}
+    for row in Job.objects.values('task', 'status').annotate(n=Count('id')):
+        by_task.setdefault(row['task'], {})[row['status']] = row['n']
+
+    recent = (
+        Job.objects.filter(finished_at__gte=now - window)
+        .values('task')
+        .annotate(
+            finished=Count('id'),
+            failed=Count('id', filter=Q(status=Job.FAILED)),
+            avg_seconds=Avg(F('finished_at') - F('started_at')),
+        )
+    )
+    for row in recent:
+        avg = row['avg_seconds']
+        by_task.setdefault(row['task'], {}).update({
+            'recent_finished': row['finished'],
+            'recent_failed': row['failed'],
+            'recent_avg_seconds': round(avg.total_seconds(), 3) if avg is not None else None,
+        })
+
+    oldest = Job.objects.filter(status=Job.QUEUED, run_at__lte=now).aggregate(oldest=Min('run_at'))['oldest']
+    return {
+        'queued': Job.objects.filter(status=Job.QUEUED).count(),
+        'running': Job.objects.filter(status=Job.RUNNING).count(),
+        'lag_seconds': round((now - oldest).total_seconds(), 1) if oldest else 0.0,
+        'tasks': by_task,
+    }
@@ -0,0 +1,123 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .queue import RETRY_MAX_SECONDS, claim_job, claim_next, enqueue, requeue_stale, retry_delay, run_job, task
+
+CALLS = []
+
+
+@task('tests.record')
+def record(job, **payload):
+    CALLS.append(payload)
+
+
+@task('tests.fail', max_attempts=3)
+def fail(job, **payload):
+    raise RuntimeError("일부러 실패")
+
+
+class JobQueueTests(TestCase):
+
+    def setUp(self):
+        CALLS.clear()
+
+    def test_enqueue_unknown_task(self):
+        with self.assertRaises(ValueError):
+            enqueue('tests.unknown')
+
+    def test_claim_once(self):
+        job = enqueue('tests.record', n=1)
+        claimed = claim_next('w1')
+        self.assertEqual([j.pk for j in claimed], [job.pk])
+        self.assertEqual((claimed[0].status, claimed[0].locked_by, claimed[0].attempts), (Job.RUNNING, 'w1', 1))
+        # 이미 실행 중인 작업은 다른 워커가 가져가지 않음
+        self.assertEqual(claim_next('w2'), [])
+        self.assertIsNone(claim_job(job.pk, 'w2'))
+
+    def test_claim_waits_for_run_at(self):
+        enqueue('tests.record', run_at=timezone.now() + timedelta(minutes=5))
+        self.assertEqual(claim_next('w1'), [])
+
+    def test_run_done(self):
+        enqueue('tests.record', n=1)
+        job = claim_next('w1')[0]
+        self.assertEqual(run_job(job, heartbeat_interval=None), Job.DONE)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, job.locked_at), (Job.DONE, '', None))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(CALLS, [{'n': 1}])
+
+    def test_retry_with_backoff_then_fail(self):
+        job = enqueue('tests.fail')
+        delays = []
+        for attempt in range(1, 4):
+            Job.objects.filter(pk=job.pk).update(run_at=timezone.now())  # backoff 시간을 기다린 셈
+            claimed = claim_next('w1')[0]
+            before = timezone.now()
+            with self.assertLogs('jobs.queue', 'WARNING'):
+                status = run_job(claimed, heartbeat_interval=None)
+            job.refresh_from_db()
+            self.assertEqual(job.attempts, attempt)
+            self.assertIn("일부러 실패", job.last_error)
+            if attempt < 3:
+                self.assertEqual(status, Job.QUEUED)
+                delays.append(round((job.run_at - before).total_seconds()))
+            else:
+                self.assertEqual(status, Job.FAILED)
+        self.assertEqual(delays, [retry_delay(1), retry_delay(2)])
+        self.assertLess(delays[0], delays[1])
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(retry_delay(100), RETRY_MAX_SECONDS)
+
+    def test_unregistered_task_fails_without_retry(self):
+        job = Job.objects.create(task='tests.removed')
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            self.assertEqual(run_job(claim_job(job.pk, 'w1'), heartbeat_interval=None), Job.FAILED)
+
+    def test_requeue_stale(self):
+        stale = enqueue('tests.record')
+        exhausted = enqueue('tests.record')
+        fresh = enqueue('tests.record')
+        for job in (stale, exhausted, fresh):
+            claim_job(job.pk, 'w1')
+        old = timezone.now() - timedelta(minutes=30)
+        Job.objects.filter(pk__in=[stale.pk, exhausted.pk]).update(locked_at=old)
+        Job.objects.filter(pk=exhausted.pk).update(attempts=3)
+
+        self.assertEqual(requeue_stale(600), (1, 1))
+        statuses = dict(Job.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses, {stale.pk: Job.QUEUED, exhausted.pk: Job.FAILED, fresh.pk: Job.RUNNING})
+
+    def test_progress_heartbeat_keeps_job_locked(self):
+        enqueue('tests.record')
+        job = claim_next('w1')[0]
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(minutes=30))
+        job.set_progress(step=1)
+        self.assertEqual(requeue_stale(600), (0, 0))
+
+    def test_late_finish_does_not_overwrite_new_owner(self):
+        enqueue('tests.record')
+        first = claim_next('w1')[0]
+        Job.objects.filter(pk=first.pk).update(locked_at=timezone.now() - timedelta(minutes=30))
+        requeue_stale(600)
+        second = claim_next('w2')[0]
+
+        # 처음 워커가 뒤늦게 끝나도 w2의 실행 상태는 그대로
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            run_job(first, heartbeat_interval=None)
+        second.refresh_from_db()
+        self.assertEqual((second.status, second.locked_by), (Job.RUNNING, 'w2'))
+
+        self.assertEqual(run_job(second, heartbeat_interval=None), Job.DONE)
+        second.refresh_from_db()
+        self.assertEqual(second.status, Job.DONE)
+
+    @override_settings(JOBS_EAGER=True)
+    def test_eager_runs_immediately(self):
+        job = enqueue('tests.record', n=2)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(CALLS, [{'n': 2}])
@@ -1,3 +1,29 @@
-from django.test import TestCase
+from monitoring.tests import QueryBudgetTestCase
 
-# Create your tests here.
+
+class MainPageQueryBudgetTests(QueryBudgetTestCase):
+
+    def test_anonymous(self):
+        cold, warm = self.assertWithinBudget('/', 'main:main_page')
+        self.assertContains(cold, '테스트식품29')
+        self.assertContains(warm, '테스트식품29')
+
+    def test_logged_in(self):
+        self.assertWithinBudget('/', 'main:main_page', user=self.user)
+
+
+class MicrocacheCookieTests(QueryBudgetTestCase):
+    """nginx 마이크로캐시 대상 페이지 (nginx.conf): 비로그인 응답에 Set-Cookie가 있으면 nginx가 저장하지 않음"""
+
+    def test_anonymous_pages_set_no_cookie(self):
+        for url in ('/', '/search/', f'/products/{self.foods[0].food_id}/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(dict(response.cookies), {}, url)
+            self.assertNotContains(response, 'name="csrf-token"')
+
+    def test_logged_in_page_has_csrf_token(self):
+        self.client.force_login(self.user)
+        response = self.client.get('/')
+        self.assertContains(response, 'name="csrf-token"')
+        self.assertIn('csrftoken', response.cookies)
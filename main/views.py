@@ -1,19 +1,28 @@
 # views.py
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
+from foods.catalog import card_grid_key, lazy_cards, record_cards
 from foods.models import Food
+from foods.snapshot import get_snapshot
 import random
 
-def main_page(request):
-    sorted_foods = list(
-        Food.objects
-        .exclude(image_url__isnull=True)
-        .exclude(image_url='')
-        .order_by('-nutrition_score')[:300]
-    )
+async def main_page(request):
+    # 비동기 뷰: ASGI 모드(SERVER_MODE=asgi)에서는 DB를 기다리는 동안 다른 요청을 처리함
+    # 추천 식품 ID는 카탈로그 스냅샷에서 (버전이 바뀌었을 때만 DB 조회 - foods/snapshot.py)
+    food_ids = (await sync_to_async(get_snapshot)()).main_food_ids
 
-    foods = sorted_foods[:10]
+    # 카드 묶음은 fragment 캐시 → 캐시가 비었을 때만 식품 행을 읽음
+    def load_foods():
+        by_id = Food.objects.in_bulk(food_ids)
+        return [by_id[food_id] for food_id in food_ids if food_id in by_id]
 
-    return render(request, 'main/main_mainpage.html', {'foods': foods})
+    foods = lazy_cards(load_foods)
+    context = {'foods': foods, 'cards_key': card_grid_key(food_ids)}
+
+    # 템플릿(base.html)이 request.user를 읽으면서 DB를 조회하므로 렌더링은 스레드에서
+    response = await sync_to_async(render)(request, 'main/main_mainpage.html', context)
+    record_cards('main_cards', foods)
+    return response
 
 def permission_denied_view(request, exception=None):
     """403 에러 페이지 뷰"""
@@ -0,0 +1,53 @@
+import os
+
+from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
+
+from .models import ProfileCapture
+from .profiler import read_top_stacks
+
+
+@admin.register(ProfileCapture)
+class ProfileCaptureAdmin(admin.ModelAdmin):
+    list_display = ['view_name', 'method', 'status', 'duration_ms', 'sql_count', 'sql_ms', 'samples', 'reason', 'created_at']
+    list_filter = ['reason', 'view_name']
+    search_fields = ['view_name', 'path']
+    ordering = ['-duration_ms']  # 느린 요청부터
+    readonly_fields = [
+        'view_name', 'method', 'path', 'status', 'duration_ms', 'sql_count', 'sql_ms',
+        'samples', 'reason', 'created_at', 'download', 'top_stacks',
+    ]
+    exclude = ['file_path']
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_urls(self):
+        return [
+            path('<int:pk>/folded/', self.admin_site.admin_view(self.download_view), name='monitoring_profilecapture_folded'),
+        ] + super().get_urls()
+
+    def download_view(self, request, pk):
+        capture = get_object_or_404(ProfileCapture, pk=pk)
+        if not os.path.exists(capture.file_path):
+            raise Http404("프로파일 파일이 없습니다.")
+        return FileResponse(open(capture.file_path, 'rb'), as_attachment=True, filename=os.path.basename(capture.file_path))
+
+    @admin.display(description="스택 파일 (flamegraph.pl / speedscope)")
+    def download(self, obj):
+        return format_html('<a href="{}">다운로드</a>', reverse('admin:monitoring_profilecapture_folded', args=[obj.pk]))
+
+    @admin.display(description="샘플이 많은 스택")
+    def top_stacks(self, obj):
+        rows = read_top_stacks(obj.file_path)
+        if not rows:
+            return "-"
+        # 스택은 길어서 뒤쪽(실제로 시간을 쓴 프레임)만 보여줌
+        lines = format_html_join(
+            '\n', '{} ({}%)  …{}',
+            ((n, round(n * 100 / obj.samples), ' → '.join(stack.split(';')[-6:])) for n, stack in rows),
+        )
+        return format_html('<pre style="white-space: pre-wrap">{}</pre>', lines)
@@ -0,0 +1,327 @@
+"""
+Prometheus 텍스트 형식 지표 (외부 라이브러리 없이)
+- 프로세스마다 메모리에 counter / gauge / histogram을 모으고, 백그라운드 스레드가 METRICS_FLUSH_SECONDS마다
+  바뀐 내용을 METRICS_DIR/<pid>.json에 기록 (요청이 멈춘 워커의 마지막 값도 반영됨)
+- /metrics는 디렉터리의 파일을 모두 합쳐서 출력 → gunicorn 워커 여러 개의 지표가 한 번에 보임
+  - counter/histogram: 끝난 워커(max_requests 재시작 등)의 값도 dead.json에 합쳐서 유지 → 값이 줄어들지 않음
+  - gauge: 살아 있는 워커 것만 합산
+- 이 모듈은 Django 없이도 import 가능 (gunicorn.conf.py 훅에서 사용)
+
+기록하는 지표:
+    http_requests_total{view, method, status}            요청 수
+    http_request_duration_seconds{view}                  응답 시간 histogram
+    http_requests_in_flight                              처리 중인 요청 수 (워커 포화도)
+    http_worker_busy_seconds_total                       요청 처리에 쓴 시간 합 → rate / 워커 수 = 포화도
+    db_queries_total{view}, db_query_seconds_total{view} 요청 안에서 실행한 쿼리 수/시간
+    cache_requests_total{cache, result}                  캐시 hit / miss (record_cache)
+    worker_processes                                     지표를 보고한 살아 있는 프로세스 수
+"""
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+METRICS_DIR = os.getenv('METRICS_DIR') or os.path.join(tempfile.gettempdir(), 'healthtant-metrics')
+METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', '1'))
+DEAD_FILE = 'dead.json'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    'http_requests_total': ('counter', "요청 수"),
+    'http_request_duration_seconds': ('histogram', "뷰별 응답 시간(초)"),
+    'http_requests_in_flight': ('gauge', "처리 중인 요청 수"),
+    'http_worker_busy_seconds_total': ('counter', "요청 처리에 쓴 시간 합(초)"),
+    'db_queries_total': ('counter', "요청 안에서 실행한 SQL 쿼리 수"),
+    'db_query_seconds_total': ('counter', "요청 안에서 SQL 실행에 쓴 시간 합(초)"),
+    'cache_requests_total': ('counter', "캐시 조회 수 (result=hit|miss)"),
+    'worker_processes': ('gauge', "지표를 보고한 살아 있는 프로세스 수"),
+}
+
+
+def _key(name, labels):
+    return json.dumps([name, sorted(labels.items())], ensure_ascii=False)
+
+
+class Registry:
+    """프로세스 하나의 지표 (스레드 안전)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.gauges = defaultdict(float)
+        self.histograms = {}  # key → [버킷별 개수..., sum, count]
+        self.dirty = False
+        self._flusher_pid = None
+
+    def after_fork(self):
+        """fork된 워커에서 호출: 마스터에서 복사된 값/락을 버림 (gunicorn post_fork 훅)"""
+        self.lock = threading.Lock()
+        self.counters.clear()
+        self.gauges.clear()
+        self.histograms.clear()
+        self.dirty = False
+        self._flusher_pid = None
+
+    def _touch(self):
+        """lock 안에서 호출: 변경 표시 + 이 프로세스의 flush 스레드 시작 (fork 후에는 새로 띄움)"""
+        self.dirty = True
+        if self._flusher_pid != os.getpid():
+            self._flusher_pid = os.getpid()
+            threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(METRICS_FLUSH_SECONDS)
+            if self.dirty:
+                self.flush()
+
+    def inc(self, name, amount=1.0, **labels):
+        with self.lock:
+            self.counters[_key(name, labels)] += amount
+            self._touch()
+
+    def gauge_add(self, name, amount, **labels):
+        with self.lock:
+            self.gauges[_key(name, labels)] += amount
+            self._touch()
+
+    def observe(self, name, value, buckets=DEFAULT_BUCKETS, **labels):
+        key = _key(name, labels)
+        with self.lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = [0] * len(buckets) + [0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    hist[i] += 1
+                    break
+            hist[-2] += value
+            hist[-1] += 1
+            self._touch()
+
+    def snapshot(self):
+        with self.lock:
+            self.dirty = False
+            return {
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+                'histograms': {k: list(v) for k, v in self.histograms.items()},
+            }
+
+    def flush(self):
+        """현재 값을 <pid>.json에 기록"""
+        _write_json(os.path.join(METRICS_DIR, f"{os.getpid()}.json"), self.snapshot())
+
+
+REGISTRY = Registry()
+
+
+def record_cache(cache_name, hit):
+    """캐시 조회 결과 기록: record_cache('search_token', ids is not None)"""
+    REGISTRY.inc('cache_requests_total', cache=cache_name, result='hit' if hit else 'miss')
+
+
+@contextmanager
+def track_request():
+    """in-flight gauge / busy 시간 기록 → yield 후 경과 시간은 호출한 쪽에서 observe"""
+    REGISTRY.gauge_add('http_requests_in_flight', 1)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.gauge_add('http_requests_in_flight', -1)
+        REGISTRY.inc('http_worker_busy_seconds_total', time.perf_counter() - started)
+
+
+# ---------------------------------------------------------------------------
+# 파일 수집기
+# ---------------------------------------------------------------------------
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge(total, data, with_gauges=True):
+    for key, value in data.get('counters', {}).items():
+        total['counters'][key] = total['counters'].get(key, 0.0) + value
+    if with_gauges:
+        for key, value in data.get('gauges', {}).items():
+            total['gauges'][key] = total['gauges'].get(key, 0.0) + value
+    for key, values in data.get('histograms', {}).items():
+        current = total['histograms'].get(key)
+        total['histograms'][key] = [a + b for a, b in zip(current, values)] if current else list(values)
+    return total
+
+
+def _empty():
+    return {'counters': {}, 'gauges': {}, 'histograms': {}}
+
+
+@contextmanager
+def _dir_lock():
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    with open(os.path.join(METRICS_DIR, '.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def mark_process_dead(pid):
+    """끝난 프로세스의 counter/histogram을 dead.json에 합치고 파일 삭제 (gunicorn child_exit 훅)"""
+    path = os.path.join(METRICS_DIR, f"{pid}.json")
+    with _dir_lock():
+        data = _read_json(path)
+        if data is None:
+            return
+        dead_path = os.path.join(METRICS_DIR, DEAD_FILE)
+        _write_json(dead_path, _merge(_read_json(dead_path) or _empty(), data, with_gauges=False))
+        os.remove(path)
+
+
+def reset():
+    """서버 시작 시 이전 실행의 파일 삭제 (gunicorn on_starting 훅)"""
+    if not os.path.isdir(METRICS_DIR):
+        return
+    for name in os.listdir(METRICS_DIR):
+        if name.endswith('.json') or name.endswith('.tmp'):
+            os.remove(os.path.join(METRICS_DIR, name))
+
+
+def collect():
+    """모든 프로세스의 지표를 합친 dict (죽은 프로세스 파일은 정리)"""
+    REGISTRY.flush()
+    for name in os.listdir(METRICS_DIR):
+        stem = name[:-5]
+        if name.endswith('.json') and stem.isdigit() and not _alive(int(stem)):
+            mark_process_dead(int(stem))
+
+    total, live = _empty(), 0
+    for name in os.listdir(METRICS_DIR):
+        if not name.endswith('.json'):
+            continue
+        data = _read_json(os.path.join(METRICS_DIR, name))
+        if data is None:
+            continue
+        if name != DEAD_FILE:
+            live += 1
+        _merge(total, data)
+    total['gauges'][_key('worker_processes', {})] = live
+    return total
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+def render(data=None, buckets=DEFAULT_BUCKETS):
+    """Prometheus text exposition format (0.0.4)"""
+    data = data or collect()
+    series = defaultdict(list)  # name → [(labels, kind, value)]
+    for kind in ('counters', 'gauges', 'histograms'):
+        for key, value in data[kind].items():
+            name, labels = json.loads(key)
+            series[name].append((labels, value))
+
+    lines = []
+    for name in sorted(series):
+        kind, help_text = HELP.get(name, ('untyped', name))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in sorted(series[name]):
+            if kind != 'histogram':
+                lines.append(f"{name}{_format_labels(labels)} {value:g}")
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets, value):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels + [['le', f'{bound:g}']])} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labels + [['le', '+Inf']])} {value[-1]}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {value[-2]:g}")
+            lines.append(f"{name}_count{_format_labels(labels)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    요청 수/응답 시간/쿼리 수 기록 (QueryBudgetMiddleware보다 바깥에 둬야 request.query_stats를 읽을 수 있음)
+    sync/async 모두 지원 → ASGI에서 async 뷰까지 스레드 전환 없이 이어짐
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        status = 500
+        try:
+            with track_request():
+                response = self.get_response(request)
+                status = response.status_code
+            return response
+        finally:
+            self.record(request, status, started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        status = 500
+        try:
+            with track_request():
+                response = await self.get_response(request)
+                status = response.status_code
+            return response
+        finally:
+            self.record(request, status, started)
+
+    def record(self, request, status, started):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else '<unmatched>'
+        REGISTRY.inc('http_requests_total', view=view, method=request.method, status=str(status))
+        REGISTRY.observe('http_request_duration_seconds', time.perf_counter() - started, view=view)
+        stats = getattr(request, 'query_stats', None)
+        if stats is not None:
+            REGISTRY.inc('db_queries_total', stats.count, view=view)
+            REGISTRY.inc('db_query_seconds_total', stats.seconds, view=view)
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileCapture',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('view_name', models.CharField(db_index=True, max_length=200)),
+                ('method', models.CharField(max_length=10)),
+                ('path', models.TextField()),
+                ('status', models.PositiveSmallIntegerField()),
+                ('duration_ms', models.FloatField(db_index=True)),
+                ('sql_count', models.PositiveIntegerField(default=0)),
+                ('sql_ms', models.FloatField(default=0)),
+                ('samples', models.PositiveIntegerField(default=0)),
+                ('reason', models.CharField(max_length=10)),
+                ('file_path', models.CharField(max_length=500)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': '프로파일',
+                'verbose_name_plural': '프로파일들',
+                'db_table': 'profile_capture',
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import models
+
+
+class ProfileCapture(models.Model):
+    """
+    샘플링 프로파일러가 저장한 요청 하나 (monitoring/profiler.py)
+    - 스택은 file_path의 folded 형식 파일에 (flamegraph.pl, speedscope 등에서 바로 열 수 있음)
+    """
+    view_name = models.CharField(max_length=200, db_index=True)
+    method = models.CharField(max_length=10)
+    path = models.TextField()
+    status = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField(db_index=True)
+    sql_count = models.PositiveIntegerField(default=0)
+    sql_ms = models.FloatField(default=0)
+    samples = models.PositiveIntegerField(default=0)  # 수집한 스택 샘플 수
+    reason = models.CharField(max_length=10)  # 'slow' (PROFILE_SLOW_MS 초과) / 'sampled' (PROFILE_SAMPLE_RATE)
+    file_path = models.CharField(max_length=500)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'profile_capture'
+        verbose_name = "프로파일"
+        verbose_name_plural = "프로파일들"
+
+    def __str__(self):
+        return f'{self.view_name} {self.duration_ms:.0f}ms'
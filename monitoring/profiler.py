@@ -0,0 +1,219 @@
+"""
+느린 요청 샘플링 프로파일러 (opt-in: PROFILE_REQUESTS = True)
+- 요청을 처리하는 스레드의 스택을 PROFILE_INTERVAL_MS마다 sys._current_frames()로 읽어서 모음
+  (프로세스당 샘플러 스레드 하나, 코드에 훅을 거는 방식이 아니라 요청 속도에 거의 영향 없음)
+- 저장 대상: PROFILE_SAMPLE_RATE 비율로 고른 요청 + PROFILE_SLOW_MS보다 오래 걸린 요청
+  (PROFILE_SLOW_MS를 쓰면 모든 요청을 샘플링하고 느린 것만 남김)
+- 저장: PROFILE_DIR/<뷰 이름>/<시각>-<ms>.folded  ("함수;함수;함수 샘플 수" 형식 → flamegraph.pl / speedscope)
+  뷰마다 최근 PROFILE_KEEP_PER_VIEW개만 남기고 오래된 파일과 ProfileCapture 행은 삭제
+- admin(프로파일들)에서 느린 순으로 보고 상위 스택 확인/파일 다운로드
+- ASGI(async 미들웨어 경로): 이벤트 루프 스레드(코루틴 구간)와 이 요청의 sync_to_async 스레드(ORM/템플릿)를 같이 샘플링
+  → 같은 루프에서 동시에 처리 중인 다른 요청의 코루틴 스택이 섞일 수 있음
+"""
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .models import ProfileCapture
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE_RE = re.compile(r'[^\w.-]+')
+
+
+def _short_filename(filename):
+    """프로젝트 파일은 상대 경로, 라이브러리는 site-packages 뒤쪽만"""
+    base = str(settings.BASE_DIR)
+    if filename.startswith(base):
+        return filename[len(base) + 1:]
+    marker = 'site-packages' + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return os.path.basename(filename)
+
+
+def fold_stack(frame):
+    """frame → 'root;...;leaf' (folded 형식이므로 프레임 이름에 세미콜론/공백이 들어가지 않게)"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        name = f"{code.co_name}({_short_filename(code.co_filename)}:{code.co_firstlineno})"
+        names.append(name.replace(';', ':').replace(' ', '_'))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class Sampler:
+    """등록된 스레드들의 스택을 interval마다 수집하는 프로세스당 하나의 스레드"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.active = threading.Event()
+        self.targets = {}  # 요청 토큰 → (thread id 목록, Counter(folded stack → 샘플 수))
+        self._pid = None
+
+    def start(self, *thread_ids):
+        """thread_ids 샘플링 시작 → stop()에 넘길 토큰 (async 요청은 같은 스레드를 여러 요청이 쓰므로 요청마다 따로)"""
+        token = object()
+        with self.lock:
+            self.targets[token] = (thread_ids, Counter())
+            self.active.set()
+            if self._pid != os.getpid():
+                # 첫 요청이거나 fork된 워커 → 샘플러 스레드 새로 시작
+                self._pid = os.getpid()
+                threading.Thread(target=self._run, name='profile-sampler', daemon=True).start()
+        return token
+
+    def stop(self, token):
+        with self.lock:
+            _, stacks = self.targets.pop(token, ((), Counter()))
+            if not self.targets:
+                self.active.clear()
+        return stacks
+
+    def _run(self):
+        own = threading.get_ident()
+        while True:
+            self.active.wait()
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self.lock:
+                for thread_ids, stacks in self.targets.values():
+                    for thread_id in thread_ids:
+                        frame = frames.get(thread_id)
+                        if frame is not None and thread_id != own:
+                            stacks[fold_stack(frame)] += 1
+
+
+def write_folded(view_name, stacks, duration_ms):
+    """PROFILE_DIR/<뷰>/<시각>-<ms>.folded 저장 → 경로"""
+    directory = os.path.join(settings.PROFILE_DIR, _UNSAFE_RE.sub('_', view_name))
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{int(duration_ms)}ms-{os.getpid()}.folded")
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    return path
+
+
+def rotate(view_name, keep):
+    """뷰마다 최근 keep개만 남기고 오래된 캡처(파일 + 행) 삭제"""
+    old = list(
+        ProfileCapture.objects.filter(view_name=view_name).order_by('-created_at', '-id')
+        .values_list('id', 'file_path')[keep:]
+    )
+    for _, path in old:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    ProfileCapture.objects.filter(id__in=[pk for pk, _ in old]).delete()
+
+
+def read_top_stacks(path, limit=20):
+    """저장된 folded 파일에서 샘플이 많은 스택 limit개 → [(샘플 수, 스택)]"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            rows = [line.rstrip('\n').rsplit(' ', 1) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+    return sorted(((int(n), stack) for stack, n in rows), reverse=True)[:limit]
+
+
+class ProfilerMiddleware:
+    """QueryBudgetMiddleware보다 바깥에 둬야 request.query_stats(SQL 수/시간)를 함께 저장할 수 있음 (sync/async 모두 지원)"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILE_REQUESTS', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILE_SAMPLE_RATE
+        self.slow_ms = settings.PROFILE_SLOW_MS
+        self.keep = settings.PROFILE_KEEP_PER_VIEW
+        self.sampler = Sampler(settings.PROFILE_INTERVAL_MS / 1000)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        sampled = random.random() < self.sample_rate
+        if not sampled and not self.slow_ms:
+            return self.get_response(request)
+
+        token = self.sampler.start(threading.get_ident())
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            stacks = self.sampler.stop(token)
+        duration_ms = (time.perf_counter() - started) * 1000
+        reason = self.reason(stacks, duration_ms, sampled)
+        if reason:
+            self.save_safely(request, response, stacks, duration_ms, reason)
+        return response
+
+    async def __acall__(self, request):
+        sampled = random.random() < self.sample_rate
+        if not sampled and not self.slow_ms:
+            return await self.get_response(request)
+
+        # 이 요청의 동기 구간이 실행될 스레드 (ASGIHandler는 요청마다 thread-sensitive 스레드를 따로 씀)
+        sync_thread = await sync_to_async(threading.get_ident)()
+        token = self.sampler.start(threading.get_ident(), sync_thread)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stacks = self.sampler.stop(token)
+        duration_ms = (time.perf_counter() - started) * 1000
+        reason = self.reason(stacks, duration_ms, sampled)
+        if reason:
+            await sync_to_async(self.save_safely)(request, response, stacks, duration_ms, reason)
+        return response
+
+    def reason(self, stacks, duration_ms, sampled):
+        """저장할 이유 'slow' / 'sampled' (저장하지 않으면 None)"""
+        if not stacks:
+            return None
+        if self.slow_ms and duration_ms >= self.slow_ms:
+            return 'slow'
+        return 'sampled' if sampled else None
+
+    def save_safely(self, request, response, stacks, duration_ms, reason):
+        try:
+            self.save(request, response, stacks, duration_ms, reason)
+        except Exception:
+            # 디스크가 가득 찼거나 DB 오류여도 이미 성공한 요청은 그대로 응답
+            logger.exception("프로파일 저장 실패: %s", request.path)
+
+    def save(self, request, response, stacks, duration_ms, reason):
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else '<unmatched>'
+        query_stats = getattr(request, 'query_stats', None)
+        ProfileCapture.objects.create(
+            view_name=view_name,
+            method=request.method[:10],
+            path=request.get_full_path()[:2000],
+            status=response.status_code,
+            duration_ms=round(duration_ms, 1),
+            sql_count=query_stats.count if query_stats else 0,
+            sql_ms=round(query_stats.seconds * 1000, 1) if query_stats else 0,
+            samples=sum(stacks.values()),
+            reason=reason,
+            file_path=write_folded(view_name, stacks, duration_ms),
+        )
+        rotate(view_name, self.keep)
@@ -0,0 +1,160 @@
+"""
+요청 단위 SQL 쿼리 집계 (N+1 감지)
+- QueryStats: connection.execute_wrapper로 쿼리 수, DB 시간, 같은 모양 SQL의 반복 횟수를 집계
+  (모양: 파라미터 자리/숫자/IN 목록 길이를 무시한 SQL → 반복되면 루프 안에서 쿼리하는 N+1 의심)
+- QueryBudgetMiddleware: 요청마다 집계해서
+  - DEBUG면 Server-Timing 헤더 (브라우저 개발자 도구 Network → Timing 탭에서 확인)
+  - 같은 모양 SQL이 N_PLUS_ONE_THRESHOLD번 이상이면 경고 로그
+  - settings.QUERY_BUDGETS {'뷰 이름': 최대 쿼리 수}를 넘으면 경고 로그
+  - QUERY_BUDGET_STRICT = True면 경고 대신 QueryBudgetExceeded (테스트에서 override_settings로 켬)
+- 테스트/셸: with query_budget(3): client.get(...)  → 초과하거나 N+1이면 QueryBudgetExceeded
+- 집계 중인 QueryStats는 contextvar로 전달 → async 뷰의 ORM 호출(sync_to_async 스레드)도 같이 집계되고
+  미들웨어가 스레드를 오가지 않아도 됨 (sync/async 모두 지원)
+"""
+import contextvars
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+N_PLUS_ONE_THRESHOLD = 5
+
+_IN_LIST_RE = re.compile(r'%s(?:\s*,\s*%s)+')
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def sql_shape(sql):
+    """값만 다른 SQL을 같은 모양으로 묶기 위한 정규화"""
+    return _LITERAL_RE.sub('?', _IN_LIST_RE.sub('%s...', sql))
+
+
+# 지금 컨텍스트에서 집계 중인 QueryStats들 (중첩 가능: 요청 전체 + 테스트의 query_budget)
+_active = contextvars.ContextVar('query_stats', default=())
+
+
+def _dispatch(execute, sql, params, many, context):
+    """모든 DB 연결에 한 번 설치하는 execute wrapper → 집계 중인 QueryStats에 기록"""
+    active = _active.get()
+    if not active:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        shape = sql_shape(sql)
+        for stats in active:
+            stats.record(shape, elapsed)
+
+
+def install(connection, **kwargs):
+    # 맨 앞에 넣음: connection.execute_wrapper()는 끝에서 pop하므로 다른 wrapper 블록 안에서 설치해도 안전
+    if _dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _dispatch)
+
+
+connection_created.connect(install, dispatch_uid='monitoring.queries.install')
+
+
+class QueryStats:
+    """with QueryStats() as stats: ... → stats.count, stats.seconds, stats.repeated()"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+        self._token = None
+
+    def record(self, shape, seconds):
+        self.seconds += seconds
+        self.count += 1
+        self.shapes[shape] += 1
+
+    def __enter__(self):
+        # 이미 열려 있던 연결(signal 연결 전에 만들어진 것)에도 설치
+        for connection in connections.all(initialized_only=True):
+            install(connection)
+        self._token = _active.set(_active.get() + (self,))
+        return self
+
+    def __exit__(self, *exc):
+        _active.reset(self._token)
+
+    def repeated(self, threshold=N_PLUS_ONE_THRESHOLD):
+        """threshold번 이상 반복된 SQL 모양 → [(모양, 횟수)]"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def problems(self, budget=None, threshold=N_PLUS_ONE_THRESHOLD):
+        """예산 초과/N+1 설명 목록 (없으면 빈 리스트)"""
+        found = []
+        if budget is not None and self.count > budget:
+            found.append(f"쿼리 {self.count}개 (예산 {budget}개)")
+        for shape, n in self.repeated(threshold):
+            found.append(f"같은 SQL {n}번 반복 (N+1 의심): {shape[:200]}")
+        return found
+
+    def server_timing(self):
+        return f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries"'
+
+
+@contextmanager
+def query_budget(max_queries=None, threshold=N_PLUS_ONE_THRESHOLD):
+    """블록 안의 쿼리가 max_queries개를 넘거나 N+1 패턴이 보이면 QueryBudgetExceeded"""
+    with QueryStats() as stats:
+        yield stats
+    problems = stats.problems(max_queries, threshold)
+    if problems:
+        raise QueryBudgetExceeded("\n".join(problems))
+
+
+class QueryBudgetMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with QueryStats() as stats:
+            request.query_stats = stats  # MetricsMiddleware가 읽음
+            response = self.get_response(request)
+        return self.check(request, response, stats)
+
+    async def __acall__(self, request):
+        with QueryStats() as stats:
+            request.query_stats = stats
+            response = await self.get_response(request)
+        return self.check(request, response, stats)
+
+    def check(self, request, response, stats):
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else request.path
+        budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        threshold = getattr(settings, 'N_PLUS_ONE_THRESHOLD', N_PLUS_ONE_THRESHOLD)
+        problems = stats.problems(budgets.get(view_name), threshold)
+        if problems:
+            message = f"{view_name} ({request.method} {request.path}): " + " / ".join(problems)
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        if settings.DEBUG:
+            response['Server-Timing'] = stats.server_timing()
+        return response
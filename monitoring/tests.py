@@ -0,0 +1,188 @@
+import tempfile
+from collections import Counter
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from accounts.models import UserProfile
+from foods import snapshot
+from foods.models import Food
+
+from .metrics import MetricsMiddleware
+from .models import ProfileCapture
+from .profiler import ProfilerMiddleware
+from .queries import QueryBudgetExceeded, QueryBudgetMiddleware, QueryStats, query_budget, sql_shape
+
+
+def make_food(i, **fields):
+    """필수 필드만 채운 식품 (점수가 클수록 추천 목록 앞쪽)"""
+    values = {
+        'food_id': f'T{i:06d}',
+        'food_name': f'테스트식품{i}',
+        'food_category': '과자',
+        'representative_food': '과자',
+        'nutritional_value_standard_amount': 100,
+        'calorie': 100.0,
+        'moisture': 1.0,
+        'protein': 1.0,
+        'fat': 1.0,
+        'carbohydrate': 1.0,
+        'weight': 100.0,
+        'company_name': '테스트',
+        'nutrition_score': float(i),
+        'nutri_score_grade': 'A',
+        'image_url': f'https://example.com/{i}.jpg',
+    }
+    values.update(fields)
+    return Food.objects.create(**values)
+
+
+def clear_caches():
+    """fragment 캐시/버전 토큰과 프로세스 안의 카탈로그 스냅샷을 비움 (첫 요청이 가장 많은 쿼리를 씀)"""
+    for alias in settings.CACHES:
+        caches[alias].clear()
+    snapshot._snapshot = None
+
+
+def make_user(username='budget'):
+    user = User.objects.create_user(username=username, password='pw')
+    UserProfile.objects.create(user=user, nickname=username[:10], user_gender='M', user_age=30)
+    return user
+
+
+class QueryBudgetTestCase(TestCase):
+    """
+    settings.QUERY_BUDGETS에 있는 뷰가 예산 안에서 동작하는지 확인하는 기반 클래스
+    - QUERY_BUDGET_STRICT = True → 예산 초과/N+1이면 QueryBudgetMiddleware가 QueryBudgetExceeded를 던져서 테스트 실패
+    - 캐시(fragment/버전/스냅샷)가 빈 첫 요청과 채워진 두 번째 요청을 모두 확인
+    """
+
+    FOODS = 30
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.foods = [make_food(i) for i in range(cls.FOODS)]
+        cls.user = make_user()
+
+    def setUp(self):
+        clear_caches()
+
+    def assertWithinBudget(self, url, view_name, user=None, **extra):
+        """콜드/웜 요청 모두 200이고 예산 안인지 확인 → 두 응답"""
+        self.assertIn(view_name, settings.QUERY_BUDGETS)
+        if user is not None:
+            self.client.force_login(user)
+        clear_caches()
+        responses = []
+        with override_settings(QUERY_BUDGET_STRICT=True):
+            for _ in range(2):
+                response = self.client.get(url, **extra)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.resolver_match.view_name, view_name)
+                responses.append(response)
+        return responses
+
+
+class QueryStatsTests(TestCase):
+
+    def test_sql_shape_ignores_values(self):
+        self.assertEqual(
+            sql_shape("SELECT * FROM food WHERE food_id = 'A1' AND score > 3"),
+            sql_shape("SELECT * FROM food WHERE food_id = 'B2' AND score > 10"),
+        )
+        self.assertEqual(sql_shape("WHERE id IN (%s, %s, %s)"), sql_shape("WHERE id IN (%s, %s)"))
+
+    def test_counts_queries(self):
+        make_food(1)
+        with QueryStats() as stats:
+            list(Food.objects.all())
+            Food.objects.count()
+        self.assertEqual(stats.count, 2)
+
+    def test_budget_exceeded(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            with query_budget(1):
+                list(Food.objects.all())
+                Food.objects.count()
+
+    def test_n_plus_one_flagged(self):
+        for i in range(6):
+            make_food(i)
+        with self.assertRaises(QueryBudgetExceeded) as caught:
+            with query_budget():
+                for food_id in Food.objects.values_list('food_id', flat=True):
+                    Food.objects.get(pk=food_id)
+        self.assertIn('N+1', str(caught.exception))
+
+    def test_single_query_loop_not_flagged(self):
+        for i in range(6):
+            make_food(i)
+        with query_budget(1):
+            names = [food.food_name for food in Food.objects.all()]
+        self.assertEqual(len(names), 6)
+
+
+@override_settings(QUERY_BUDGETS={'main:main_page': 0}, QUERY_BUDGET_STRICT=True)
+class QueryBudgetMiddlewareTests(TestCase):
+
+    def test_middleware_is_async_capable(self):
+        # 맨 앞의 지표/프로파일러/쿼리 미들웨어가 sync 전용이면 ASGI에서 요청마다 스레드 전환이 생김
+        for middleware in (MetricsMiddleware, ProfilerMiddleware, QueryBudgetMiddleware):
+            self.assertTrue(middleware.async_capable and middleware.sync_capable, middleware)
+
+    def test_strict_budget_raises(self):
+        make_food(1)
+        clear_caches()
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/')
+
+    async def test_async_path_counts_queries(self):
+        # ASGI 경로: 미들웨어가 async로 실행되고 ORM은 sync_to_async 스레드에서 실행돼도 집계됨
+        await sync_to_async(make_food)(1)
+        clear_caches()
+        with self.assertRaises(QueryBudgetExceeded):
+            await self.async_client.get('/')
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    def test_warns_when_not_strict(self):
+        make_food(1)
+        clear_caches()
+        with self.assertLogs('monitoring.queries', 'WARNING'):
+            response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(PROFILE_REQUESTS=True, PROFILE_SAMPLE_RATE=1.0, PROFILE_SLOW_MS=0, PROFILE_INTERVAL_MS=1)
+class ProfilerMiddlewareTests(TestCase):
+
+    def setUp(self):
+        make_food(1)
+        clear_caches()
+
+    def test_save_failure_does_not_break_response(self):
+        # PROFILE_DIR 자리에 파일이 있어서 디렉터리를 만들 수 없음
+        with tempfile.NamedTemporaryFile() as blocker, override_settings(PROFILE_DIR=blocker.name):
+            with mock.patch('monitoring.profiler.Sampler.stop', return_value=Counter({'a;b': 1})), \
+                    self.assertLogs('monitoring.profiler', 'ERROR'):
+                response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+
+    async def test_async_path_saves_capture(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(PROFILE_DIR=directory):
+            with mock.patch('monitoring.profiler.Sampler.stop', return_value=Counter({'a;b': 1})):
+                response = await self.async_client.get('/')
+        self.assertEqual(response.status_code, 200)
+        capture = await ProfileCapture.objects.aget()
+        self.assertEqual(capture.view_name, 'main:main_page')
+        self.assertGreater(capture.sql_count, 0)
+
+    def test_long_method_is_truncated(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(PROFILE_DIR=directory):
+            with mock.patch('monitoring.profiler.Sampler.stop', return_value=Counter({'a;b': 1})):
+                response = self.client.generic('PROPPATCHLONG', '/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ProfileCapture.objects.get().method, 'PROPPATCHL')
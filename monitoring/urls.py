@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+app_name = 'monitoring'
+
+urlpatterns = [
+    path('db-pool/', views.db_pool_stats, name='db_pool_stats'),
+]
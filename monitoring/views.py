@@ -0,0 +1,44 @@
+import hmac
+import os
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+
+from .metrics import render
+
+
+def pool_stats(alias='default'):
+    """
+    현재 워커 프로세스의 DB 연결 상태
+    - DB_POOL=pool이면 psycopg_pool 통계 (pool_size, pool_available, requests_waiting, connections_num, usage_ms ...)
+    - 풀이 없으면 설정값만 (CONN_MAX_AGE, CONN_HEALTH_CHECKS)
+    """
+    connection = connections[alias]
+    data = {
+        'alias': alias,
+        'vendor': connection.vendor,
+        'conn_max_age': connection.settings_dict.get('CONN_MAX_AGE'),
+        'conn_health_checks': connection.settings_dict.get('CONN_HEALTH_CHECKS'),
+        'pool': None,
+    }
+    pool = getattr(connection, 'pool', None)
+    if pool is not None:
+        data['pool'] = pool.get_stats()
+    return data
+
+
+@staff_member_required
+def db_pool_stats(request):
+    """GET /monitoring/db-pool/ (스태프 전용) - 워커마다 풀이 따로 있으므로 응답한 워커의 pid도 함께"""
+    return JsonResponse({'pid': os.getpid(), 'databases': [pool_stats(alias) for alias in connections]})
+
+
+def metrics(request):
+    """GET /metrics - Prometheus 수집용 (Bearer 토큰 또는 스태프 로그인)"""
+    auth = request.headers.get('Authorization', '')
+    token_ok = bool(settings.METRICS_TOKEN) and hmac.compare_digest(auth, f"Bearer {settings.METRICS_TOKEN}")
+    if not token_ok and not (request.user.is_active and request.user.is_staff):
+        return HttpResponseForbidden()
+    return HttpResponse(render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,14 +1,11 @@
 from django.shortcuts import render, redirect
-import os
-from uuid import uuid4
-from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_http_methods, require_POST
 from django.contrib import messages
-from django.contrib.auth import logout
 from django.http import JsonResponse
-from django.core.files.storage import default_storage
+from accounts.avatars import process_later, storage_url, store_upload
 from accounts.models import UserProfile
+from accounts.withdrawal import withdraw
 from foods.models import FavoriteFood
 
 @require_http_methods(["GET", "POST"])
@@ -67,33 +64,25 @@ def profile_view(request):
     }
     return render(request, 'mypage/mypage_profile.html', {'user_data': user_data})
 
-MAX_MB = 5
-
-def _save_image_and_get_url(file, user_id):
-    ext = os.path.splitext(file.name)[1].lower()
-    path = f"profiles/{user_id}/{uuid4()}{ext}"
-    saved = default_storage.save(path, file)         
-    return getattr(default_storage, "url", None)(saved) if hasattr(default_storage, "url") \
-           else f"{settings.MEDIA_URL}{saved}"
-
 @login_required(login_url='/accounts/login/')
 @require_POST
 def upload_profile_image(request):
     f = request.FILES.get("profile_image")
     if not f:
         return JsonResponse({"success": False, "error": "파일이 없습니다."}, status=400)
-    if not str(f.content_type).startswith("image/"):
-        return JsonResponse({"success": False, "error": "이미지 파일만 허용됩니다."}, status=400)
-    if f.size > MAX_MB * 1024 * 1024:
-        return JsonResponse({"success": False, "error": f"{MAX_MB}MB 이하만 업로드 가능합니다."}, status=400)
-
-    image_url = _save_image_and_get_url(f, request.user.id)
+    try:
+        upload = store_upload(f, request.user.id)
+    except ValueError as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
+    # 처리 전까지는 원본 URL을 응답하고, 리사이즈/재인코딩이 끝나면 프로필 URL이 바뀜
+    image_url = storage_url(upload)
 
     profile, _ = UserProfile.objects.get_or_create(
         user=request.user, defaults={"nickname": request.user.username}
     )
     profile.profile_image_url = image_url
     profile.save(update_fields=["profile_image_url"])
+    process_later(request.user.id, upload)
 
     return JsonResponse({"success": True, "image_url": image_url})
 
@@ -113,7 +102,7 @@ def favorite_food_list(request):
             "favorite_id": str(f.pk),
             "food_id": str(food.food_id),
             "food_name": food.food_name,
-            "food_img": getattr(food, 'image_url', '') or getattr(food, 'food_img', '') or "http://example.com/default_food.png",
+            "food_img": getattr(food, 'display_image_url', '') or getattr(food, 'food_img', '') or "http://example.com/default_food.png",
             "company_name": getattr(food, 'company_name', '') or "Unknown",
             "calorie": int(food.calorie) if getattr(food, 'calorie', None) else 0,
             "created_at": getattr(f, 'created_at', None),
@@ -140,9 +129,8 @@ def favorite_food_delete(request, food_id):
 @require_http_methods(["GET", "POST"])
 def account_withdraw(request):
     if request.method == 'POST':
-        # 현재 로그인한 유저 완전 삭제
-        request.user.delete()
-        logout(request)  # 삭제 후 세션 종료
+        # 계정 비활성화 + 로그아웃 후 데이터 삭제는 작업 큐에서 (accounts/withdrawal.py)
+        withdraw(request)
         messages.success(request, '회원 탈퇴가 완료되었습니다.')
         return redirect('main:main_page')
     return render(request, 'mypage/mypage_withdraw_confirm.html', {'user': request.user})
\ No newline at end of file
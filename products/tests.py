@@ -1,3 +1,16 @@
-from django.test import TestCase
+from foods.models import FavoriteFood
+from monitoring.tests import QueryBudgetTestCase
 
-# Create your tests here.
+
+class ProductDetailQueryBudgetTests(QueryBudgetTestCase):
+
+    def test_html(self):
+        url = f'/products/{self.foods[0].pk}/'
+        self.assertWithinBudget(url, 'products:product-detail')
+        self.assertWithinBudget(url, 'products:product-detail', user=self.user)
+
+    def test_json(self):
+        FavoriteFood.objects.create(user=self.user, food=self.foods[0])
+        cold, _ = self.assertWithinBudget(f'/products/{self.foods[0].pk}/?format=json', 'products:product-detail',
+                                          user=self.user)
+        self.assertTrue(cold.json()['is_favorite'])
@@ -1,10 +1,12 @@
 from django.http import JsonResponse
-from django.shortcuts import get_object_or_404, render
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404, get_object_or_404, render
 from django.views.decorators.http import require_GET, require_http_methods
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
 from common import nutrition_score
 
+from foods.conditional import catalog_conditional
 from foods.models import Food, FavoriteFood
 
 # bytes 타입을 문자열로 변환하는 헬퍼 함수
@@ -49,7 +51,7 @@ def safe_int(value, default=0):
 def _product_dict(food, is_favorite: bool):
     return {
         "food_id": str(food.pk),
-        "food_img": safe_str(food.image_url) or safe_str(food.food_img) or "",
+        "food_img": safe_str(food.display_image_url) or safe_str(food.food_img) or "",
         "food_name": safe_str(food.food_name),
         "calorie": safe_float(food.calorie),
         "moisture": safe_float(food.moisture),
@@ -85,12 +87,24 @@ def _product_dict(food, is_favorite: bool):
         "is_favorite": is_favorite,
     }
 
+def wants_json(request):
+    """같은 URL에서 JSON을 요청했는지 (아니면 SSR 페이지)"""
+    return (
+        request.GET.get("format") == "json"
+        or "application/json" in request.headers.get("Accept", "")
+        or request.headers.get("X-Requested-With") == "XMLHttpRequest"
+    )
+
 @require_GET
-def product_detail(request, food_id):
-    food = get_object_or_404(Food, pk=food_id)
+@catalog_conditional(json=wants_json, vary=("Accept", "X-Requested-With"))
+async def product_detail(request, food_id):
+    # 퇴역한 식품도 식단/즐겨찾기 기록에서 들어올 수 있으므로 all_objects로 조회
+    food = await aget_object_or_404(Food.all_objects, pk=food_id)
+    user = await request.auser()
+    request.user = user  # 템플릿(context processor)이 사용자를 다시 조회하지 않게
     is_fav = (
-        request.user.is_authenticated
-        and FavoriteFood.objects.filter(user_id=request.user.id, food=food).exists()
+        user.is_authenticated
+        and await FavoriteFood.objects.filter(user_id=user.id, food=food).aexists()
     )
 
     data = _product_dict(food, is_fav)
@@ -104,16 +118,11 @@ def product_detail(request, food_id):
     data["protein_level"] = nutrition_score.get_level("protein", food) # ex) {"level": "낮음", "class": "GOOD"}
 
     # JSON이 필요하면 명시적으로 응답
-    wants_json = (
-        request.GET.get("format") == "json"
-        or "application/json" in request.headers.get("Accept", "")
-        or request.headers.get("X-Requested-With") == "XMLHttpRequest"
-    )
-    if wants_json:
+    if wants_json(request):
         return JsonResponse(data)
 
-    # 기본은 SSR 렌더링
-    return render(request, "products/products_detail.html", {"product": data})
+    # 기본은 SSR 렌더링 (템플릿이 request.user를 읽으면서 DB를 조회하므로 스레드에서)
+    return await sync_to_async(render)(request, "products/products_detail.html", {"product": data})
 
 
 @login_required(login_url='/accounts/login/')
@@ -122,7 +131,8 @@ def toggle_favorite(request, food_id):
     """
     POST /products/<food_id>/like/
     """
-    food = get_object_or_404(Food, pk=food_id)
+    # 퇴역한 식품도 식단/즐겨찾기 기록에서 들어올 수 있으므로 all_objects로 조회
+    food = get_object_or_404(Food.all_objects, pk=food_id)
     fav_qs = FavoriteFood.objects.filter(user_id=request.user.id, food=food)
 
     if fav_qs.exists():
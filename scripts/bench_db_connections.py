@@ -0,0 +1,87 @@
+"""
+DB 연결 방식 벤치마크: DB_POOL=off / persistent / pool (config/settings/production.py)
+- 모드마다 하위 프로세스를 띄워서 Django 요청 주기(request_started → 쿼리 → request_finished)를 N번 흉내냄
+  (연결을 닫고 돌려주는 처리는 Django가 이 시그널에서 하므로 실제 요청과 같은 경로)
+- 요청당 소요 시간(평균/p50/p99)과 실제로 맺은 DB 연결 수(pg_backend_pid 종류 수)를 비교
+- 사용법: python scripts/bench_db_connections.py [--requests 2000] [--modes off persistent pool]
+"""
+import os, sys
+import argparse
+import json
+import subprocess
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ['off', 'persistent', 'pool']
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def run_child(n_requests):
+    """현재 DB_POOL 설정으로 요청 n_requests번 → 결과 JSON 출력"""
+    sys.path.insert(0, BASE_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
+    import django
+    django.setup()
+    from django.core import signals
+    from django.db import connection
+
+    from foods.models import Food
+
+    food_ids = list(Food.objects.values_list('food_id', flat=True)[:100]) or ['']
+    signals.request_finished.send(sender=None)
+
+    timings, backend_pids = [], set()
+    for i in range(n_requests):
+        started = time.perf_counter()
+        signals.request_started.send(sender=None)
+        # 가벼운 요청 하나: 식품 한 개 조회
+        Food.all_objects.filter(pk=food_ids[i % len(food_ids)]).first()
+        with connection.cursor() as cur:
+            cur.execute("SELECT pg_backend_pid()")
+            backend_pids.add(cur.fetchone()[0])
+        signals.request_finished.send(sender=None)
+        timings.append(time.perf_counter() - started)
+
+    # pg_backend_pid 조회 비용은 모든 모드에 똑같이 들어감
+    print(json.dumps({
+        'mean_ms': round(sum(timings) / len(timings) * 1000, 3),
+        'p50_ms': round(percentile(timings, 0.50) * 1000, 3),
+        'p99_ms': round(percentile(timings, 0.99) * 1000, 3),
+        'connections': len(backend_pids),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.requests)
+        return
+
+    results = {}
+    for mode in args.modes:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', '--requests', str(args.requests)],
+            env={**os.environ, 'DB_POOL': mode}, capture_output=True, text=True, check=True,
+        )
+        results[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+        r = results[mode]
+        print(f"{mode:>10}: 평균 {r['mean_ms']}ms, p50 {r['p50_ms']}ms, p99 {r['p99_ms']}ms, "
+              f"DB 연결 {r['connections']}개 / 요청 {args.requests}개")
+
+    if 'off' in results:
+        for mode in [m for m in results if m != 'off']:
+            saved = results['off']['mean_ms'] - results[mode]['mean_ms']
+            print(f"{mode}: 요청당 연결 비용 {saved:.3f}ms 절약")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+food 적재 방식 벤치마크: 기존 executemany vs COPY + INSERT ... SELECT ... ON CONFLICT
+- 같은 CSV(기본: food_clean_data.csv, 약 148k행)를 각 방식으로 UPSERT 한 뒤 롤백하므로 DB 내용은 바뀌지 않습니다.
+- 사용법: python scripts/bench_food_loader.py [--csv 경로] [--repeat 2]
+"""
+import argparse
+import time
+
+from django.db import transaction
+
+# insert_food_postgresql을 import 하면 django.setup()까지 완료됨
+from insert_food_postgresql import (
+    CSV_PATH, add_content_hash, add_nutrition_scores, get_db_columns, load_csv, prepare_frame, safe_print,
+)
+from food_loader import copy_upsert_frame, upsert_frame
+
+LOADERS = {
+    'executemany': lambda out, cols: upsert_frame(out, cols, batch_size=1000),
+    'copy': lambda out, cols: copy_upsert_frame(out, cols),
+}
+
+
+def run_once(name, out, cols):
+    """트랜잭션 안에서 적재하고 롤백 → 소요 시간(초)"""
+    with transaction.atomic():
+        started = time.perf_counter()
+        LOADERS[name](out, cols)
+        elapsed = time.perf_counter() - started
+        transaction.set_rollback(True)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", dest="csv_path", default=CSV_PATH)
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    df = load_csv(args.csv_path)
+    if df is None:
+        return
+    cols = get_db_columns()
+    out = add_nutrition_scores(add_content_hash(prepare_frame(df, cols), cols))
+    n = len(out)
+    safe_print(f"벤치마크 대상: {n}행")
+
+    results = {}
+    for name in LOADERS:
+        best = min(run_once(name, out, cols) for _ in range(args.repeat))
+        results[name] = best
+        safe_print(f"{name:>12}: {best:.2f}초, {n / best:,.0f} rows/s")
+
+    if results.get('copy'):
+        safe_print(f"COPY 속도 향상: x{results['executemany'] / results['copy']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+gunicorn 워커 구성 벤치마크: 예전 구성(sync, preload 없음) vs 현재 기본 구성(gthread + preload + 워밍업)
+- 프로필마다 gunicorn -c gunicorn.conf.py 서버를 띄워서
+  1) 요청을 조금 처리한 뒤 워커별 메모리: RSS, PSS(공유 페이지를 나눠 계산), USS(그 워커만 쓰는 메모리)
+     → preload면 공유 페이지가 많아서 PSS/USS가 작음
+  2) 재시작(recycle) 직후 지연: 워커를 모두 종료(max_requests 재시작과 같은 경로) → 새 워커가 fork된 뒤
+     첫 응답을 주기까지 걸린 시간(예전 워커가 종료되는 시간은 제외), 그 첫 요청 자체의 응답 시간, 평소 p50
+- DJANGO_SETTINGS_MODULE, POSTGRES_* 등은 현재 환경변수를 그대로 넘김 (ALLOWED_HOSTS에 127.0.0.1 필요)
+- 사용법: python scripts/bench_gunicorn.py [--workers 2] [--profiles legacy tuned asgi] [--path /search/]
+"""
+import os, sys
+import argparse
+import signal
+import subprocess
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from loadtest import BASE_DIR, percentile, stop_server
+
+PROFILES = {
+    'legacy': {'SERVER_MODE': 'wsgi', 'GUNICORN_THREADS': '1', 'GUNICORN_PRELOAD': '0'},
+    'tuned': {'SERVER_MODE': 'wsgi', 'GUNICORN_THREADS': '4', 'GUNICORN_PRELOAD': '1'},
+    'asgi': {'SERVER_MODE': 'asgi', 'GUNICORN_PRELOAD': '1'},
+}
+HEADERS = {'X-Forwarded-Proto': 'https'}
+
+
+def children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except FileNotFoundError:
+        return []
+
+
+def memory_mb(pid):
+    """{'rss', 'pss', 'uss'} (MB) - /proc/<pid>/smaps_rollup"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                values[parts[0][:-1]] = int(parts[1])
+    return {
+        'rss': values.get('Rss', 0) / 1024,
+        'pss': values.get('Pss', 0) / 1024,
+        'uss': (values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)) / 1024,
+    }
+
+
+def wait_workers(master, n, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        pids = children(master)
+        if len(pids) >= n:
+            return pids
+        time.sleep(0.1)
+    raise SystemExit(f"워커 {n}개가 {timeout}초 안에 뜨지 않았습니다")
+
+
+def start(profile, workers, port):
+    env = {**os.environ, **PROFILES[profile], 'WEB_CONCURRENCY': str(workers), 'GUNICORN_BIND': f"127.0.0.1:{port}"}
+    started = time.perf_counter()
+    proc = subprocess.Popen(['gunicorn', '-c', 'gunicorn.conf.py', '--log-level', 'warning'], cwd=BASE_DIR, env=env)
+    url = f"http://127.0.0.1:{port}/"
+    while True:
+        try:
+            httpx.get(url, headers=HEADERS, timeout=5)
+            return proc, time.perf_counter() - started
+        except httpx.HTTPError:
+            if proc.poll() is not None or time.perf_counter() - started > 60:
+                stop_server(proc)
+                raise SystemExit(f"{profile} 서버가 시작하지 못했습니다")
+            time.sleep(0.05)
+
+
+def steady_latency(client, paths, n):
+    timings = []
+    for i in range(n):
+        started = time.perf_counter()
+        client.get(paths[i % len(paths)])
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def recycle(client, master, paths, workers):
+    """워커를 모두 종료 → 새 워커가 첫 응답을 줄 때까지 (fork→응답 ms, 첫 요청 ms)"""
+    old = children(master)
+    for pid in old:
+        os.kill(pid, signal.SIGTERM)
+    # 종료 중인 예전 워커가 받지 않도록 새 워커가 뜬 뒤부터 요청
+    deadline = time.time() + 60
+    while not (set(children(master)) - set(old)) and time.time() < deadline:
+        time.sleep(0.002)
+    spawned_at = time.perf_counter()
+    while True:
+        started = time.perf_counter()
+        try:
+            # keep-alive 연결은 종료 중인 예전 워커에 붙어 있을 수 있으므로 새 연결로 요청
+            response = httpx.get(f"{client.base_url}{paths[0].lstrip('/')}", headers=HEADERS, timeout=30)
+        except httpx.HTTPError:
+            if time.time() > deadline:
+                raise SystemExit("재시작된 워커가 응답하지 않습니다")
+            continue
+        if response.status_code == 200:
+            return (time.perf_counter() - spawned_at) * 1000, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", nargs="+", choices=list(PROFILES), default=['legacy', 'tuned'])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--path", dest="paths", action="append", default=None)
+    parser.add_argument("--requests", type=int, default=300, help="메모리 측정 전에 처리할 요청 수")
+    parser.add_argument("--port", type=int, default=8790)
+    args = parser.parse_args()
+    paths = args.paths or ['/', '/search/', '/search/normal/?keyword=우유']
+
+    for profile in args.profiles:
+        proc, boot = start(profile, args.workers, args.port)
+        try:
+            with httpx.Client(base_url=f"http://127.0.0.1:{args.port}", headers=HEADERS, timeout=30) as client:
+                wait_workers(proc.pid, args.workers)
+                timings = steady_latency(client, paths, args.requests)
+                workers = [memory_mb(pid) for pid in children(proc.pid)]
+                master = memory_mb(proc.pid)
+                ready_ms, first_ms = recycle(client, proc.pid, paths, args.workers)
+                after = steady_latency(client, paths[:1], 5)
+        finally:
+            stop_server(proc)
+
+        avg = {k: sum(w[k] for w in workers) / len(workers) for k in ('rss', 'pss', 'uss')}
+        total_pss = master['pss'] + sum(w['pss'] for w in workers)
+        print(f"[{profile}] {PROFILES[profile]}")
+        print(f"  서버 시작 → 첫 응답 {boot:.2f}초")
+        print(f"  워커 {len(workers)}개 평균: RSS {avg['rss']:.1f}MB, PSS {avg['pss']:.1f}MB, USS {avg['uss']:.1f}MB "
+              f"(마스터 RSS {master['rss']:.1f}MB, 서버 전체 PSS {total_pss:.1f}MB)")
+        print(f"  평소 p50 {percentile(timings, 0.5) * 1000:.1f}ms / "
+              f"재시작(fork) → 첫 응답 {ready_ms:.0f}ms (그 요청 {first_ms:.1f}ms), 이후 요청 {[round(t * 1000, 1) for t in after]}ms")
+
+
+if __name__ == "__main__":
+    main()
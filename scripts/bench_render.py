@@ -0,0 +1,120 @@
+"""
+서버 렌더링 페이지 벤치마크: fragment/분석 캐시가 비었을 때(cold) vs 채워졌을 때(warm)
+- 식단을 가진 임시 사용자로 로그인해서 페이지마다 N번 요청 (Django test client, 실제 미들웨어/템플릿 경로 그대로)
+- cold: 요청마다 캐시를 비움 → 매번 계산 + 렌더링 + 캐시 저장
+- warm: 첫 요청 뒤 캐시 재사용 → 버전 확인 + 캐시 읽기
+- 페이지별 평균/p50/p99 응답 시간(ms)과 요청당 SQL 수를 출력
+- 임시 캐시 디렉터리를 쓰므로 운영 캐시는 건드리지 않음
+- 사용법: python scripts/bench_render.py [--requests 50] [--diets 600] [--keyword 우유]
+"""
+import os, sys
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+
+import django
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, override_settings
+
+from accounts.models import UserProfile
+from diets.models import Diet
+from foods.models import Food
+from monitoring.queries import QueryStats
+
+MEALS = [choice for choice, _ in Diet._meta.get_field('meal').choices]
+DAYS = 60
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def make_user(n_diets):
+    """최근 DAYS일 동안 식단 n_diets개를 가진 임시 사용자"""
+    food_ids = list(Food.objects.values_list('food_id', flat=True)[:1000])
+    if not food_ids:
+        raise SystemExit("food 테이블이 비어 있습니다. 먼저 insert_food_postgresql.py로 적재하세요.")
+    user = get_user_model().objects.create_user(username=f"bench-{time.time_ns()}")
+    UserProfile.objects.create(user=user, nickname=f"bench{user.pk}", user_gender='M', user_age=30)
+    start = date.today() - timedelta(days=DAYS - 1)
+    Diet.objects.bulk_create(
+        (Diet(user=user, food_id=random.choice(food_ids), date=start + timedelta(days=i % DAYS), meal=random.choice(MEALS))
+         for i in range(n_diets)),
+        batch_size=5000,
+    )
+    return user, start
+
+
+def measure(client, url, n_requests, cold):
+    timings, queries = [], []
+    client.get(url, secure=True)  # 템플릿 로더 캐시 채우기
+    for _ in range(n_requests):
+        if cold:
+            cache.clear()
+        with QueryStats() as stats:
+            started = time.perf_counter()
+            response = client.get(url, secure=True)
+            timings.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise SystemExit(f"{url}: HTTP {response.status_code}")
+        queries.append(stats.count)
+    return {
+        'mean_ms': sum(timings) / len(timings) * 1000,
+        'p50_ms': percentile(timings, 0.50) * 1000,
+        'p99_ms': percentile(timings, 0.99) * 1000,
+        'queries': sum(queries) / len(queries),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--diets", type=int, default=600)
+    parser.add_argument("--keyword", default="우유")
+    args = parser.parse_args()
+
+    user, start = make_user(args.diets)
+    period = f"start_date={start}&end_date={date.today()}"
+    pages = {
+        'main': '/',
+        'search_page': f'/search/page/?keyword={args.keyword}',
+        'analysis_main': f'/analysis/result/?{period}',
+        'analysis_diet': f'/analysis/diets/?{period}',
+    }
+    cache_dir = tempfile.mkdtemp(prefix='bench-render-')
+    cache_settings = {
+        alias: {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': f'{cache_dir}/{alias}'}
+        for alias in ('default', 'versions')
+    }
+
+    try:
+        with override_settings(ALLOWED_HOSTS=['*'], SECURE_SSL_REDIRECT=False, CACHES=cache_settings):
+            client = Client()
+            client.force_login(user)
+            print(f"{'page':>14} {'mode':>5} {'mean':>9} {'p50':>9} {'p99':>9} {'SQL':>5}")
+            for name, url in pages.items():
+                results = {}
+                for mode in ('cold', 'warm'):
+                    r = results[mode] = measure(client, url, args.requests, cold=(mode == 'cold'))
+                    print(f"{name:>14} {mode:>5} {r['mean_ms']:8.2f}ms {r['p50_ms']:8.2f}ms {r['p99_ms']:8.2f}ms "
+                          f"{r['queries']:5.1f}")
+                speedup = results['cold']['mean_ms'] / results['warm']['mean_ms']
+                print(f"{'':>14} → warm이 {speedup:.1f}배 빠름")
+    finally:
+        user.delete()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
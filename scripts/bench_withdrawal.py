@@ -0,0 +1,88 @@
+"""
+회원 탈퇴 삭제 벤치마크: 기존 user.delete() vs accounts/withdrawal.py의 batch 삭제
+- 식단 N개(기본 50,000)와 즐겨찾기를 가진 임시 사용자를 만들어 각 방식으로 삭제합니다.
+- 소요 시간, Python 메모리 최대 사용량(tracemalloc), 가장 긴 단일 트랜잭션 시간(잠금 유지 시간)을 비교합니다.
+- 사용법: python scripts/bench_withdrawal.py [--diets 50000] [--batch-size 5000]
+"""
+import os, sys
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import django
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
+django.setup()
+
+from django.contrib.auth import get_user_model
+from diets.models import Diet
+from foods.models import FavoriteFood, Food
+from accounts.models import UserProfile
+from accounts.withdrawal import DELETE_BATCH_SIZE, delete_user_data
+
+MEALS = [choice for choice, _ in Diet._meta.get_field('meal').choices]
+
+
+def make_user(n_diets, n_favorites=200):
+    """식단 n_diets개 + 즐겨찾기를 가진 임시 사용자 → user_id"""
+    food_ids = list(Food.objects.values_list('food_id', flat=True)[:max(n_favorites, 1000)])
+    if not food_ids:
+        raise SystemExit("food 테이블이 비어 있습니다. 먼저 insert_food_postgresql.py로 적재하세요.")
+    user = get_user_model().objects.create_user(username=f"bench-{time.time_ns()}")
+    UserProfile.objects.create(user=user, nickname=f"bench{user.pk}")
+    start = date(2020, 1, 1)
+    Diet.objects.bulk_create(
+        (Diet(user=user, food_id=random.choice(food_ids), date=start + timedelta(days=i // 10), meal=random.choice(MEALS))
+         for i in range(n_diets)),
+        batch_size=5000,
+    )
+    FavoriteFood.objects.bulk_create(
+        [FavoriteFood(user=user, food_id=food_id) for food_id in food_ids[:n_favorites]],
+        ignore_conflicts=True,
+    )
+    return user.pk
+
+
+def run_collector(user_id, batch_size):
+    """기존 방식: Django collector가 관련 행을 모두 읽은 뒤 한 트랜잭션에서 삭제"""
+    started = time.perf_counter()
+    get_user_model().objects.get(pk=user_id).delete()
+    elapsed = time.perf_counter() - started
+    return elapsed, elapsed
+
+
+def run_batched(user_id, batch_size):
+    """batch 삭제: batch마다 커밋하므로 잠금 유지 시간 = 가장 긴 batch"""
+    marks = [time.perf_counter()]
+    delete_user_data(user_id, batch_size=batch_size, progress=lambda **_: marks.append(time.perf_counter()))
+    marks.append(time.perf_counter())
+    longest = max(b - a for a, b in zip(marks, marks[1:]))
+    return marks[-1] - marks[0], longest
+
+
+METHODS = {'user.delete()': run_collector, 'batched': run_batched}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--diets", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=DELETE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    for name, run in METHODS.items():
+        user_id = make_user(args.diets)
+        tracemalloc.start()
+        elapsed, longest = run(user_id, args.batch_size)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        left = Diet.objects.filter(user_id=user_id).count()
+        print(f"{name:>14}: {elapsed:.2f}초, 최대 메모리 {peak / 1024 / 1024:.1f}MB, "
+              f"가장 긴 트랜잭션 {longest:.2f}초, 남은 식단 {left}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+문자열 blocklist 매칭 공용 함수 (clean_food_data.py 에서 사용)
+- 패턴 전체를 trie 형태의 정규식 하나로 컴파일해서 DataFrame을 한 번만 훑음
+  (패턴마다 str.contains를 돌리면 패턴 수 × 행 수만큼 걸림)
+- 패턴이 수천 개로 늘어나도 정규식 길이만 늘어날 뿐 스캔 횟수는 1번
+"""
+import re
+from collections import Counter
+
+import pandas as pd
+
+
+def load_blocklist(path):
+    """한 줄에 패턴 하나 (빈 줄, '#'으로 시작하는 줄은 무시, 중복 제거)"""
+    with open(path, encoding='utf-8-sig') as f:
+        lines = (line.strip() for line in f)
+        return list(dict.fromkeys(line for line in lines if line and not line.startswith('#')))
+
+
+def _build_trie(patterns):
+    trie = {}
+    for pattern in patterns:
+        node = trie
+        for ch in pattern:
+            node = node.setdefault(ch, {})
+        node[''] = True
+    return trie
+
+
+def _trie_to_regex(node):
+    """trie → 정규식 (같은 접두어는 한 번만 비교, 긴 패턴이 먼저 매칭되도록 선택적 꼬리는 greedy '?')"""
+    branches, single_chars = [], []
+    for ch in sorted(k for k in node if k):
+        tail = _trie_to_regex(node[ch])
+        if tail:
+            branches.append(re.escape(ch) + tail)
+        else:
+            single_chars.append(re.escape(ch))
+    if single_chars:
+        branches.append(single_chars[0] if len(single_chars) == 1 else f"[{''.join(single_chars)}]")
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    if '' in node:
+        # 여기서 끝나는 패턴이 있으므로 뒤는 선택적
+        body = f"(?:{body})?" if len(branches) == 1 and len(body) > 1 else f"{body}?"
+    return body
+
+
+class BlocklistMatcher:
+    """
+    패턴 목록을 정규식 하나로 컴파일한 매처
+    - scan(series): 한 번 훑어서 (매칭된 행 mask, 패턴별 매칭 행 수 Counter) 반환
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(dict.fromkeys(p for p in patterns if p))
+        self._pattern_set = set(self.patterns)
+        regex = _trie_to_regex(_build_trie(self.patterns))
+        # lookahead로 감싸서 모든 위치에서 매칭 → 겹치는 패턴도 빠짐없이 찾음
+        self._regex = re.compile(f"(?=({regex}))") if regex else None
+        self._search = re.compile(regex) if regex else None
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def _matched_patterns(self, found):
+        """위치별 최장 매칭 목록 → 실제로 포함된 패턴 집합 (최장 매칭의 접두어인 짧은 패턴까지 포함)"""
+        hits = set()
+        for match in found:
+            hits.update(match[:i] for i in range(1, len(match) + 1) if match[:i] in self._pattern_set)
+        return hits
+
+    def scan(self, series):
+        if self._regex is None:
+            return pd.Series(False, index=series.index), Counter()
+        found = series.fillna('').astype(str).str.findall(self._regex)
+        mask = found.str.len() > 0
+        counts = Counter()
+        for matches in found[mask]:
+            counts.update(self._matched_patterns(matches))
+        return mask, counts
+
+    def mask(self, series):
+        """매칭된 행 mask만 필요할 때 (패턴별 집계 없이 str.contains 한 번)"""
+        if self._regex is None:
+            return pd.Series(False, index=series.index)
+        return series.fillna('').astype(str).str.contains(self._search)
@@ -1,5 +1,8 @@
-import pandas as pd
-import os
+import argparse
+
+from blocklist import BlocklistMatcher, load_blocklist
+from columnar import read_table, write_table
+from run_report import RunReport
 
 # 제거할 쓰레기 데이터 리스트
 GARBAGE_FOOD_NAMES = [
@@ -66,29 +69,54 @@ GARBAGE_FOOD_NAMES = [
     "미드나잇 다크 콜드브루"
 ]
 
-def clean_food_data():
-    # 원본 CSV 파일 읽기
-    df = pd.read_csv('food_clean_data.csv')
+def clean_food_data(in_path='food_clean_data.csv', out_path='food_clean_data_optimized.csv', blocklist_path=None, report=None):
+    report = report or RunReport('clean_food_data')
+
+    # 원본 CSV 파일 읽기 (food_clean_data.parquet 등 컬럼형 파일도 가능)
+    with report.stage('read') as st:
+        df = read_table(in_path)
+        st.rows_out = len(df)
     print(f"원본 데이터: {len(df)}개 행")
-    
-    # 쓰레기 데이터 제거 전 상태 확인
-    garbage_count = 0
-    for garbage_name in GARBAGE_FOOD_NAMES:
-        count = df[df['food_name'].str.contains(garbage_name, na=False, regex=False)].shape[0]
-        if count > 0:
-            print(f"제거할 데이터 '{garbage_name}': {count}개")
-            garbage_count += count
-    
-    # 쓰레기 데이터 제거
-    for garbage_name in GARBAGE_FOOD_NAMES:
-        df = df[~df['food_name'].str.contains(garbage_name, na=False, regex=False)]
-    
-    print(f"제거된 데이터: {garbage_count}개")
+
+    # 쓰레기 데이터 목록: 파일을 주면 파일에서, 아니면 GARBAGE_FOOD_NAMES
+    names = load_blocklist(blocklist_path) if blocklist_path else GARBAGE_FOOD_NAMES
+    matcher = BlocklistMatcher(names)
+    print(f"쓰레기 데이터 패턴: {len(matcher)}개")
+
+    # 한 번 훑어서 제거 대상 mask와 패턴별 개수를 같이 구함
+    with report.stage('filter') as st:
+        garbage, counts = matcher.scan(df['food_name'])
+        st.rows_in = len(df)
+        # 쓰레기 데이터 제거
+        df = df[~garbage]
+        st.rows_out = len(df)
+        # 한 행이 여러 패턴에 걸릴 수 있으므로 제외 사유는 행 기준 합계, 패턴별 개수는 따로 기록
+        st.drop('쓰레기 데이터', garbage.sum())
+        st.extra['patterns'] = {name: int(counts[name]) for name in matcher.patterns if counts[name] > 0}
+    for garbage_name, count in st.extra['patterns'].items():
+        print(f"제거할 데이터 '{garbage_name}': {count}개")
+
+    print(f"제거된 데이터: {int(garbage.sum())}개")
     print(f"정리된 데이터: {len(df)}개 행")
-    
+
     # 새 파일로 저장
-    df.to_csv('food_clean_data_optimized.csv', index=False)
-    print("최적화된 파일 'food_clean_data_optimized.csv' 생성 완료")
+    with report.stage('write') as st:
+        write_table(df, out_path)
+        st.rows_in = st.rows_out = len(df)
+    print(f"최적화된 파일 '{out_path}' 생성 완료")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--in", dest="in_path", default='food_clean_data.csv')
+    parser.add_argument("--out", dest="out_path", default='food_clean_data_optimized.csv')
+    parser.add_argument("--blocklist", dest="blocklist_path", default=None,
+                        help="제거할 식품명 목록 파일 (한 줄에 하나, '#' 주석 가능). 없으면 GARBAGE_FOOD_NAMES 사용")
+    parser.add_argument("--report", default=None, help="단계별 실행 리포트를 저장할 JSON 경로")
+    args = parser.parse_args()
+    report = RunReport('clean_food_data', vars(args))
+    clean_food_data(args.in_path, args.out_path, args.blocklist_path, report=report)
+    report.finish(args.report)
 
 if __name__ == "__main__":
-    clean_food_data()
\ No newline at end of file
+    main()
@@ -0,0 +1,176 @@
+"""
+컬럼형 중간 포맷(Parquet / Arrow IPC) 공용 함수
+- 데이터 파이프라인(crawl_naver → clean_food_data → 임포트) 사이에서 CSV/XLSX 대신 사용
+- 필요한 컬럼만 읽고(projection), Parquet/Arrow 파일은 memory map으로 읽음
+- CSV/XLSX 입력도 같은 함수로 읽을 수 있어서 각 스크립트는 확장자를 신경 쓰지 않아도 됨
+- django를 import 하지 않으므로 crawl_naver.py 같은 독립 스크립트에서도 사용 가능
+"""
+import glob
+import hashlib
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from csv_stream import iter_csv_chunks, read_csv
+
+PARQUET_EXTS = ('.parquet', '.pq')
+ARROW_EXTS = ('.arrow', '.feather', '.ipc')
+EXCEL_EXTS = ('.xlsx', '.xls')
+
+
+def table_format(path):
+    """경로 → 'parquet' / 'arrow' / 'excel' / 'csv' (디렉터리는 partitioned parquet로 취급)"""
+    if os.path.isdir(path):
+        return 'parquet'
+    ext = os.path.splitext(path)[1].lower()
+    if ext in PARQUET_EXTS:
+        return 'parquet'
+    if ext in ARROW_EXTS:
+        return 'arrow'
+    if ext in EXCEL_EXTS:
+        return 'excel'
+    return 'csv'
+
+
+def _projection(columns, names):
+    """요청한 컬럼 중 실제로 있는 것만 (None이면 전체)"""
+    if columns is None:
+        return None
+    return [c for c in columns if c in names]
+
+
+def _usecols(columns):
+    if columns is None:
+        return None
+    wanted = set(columns)
+    return lambda c: c.replace('\ufeff', '').strip() in wanted
+
+
+def _read_arrow(path, columns=None):
+    """Arrow IPC 파일을 memory map으로 읽음 (복사 없이 필요한 컬럼만 선택)"""
+    source = pa.memory_map(path, 'r')
+    table = ipc.open_file(source).read_all()
+    cols = _projection(columns, table.schema.names)
+    return table.select(cols) if cols is not None else table
+
+
+def read_table(path, columns=None):
+    """형식에 맞게 읽어서 DataFrame 반환 (columns를 주면 해당 컬럼만 읽음)"""
+    fmt = table_format(path)
+    if fmt == 'parquet':
+        cols = _projection(columns, ds.dataset(path, format='parquet').schema.names)
+        return pq.read_table(path, columns=cols, memory_map=True).to_pandas()
+    if fmt == 'arrow':
+        return _read_arrow(path, columns).to_pandas()
+    if fmt == 'excel':
+        return pd.read_excel(path, dtype=str, usecols=_usecols(columns))
+    return read_csv(path, usecols=_usecols(columns))
+
+
+def iter_table_chunks(path, chunksize, columns=None):
+    """chunksize 행 이하의 DataFrame을 차례로 yield (CSV/Parquet는 파일 전체를 메모리에 올리지 않음)"""
+    fmt = table_format(path)
+    if fmt == 'parquet':
+        dataset = ds.dataset(path, format='parquet')
+        cols = _projection(columns, dataset.schema.names)
+        for batch in dataset.to_batches(columns=cols, batch_size=chunksize):
+            if batch.num_rows:
+                yield batch.to_pandas()
+    elif fmt == 'arrow':
+        table = _read_arrow(path, columns)
+        for start in range(0, table.num_rows, chunksize):
+            yield table.slice(start, chunksize).to_pandas()
+    elif fmt == 'excel':
+        df = read_table(path, columns)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+    else:
+        yield from iter_csv_chunks(path, chunksize, usecols=_usecols(columns))
+
+
+def write_table(df, path):
+    """확장자에 맞는 형식으로 저장 (임시 파일에 쓴 뒤 교체하므로 중간에 죽어도 기존 파일은 온전함)"""
+    fmt = table_format(path)
+    tmp_path = f"{path}.tmp"
+    if fmt == 'parquet':
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path)
+    elif fmt == 'arrow':
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(tmp_path, 'wb') as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    elif fmt == 'excel':
+        df.to_excel(tmp_path, index=False, engine='openpyxl')
+    else:
+        df.to_csv(tmp_path, index=False, encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+def frame_fingerprint(df):
+    """DataFrame 내용(컬럼 + 인덱스 + 값) 해시 → 체크포인트가 같은 입력에서 만든 것인지 확인할 때 사용"""
+    digest = hashlib.sha1("\x1f".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+class PartitionedCheckpoint:
+    """
+    append-only 체크포인트 디렉터리
+    - append() 할 때마다 그 사이에 새로 처리한 행만 part-NNNNN.parquet 파일 하나로 씀 (기존 part는 다시 쓰지 않음)
+    - read()는 part들을 순서대로 합치고 같은 key가 여러 번 있으면 마지막 값을 사용
+    - start()로 입력 fingerprint를 기록 → 다른 입력(row_id가 다른 행을 가리킴)의 part가 섞이지 않게 함
+    """
+
+    FINGERPRINT_FILE = 'INPUT'
+
+    def __init__(self, directory, key='row_id'):
+        self.directory = directory
+        self.key = key
+        os.makedirs(directory, exist_ok=True)
+
+    def parts(self):
+        return sorted(glob.glob(os.path.join(self.directory, 'part-*.parquet')))
+
+    def start(self, fingerprint, resume=False):
+        """
+        새 실행: 예전 part를 모두 지우고 입력 fingerprint를 기록
+        resume: 남은 part가 다른 입력(또는 fingerprint 기록이 없는 예전 실행)에서 만든 것이면 ValueError
+        """
+        path = os.path.join(self.directory, self.FINGERPRINT_FILE)
+        stored = None
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                stored = f.read().strip()
+        if not resume:
+            for part in self.parts():
+                os.remove(part)
+        elif self.parts() and stored != fingerprint:
+            raise ValueError(
+                f"체크포인트 {self.directory}는 다른 입력에서 만든 것입니다 "
+                f"(입력 {fingerprint}, 체크포인트 {stored or '기록 없음'}) → 디렉터리를 지우거나 --resume 없이 실행하세요"
+            )
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(fingerprint)
+
+    def append(self, df):
+        if df.empty:
+            return None
+        parts = self.parts()
+        last = int(os.path.basename(parts[-1])[5:10]) if parts else 0
+        path = os.path.join(self.directory, f"part-{last + 1:05d}.parquet")
+        write_table(df, path)
+        return path
+
+    def read(self, columns=None):
+        """모든 part를 합친 DataFrame (part가 없으면 None)"""
+        parts = self.parts()
+        if not parts:
+            return None
+        if columns is not None and self.key not in columns:
+            columns = [self.key] + list(columns)
+        tables = [pq.read_table(p, columns=columns, memory_map=True) for p in parts]
+        df = pa.concat_tables(tables, promote_options='default').to_pandas()
+        return df.drop_duplicates(subset=self.key, keep='last')
@@ -3,24 +3,39 @@ import re
 import time
 import html
 import argparse
+import asyncio
 import requests
+import httpx
 import pandas as pd
 from difflib import SequenceMatcher
 from dotenv import load_dotenv
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
+from collections import Counter
 from itertools import cycle
 from threading import Lock
 
+from columnar import PartitionedCheckpoint, frame_fingerprint, read_table, table_format, write_table
+from kv_cache import MISSING, KVCache
+from run_report import RunReport
+
 # ----- 환경 변수 로드 -----
 load_dotenv()
 
 RESULT_CACHE = {}
 CACHE_LOCK = Lock() 
 
+# query_key → API 원본 items 영구 캐시 (SQLite, main에서 --cache 경로로 생성)
+# RESULT_CACHE는 프로세스가 끝나면 사라지지만, 이 캐시는 재실행/--resume 때도 API를 다시 부르지 않게 함
+QUERY_CACHE = None
+
 def norm_query(q: str) -> str:
     return re.sub(r"\s+", " ", (q or "").strip().lower())
 
+def query_key(q, exclude_used, display=3, sort="asc"):
+    """캐시 키: 같은 쿼리라도 요청 옵션이 다르면 결과가 다름 (--exclude-used 실행과 아닌 실행이 캐시를 섞어 쓰지 않게)"""
+    return f"{norm_query(q)}|display={display}|sort={sort}|ex={int(exclude_used)}"
+
 CID_LIST  = [x.strip() for x in os.getenv("NAVER_CLIENT_IDS", "").split(",") if x.strip()]
 CSEC_LIST = [x.strip() for x in os.getenv("NAVER_CLIENT_SECRETS", "").split(",") if x.strip()]
 
@@ -30,7 +45,11 @@ if len(CID_LIST) != len(CSEC_LIST):
 if not CID_LIST:
     raise SystemExit("최소 1개의 키가 필요합니다. .env에 NAVER_CLIENT_IDS, NAVER_CLIENT_SECRETS를 설정하세요.")
 
-API_URL = "https://openapi.naver.com/v1/search/shop.json"
+# 로컬 스텁 서버(scripts/stub_server.py)로 테스트할 때는 NAVER_API_URL 또는 --api-url로 변경
+API_URL = os.getenv("NAVER_API_URL", "https://openapi.naver.com/v1/search/shop.json")
+
+# 키별 초당 호출 한도 (비동기 모드 token bucket 크기). 키마다 다르면 콤마로 나열, 하나만 주면 전체 적용
+QPS_LIST = [float(x) for x in os.getenv("NAVER_KEY_QPS", "10").split(",") if x.strip()]
 
 # 라운드로빈 인덱스 관리 (멀티스레드 안전)
 KEY_CYCLE = cycle(zip(CID_LIST, CSEC_LIST))
@@ -59,6 +78,7 @@ def make_session():
     )
     adapter = HTTPAdapter(max_retries=retry, pool_connections=100, pool_maxsize=100)
     s.mount("https://", adapter)
+    s.mount("http://", adapter)
     return s
 
 SESSION = make_session()
@@ -139,7 +159,7 @@ def process_row(idx, row, exclude_used, throttle_sec):
     if not q:
         return idx, None, "[SKIP] 빈 쿼리"
 
-    nq = norm_query(q)
+    nq = query_key(q, exclude_used)
 
     # 1) 캐시 조회 (락)
     with CACHE_LOCK:
@@ -148,10 +168,16 @@ def process_row(idx, row, exclude_used, throttle_sec):
     if cached is not None or nq in RESULT_CACHE:
         # 캐시에 결과가 있거나, 과거에 '없음(None)'을 기록했다면 바로 사용
         best = cached
+        called_api = False
     else:
-        # 2) API 호출
+        # 2) 영구 캐시 → 없으면 API 호출
+        items = QUERY_CACHE.get(nq) if QUERY_CACHE is not None else MISSING
+        called_api = items is MISSING
         try:
-            items = search_shop(q, display=3, sort="asc", exclude_used=exclude_used)
+            if called_api:
+                items = search_shop(q, display=3, sort="asc", exclude_used=exclude_used)
+                if QUERY_CACHE is not None:
+                    QUERY_CACHE.set(nq, items)  # 빈 결과도 저장 → 재실행 때 재호출 방지
             best = choose_best_item(items, str(row.get("food_name", "")))
         except (requests.ReadTimeout, requests.ConnectTimeout):
             return idx, None, "[TIMEOUT]"
@@ -165,20 +191,24 @@ def process_row(idx, row, exclude_used, throttle_sec):
             RESULT_CACHE[nq] = best  # best가 None이어도 저장 → 재호출 방지
 
     # 과호출 방지(안전장치). 이미 search_shop이 적응형 백오프라면 0~소폭으로 줄여도 됨.
-    if throttle_sec:
+    # 캐시에서 꺼낸 경우는 API를 부르지 않았으므로 쉬지 않음
+    if throttle_sec and called_api:
         time.sleep(throttle_sec)
 
-    if best:
-        return idx, {
-            "naver_title": strip_tags(best.get("title", "")),
-            "lprice": best.get("lprice", ""),
-            "hprice": best.get("hprice", ""),
-            "image": best.get("image", ""),
-            "product_link": best.get("link", ""),
-            "mallName": best.get("mallName", "")
-        }, None
+    return idx, to_result(best), None
 
-    return idx, None, None
+def to_result(best):
+    """선택된 API item → 출력 컬럼 dict (없으면 None)"""
+    if not best:
+        return None
+    return {
+        "naver_title": strip_tags(best.get("title", "")),
+        "lprice": best.get("lprice", ""),
+        "hprice": best.get("hprice", ""),
+        "image": best.get("image", ""),
+        "product_link": best.get("link", ""),
+        "mallName": best.get("mallName", "")
+    }
 
 def is_empty(v):
     if v is None:
@@ -186,9 +216,43 @@ def is_empty(v):
     s = str(v).strip()
     return s == "" or s.lower() in {"nan", "none"}
 
-def enrich_parallel(df, throttle_sec=0.15, limit=None, exclude_used=False, resume=False, workers=5, checkpoint_every=2000, out_path=None):
-    out_cols = ["naver_title", "lprice", "hprice", "image", "product_link", "mallName"]
-    for col in out_cols:
+OUT_COLS = ["naver_title", "lprice", "hprice", "image", "product_link", "mallName"]
+
+def load_checkpoint(df, checkpoint):
+    """
+    체크포인트 part들을 df에 반영하고, 다시 호출할 필요 없는 행 번호 집합을 반환
+    - 매칭 성공/매칭 없음/빈 쿼리는 완료로 보고, TIMEOUT/HTTP 오류 행만 다시 시도
+    """
+    done = checkpoint.read()
+    if done is None:
+        return set()
+    done = done[done["row_id"].isin(df.index)]
+    found = done[done["naver_title"] != ""].set_index("row_id")
+    for col in OUT_COLS:
+        df.loc[found.index, col] = found[col]
+    finished = done["status"].eq("") | done["status"].str.startswith("[SKIP]")
+    print(f"체크포인트 복원: {len(done)}행 (완료 {int(finished.sum())}행, 재시도 {int((~finished).sum())}행)")
+    return set(done.loc[finished, "row_id"])
+
+def open_checkpoint(df, checkpoint_dir, resume=False):
+    """체크포인트 준비: 새 실행이면 예전 part 삭제, resume이면 같은 입력에서 만든 part인지 확인 (row_id 기준이므로)"""
+    if not checkpoint_dir:
+        return None
+    checkpoint = PartitionedCheckpoint(checkpoint_dir)
+    checkpoint.start(frame_fingerprint(df), resume)
+    return checkpoint
+
+def select_rows(df, limit=None, resume=False, checkpoint=None, report=None):
+    """처리할 (idx, row) 목록 (resume이면 이미 값이 있거나 체크포인트에서 완료된 행 제외)"""
+    with (report or RunReport('crawl_naver')).stage('select') as st:
+        rows = _select_rows(df, limit, resume, checkpoint)
+        st.rows_in = min(len(df), int(limit)) if limit else len(df)
+        st.rows_out = len(rows)
+        st.drop('이미 완료', st.rows_in - len(rows))
+    return rows
+
+def _select_rows(df, limit, resume, checkpoint):
+    for col in OUT_COLS:
         if col not in df.columns:
             df[col] = ""
 
@@ -197,40 +261,282 @@ def enrich_parallel(df, throttle_sec=0.15, limit=None, exclude_used=False, resum
     if resume:
         has_lprice = base["lprice"].apply(lambda x: not is_empty(x)) if "lprice" in base.columns else pd.Series(False, index=base.index)
         has_image  = base["image"].apply(lambda x: not is_empty(x))  if "image"  in base.columns else pd.Series(False, index=base.index)
-        todo_df = base[~(has_lprice & has_image)]
+        finished = load_checkpoint(df, checkpoint) if checkpoint else set()
+        todo_df = base[~(has_lprice & has_image) & ~base.index.isin(finished)]
     else:
         todo_df = base
+    return list(todo_df.iterrows())
 
-    rows = list(todo_df.iterrows())
+class ResultRecorder:
+    """
+    처리 결과를 df에 반영하고 checkpoint_every 행마다 새로 처리한 행만 part 파일 하나로 추가
+    (전체 df를 다시 쓰지 않음)
+    """
+    def __init__(self, df, checkpoint=None, checkpoint_every=2000):
+        self.df = df
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.pending = []
+        self.matched = 0
+        self.failures = Counter()  # 매칭 못 한 행의 사유별 개수 (실행 리포트용)
+
+    def record(self, idx, result, status):
+        if result:
+            self.matched += 1
+            for k, v in result.items():
+                self.df.at[idx, k] = v
+        else:
+            # "[ERROR] 메시지" 처럼 뒤에 붙는 상세 내용은 빼고 사유만 셈
+            self.failures[status.split("]")[0] + "]" if status else "매칭 없음"] += 1
+        self.pending.append([idx, status or ""] + [str((result or {}).get(col, "")) for col in OUT_COLS])
+        if self.checkpoint_every and len(self.pending) >= self.checkpoint_every:
+            self.flush()
+
+    def flush(self):
+        if self.checkpoint and self.pending:
+            self.checkpoint.append(pd.DataFrame(self.pending, columns=["row_id", "status"] + OUT_COLS))
+        self.pending.clear()
+
+    def report_to(self, stage, rows):
+        stage.rows_in = len(rows)
+        stage.rows_out = self.matched
+        stage.drops.update(self.failures)
+
+def enrich_parallel(df, throttle_sec=0.15, limit=None, exclude_used=False, resume=False, workers=5, checkpoint_every=2000, checkpoint_dir=None, report=None):
+    report = report or RunReport('crawl_naver')
+    checkpoint = open_checkpoint(df, checkpoint_dir, resume)
+    rows = select_rows(df, limit, resume, checkpoint, report)
     total = len(rows)
     if total == 0:
         return df
 
-    processed_since_save = 0
-
-    with ThreadPoolExecutor(max_workers=workers) as executor:
+    recorder = ResultRecorder(df, checkpoint, checkpoint_every)
+    with report.stage('enrich') as st, ThreadPoolExecutor(max_workers=workers) as executor:
         futures = {
             executor.submit(process_row, idx, row, exclude_used, throttle_sec): idx
             for idx, row in rows
         }
         for fut in tqdm(as_completed(futures), total=total, desc="Processing", ncols=100, mininterval=0.5, leave=False):
-            idx, result, _ = fut.result()
-            if result:
-                for k, v in result.items():
-                    df.at[idx, k] = v
+            recorder.record(*fut.result())
 
-            processed_since_save += 1
-            if out_path and checkpoint_every and processed_since_save >= checkpoint_every:
-                df.to_csv(out_path, index=False, encoding="utf-8")
-                processed_since_save = 0  # reset
+        # 마지막 part 저장 보장
+        recorder.flush()
+        recorder.report_to(st, rows)
 
-    # 마지막 저장 보장
-    if out_path:
-        df.to_csv(out_path, index=False, encoding="utf-8")
+    return df
+
+# ----- 비동기 모드 (--async): 키별 token bucket + 적응형 동시성 -----
+class TokenBucket:
+    """
+    초당 rate개씩 채워지는 토큰 버킷 (capacity만큼 순간 burst 허용)
+    - 이벤트 루프 한 스레드에서만 쓰므로 락 없이 try_acquire 사이에 await가 없으면 안전
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self):
+        """토큰 하나를 얻기까지 남은 시간(초)"""
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def try_acquire(self):
+        if self.wait_time() > 0:
+            return False
+        self.tokens -= 1
+        return True
+
+    def pause(self, seconds):
+        """429를 받으면 해당 키는 seconds 동안 토큰이 없도록 비움"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+class ApiKey:
+    def __init__(self, cid, csec, qps):
+        self.cid = cid
+        self.headers = {"X-Naver-Client-Id": cid, "X-Naver-Client-Secret": csec}
+        self.bucket = TokenBucket(qps)
+        self.requests = 0
+        self.ok = 0
+        self.throttled = 0
+
+class KeyPool:
+    """토큰이 가장 빨리 생기는 키를 골라서 사용 (한 키가 429로 쉬는 동안 다른 키로 넘어감)"""
+    def __init__(self, cids, csecs, qps_list):
+        qps_list = qps_list if len(qps_list) == len(cids) else [qps_list[0]] * len(cids)
+        self.keys = [ApiKey(cid, csec, qps) for cid, csec, qps in zip(cids, csecs, qps_list)]
+
+    async def acquire(self):
+        while True:
+            key = min(self.keys, key=lambda k: k.bucket.wait_time())
+            if key.bucket.try_acquire():
+                key.requests += 1
+                return key
+            await asyncio.sleep(key.bucket.wait_time())
+
+class AdaptiveLimiter:
+    """
+    AIMD 방식 동시 요청 수 제한
+    - 성공하면 한 window(limit개 요청)마다 +1, 429/timeout이면 절반으로 줄임
+    """
+    def __init__(self, initial, minimum=1, maximum=64):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self.peak = 0
+        self.cond = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self.cond:
+            await self.cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    async def __aexit__(self, *exc):
+        async with self.cond:
+            self.in_flight -= 1
+            self.cond.notify_all()
+
+    def on_success(self):
+        self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def on_throttle(self):
+        self.limit = max(self.minimum, self.limit / 2)
+
+async def search_shop_async(client, keys, limiter, query, display=3, sort="asc", exclude_used=False, max_retry=4):
+    params = {"query": query, "display": display, "sort": sort}
+    if exclude_used:
+        params["exclude"] = "used:cbshop"
 
+    resp = None
+    backoff = 0.0
+    for attempt in range(max_retry):
+        key = await keys.acquire()
+        try:
+            async with limiter:
+                resp = await client.get(API_URL, headers=key.headers, params=params)
+        except httpx.TimeoutException:
+            limiter.on_throttle()
+            backoff = max(backoff * 2, 0.5)
+            await asyncio.sleep(backoff)
+            continue
+
+        if resp.status_code == 200:
+            key.ok += 1
+            limiter.on_success()
+            return resp.json().get("items", [])
+        if resp.status_code == 429:
+            # 한도 → 이 키만 잠시 쉬게 하고 (다른 키로) 재시도
+            key.throttled += 1
+            key.bucket.pause(1.0)
+            limiter.on_throttle()
+            continue
+        await asyncio.sleep(0.3)
+
+    if resp is None:
+        raise httpx.ReadTimeout("all retries timed out")
+    resp.raise_for_status()
+    return []
+
+async def process_row_async(client, keys, limiter, inflight, idx, row, exclude_used):
+    """process_row의 비동기 버전 (같은 쿼리가 동시에 여러 행에서 나오면 API는 한 번만 호출)"""
+    q = build_query(row)
+    if not q:
+        return idx, None, "[SKIP] 빈 쿼리"
+
+    nq = query_key(q, exclude_used)
+    if nq in RESULT_CACHE:
+        return idx, to_result(RESULT_CACHE[nq]), None
+
+    items = MISSING
+    if nq not in inflight:
+        # 같은 쿼리를 이미 요청 중이면 영구 캐시를 다시 보지 않음 (없음 횟수가 부풀지 않게)
+        items = QUERY_CACHE.get(nq) if QUERY_CACHE is not None else MISSING
+        if items is MISSING:
+            inflight[nq] = asyncio.ensure_future(fetch_items_async(client, keys, limiter, nq, q, exclude_used))
+    if items is MISSING:
+        try:
+            items = await asyncio.shield(inflight[nq])
+        except httpx.TimeoutException:
+            return idx, None, "[TIMEOUT]"
+        except httpx.HTTPStatusError as e:
+            return idx, None, f"[HTTP {e.response.status_code}]"
+        except Exception as e:
+            return idx, None, f"[ERROR] {e}"
+        finally:
+            if inflight.get(nq) is not None and inflight[nq].done():
+                inflight.pop(nq, None)
+
+    best = choose_best_item(items, str(row.get("food_name", "")))
+    RESULT_CACHE[nq] = best  # best가 None이어도 저장 → 재호출 방지
+    return idx, to_result(best), None
+
+async def fetch_items_async(client, keys, limiter, nq, q, exclude_used):
+    """API 호출 후 영구 캐시에 저장 (같은 쿼리를 기다리는 행들이 이 결과를 공유)"""
+    items = await search_shop_async(client, keys, limiter, q, display=3, sort="asc", exclude_used=exclude_used)
+    if QUERY_CACHE is not None:
+        QUERY_CACHE.set(nq, items)
+    return items
+
+async def _enrich_async(rows, recorder, exclude_used, concurrency, max_concurrency):
+    keys = KeyPool(CID_LIST, CSEC_LIST, QPS_LIST)
+    limiter = AdaptiveLimiter(concurrency, maximum=max_concurrency)
+    inflight = {}
+    queue = asyncio.Queue()
+    for item in rows:
+        queue.put_nowait(item)
+
+    started = time.monotonic()
+    pbar = tqdm(total=len(rows), desc="Processing(async)", ncols=100, mininterval=0.5, leave=False)
+    limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(6.0, connect=3.0)) as client:
+        async def worker():
+            while not queue.empty():
+                idx, row = queue.get_nowait()
+                recorder.record(*await process_row_async(client, keys, limiter, inflight, idx, row, exclude_used))
+                pbar.update(1)
+
+        await asyncio.gather(*(worker() for _ in range(max_concurrency)))
+    pbar.close()
+
+    elapsed = time.monotonic() - started
+    print(f"비동기 처리: {len(rows)}행, {elapsed:.1f}초 ({len(rows) / elapsed if elapsed else 0:.1f} rows/s), "
+          f"최종 동시성 {limiter.limit:.1f} (최대 {limiter.peak})")
+    for key in keys.keys:
+        print(f"  key {key.cid[:6]}…: 요청 {key.requests}, 성공 {key.ok} ({key.ok / elapsed if elapsed else 0:.1f}/s), 429 {key.throttled}")
+    return {
+        "final_concurrency": round(limiter.limit, 1),
+        "peak_concurrency": limiter.peak,
+        "keys": {f"{key.cid[:6]}…": {"requests": key.requests, "ok": key.ok, "throttled": key.throttled} for key in keys.keys},
+    }
+
+def enrich_async(df, limit=None, exclude_used=False, resume=False, concurrency=8, max_concurrency=64, checkpoint_every=2000, checkpoint_dir=None, report=None):
+    report = report or RunReport('crawl_naver')
+    checkpoint = open_checkpoint(df, checkpoint_dir, resume)
+    rows = select_rows(df, limit, resume, checkpoint, report)
+    if not rows:
+        return df
+
+    recorder = ResultRecorder(df, checkpoint, checkpoint_every)
+    with report.stage('enrich') as st:
+        try:
+            st.extra.update(asyncio.run(_enrich_async(rows, recorder, exclude_used, concurrency, max_concurrency)))
+        finally:
+            # 중간에 멈춰도(Ctrl+C 등) 처리한 행까지는 체크포인트에 남김
+            recorder.flush()
+            recorder.report_to(st, rows)
     return df
 
 def main():
+    global API_URL, QUERY_CACHE
     parser = argparse.ArgumentParser()
     parser.add_argument("--in",  dest="in_path",  required=True)
     parser.add_argument("--out", dest="out_path", required=True)
@@ -239,29 +545,79 @@ def main():
     parser.add_argument("--limit", dest="limit", type=int, default=None, help="상위 N행만 처리(테스트용)")
     parser.add_argument("--exclude-used", action="store_true", help="중고/중개 상품 제외")
     parser.add_argument("--resume", action="store_true", help="이미 처리한 행 건너뛰기")
-    parser.add_argument("--workers", type=int, default=5, help="동시 실행 스레드 수")
+    parser.add_argument("--workers", type=int, default=5, help="동시 실행 스레드 수 (--async에서는 초기 동시 요청 수)")
+    parser.add_argument("--checkpoint-dir", dest="checkpoint_dir", default=None,
+                        help="append-only 체크포인트(parquet part) 디렉터리 (기본: <out>.parts, --resume 없이 실행하면 비움)")
+    parser.add_argument("--checkpoint-every", dest="checkpoint_every", type=int, default=2000,
+                        help="몇 행마다 체크포인트 part를 추가할지")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="asyncio 모드: 키별 token bucket(NAVER_KEY_QPS) + 적응형 동시성, --sleep 사용 안 함")
+    parser.add_argument("--max-concurrency", dest="max_concurrency", type=int, default=64,
+                        help="--async 모드의 최대 동시 요청 수")
+    parser.add_argument("--api-url", dest="api_url", default=None, help="API 주소 (로컬 스텁 서버 테스트용)")
+    parser.add_argument("--cache", dest="cache_path", default=os.getenv("NAVER_CACHE_PATH", "naver_query_cache.sqlite"),
+                        help="쿼리 결과 영구 캐시(SQLite) 경로")
+    parser.add_argument("--cache-ttl-days", dest="cache_ttl_days", type=float, default=30,
+                        help="캐시 유효 기간(일), 지나면 다시 조회")
+    parser.add_argument("--no-cache", action="store_true", help="영구 캐시 사용 안 함")
+    parser.add_argument("--report", default=None, help="단계별 실행 리포트를 저장할 JSON 경로")
     args = parser.parse_args()
+    report = RunReport('crawl_naver', vars(args))
 
     # 단일 키 검사 코드 제거 → 리스트 검사로 대체했으므로 불필요
-
-    in_lower = args.in_path.lower()
-    if in_lower.endswith((".xlsx", ".xls")):
-        df = pd.read_excel(args.in_path, dtype=str, keep_default_na=False)
+    if args.api_url:
+        API_URL = args.api_url
+
+    with report.stage('read') as st:
+        if table_format(args.in_path) in ("parquet", "arrow"):
+            df = read_table(args.in_path).fillna("").astype(str)
+        elif table_format(args.in_path) == "excel":
+            df = pd.read_excel(args.in_path, dtype=str, keep_default_na=False)
+        else:
+            df = pd.read_csv(args.in_path, sep=args.sep, dtype=str, keep_default_na=False, encoding="utf-8")
+        st.rows_out = len(df)
+
+    if not args.no_cache:
+        QUERY_CACHE = KVCache(args.cache_path, ttl=args.cache_ttl_days * 86400)
+
+    checkpoint_dir = args.checkpoint_dir or f"{args.out_path}.parts"
+    if args.use_async:
+        df = enrich_async(
+            df,
+            limit=args.limit,
+            exclude_used=args.exclude_used,
+            resume=args.resume,
+            concurrency=args.workers,
+            max_concurrency=args.max_concurrency,
+            checkpoint_every=args.checkpoint_every,
+            checkpoint_dir=checkpoint_dir,
+            report=report,
+        )
     else:
-        df = pd.read_csv(args.in_path, sep=args.sep, dtype=str, keep_default_na=False, encoding="utf-8")
-
-    df = enrich_parallel(
-        df,
-        throttle_sec=args.sleep,
-        limit=args.limit,
-        exclude_used=args.exclude_used,
-        resume=args.resume,
-        workers=args.workers,
-        checkpoint_every=2000,
-        out_path=args.out_path,
-    )
-    df.to_csv(args.out_path, index=False, encoding="utf-8")
+        df = enrich_parallel(
+            df,
+            throttle_sec=args.sleep,
+            limit=args.limit,
+            exclude_used=args.exclude_used,
+            resume=args.resume,
+            workers=args.workers,
+            checkpoint_every=args.checkpoint_every,
+            checkpoint_dir=checkpoint_dir,
+            report=report,
+        )
+    # 출력 형식은 확장자로 결정 (.parquet / .arrow / 그 외 CSV)
+    with report.stage('write') as st:
+        write_table(df, args.out_path)
+        st.rows_in = st.rows_out = len(df)
     print(f"Saved: {args.out_path}")
+    if QUERY_CACHE is not None:
+        print(f"쿼리 캐시({args.cache_path}): {QUERY_CACHE.stats_line()}")
+        report.extra["query_cache"] = {
+            "hits": QUERY_CACHE.hits, "misses": QUERY_CACHE.misses,
+            "expired": QUERY_CACHE.expired, "writes": QUERY_CACHE.writes,
+        }
+        QUERY_CACHE.close()
+    report.finish(args.report)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,87 @@
+"""
+CSV 스트리밍 읽기 공용 함수 (insert_food_postgresql.py / rebuild_clean_database.py 에서 사용)
+- 인코딩/구분자는 파일 앞부분(SNIFF_BYTES)만 보고 한 번 판별
+  (앞부분이 UTF-8로 읽히면 파일 전체가 UTF-8인지 바이트 단위로 확인 - 앞부분이 ASCII뿐인 cp949 파일 대비)
+- 본문은 C 엔진으로 chunk 단위로 읽어서 파일 크기와 상관없이 메모리 사용량을 일정하게 유지
+"""
+import codecs
+import csv
+import resource
+import sys
+
+import pandas as pd
+
+SNIFF_BYTES = 64 * 1024
+ENCODINGS = ('utf-8-sig', 'cp949')
+DELIMITERS = ',\t;|'
+
+
+def _decode_sample(raw):
+    """앞부분 바이트를 디코딩 (chunk 끝에서 잘린 멀티바이트 문자는 마지막 줄을 버려서 처리)"""
+    if b'\n' in raw:
+        raw = raw[:raw.rindex(b'\n')]
+    for encoding in ENCODINGS:
+        try:
+            return encoding, raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    # 둘 다 안 맞으면 cp949로 읽고 깨진 줄은 건너뜀 (기존 read_csv_smart 동작)
+    return 'cp949', raw.decode('cp949', errors='replace')
+
+
+def _is_utf8(f, block_bytes=1 << 20):
+    """파일 전체가 UTF-8로 디코딩되는지 (DataFrame을 만들지 않고 바이트만 훑음)"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        while block := f.read(block_bytes):
+            decoder.decode(block)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def sniff_csv(path, sample_bytes=SNIFF_BYTES):
+    """파일 앞부분만 읽어서 (encoding, 구분자) 반환"""
+    with open(path, 'rb') as f:
+        raw = f.read(sample_bytes)
+        encoding, sample = _decode_sample(raw)
+        # 앞부분이 ASCII뿐이면 cp949 파일도 UTF-8로 판별됨 → 전체가 UTF-8이 아니면 cp949 (기존 read_csv_smart처럼 파일 전체 기준)
+        if encoding == 'utf-8-sig':
+            f.seek(0)
+            if not _is_utf8(f):
+                encoding = 'cp949'
+    try:
+        sep = csv.Sniffer().sniff(sample, delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        # Sniffer가 실패하면 헤더 줄에 가장 많이 나온 구분자 사용
+        header = sample.splitlines()[0] if sample else ''
+        sep = max(DELIMITERS, key=header.count)
+    return encoding, sep
+
+
+def _read_options(path):
+    encoding, sep = sniff_csv(path)
+    options = {'sep': sep, 'encoding': encoding, 'dtype': str}
+    if encoding == 'cp949':
+        options['on_bad_lines'] = 'skip'
+    return options
+
+
+def read_csv(path, **kwargs):
+    """판별한 인코딩/구분자로 전체를 한 번만 읽음 (kwargs는 pd.read_csv에 그대로 전달, 예: usecols)"""
+    return pd.read_csv(path, **_read_options(path), **kwargs)
+
+
+def iter_csv_chunks(path, chunksize, **kwargs):
+    """판별한 인코딩/구분자로 chunksize 행씩 DataFrame을 yield"""
+    with pd.read_csv(path, chunksize=chunksize, **_read_options(path), **kwargs) as reader:
+        yield from reader
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS(MB) - Linux는 KB, macOS는 byte 단위"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
@@ -2,73 +2,139 @@
 """
 20250327_가공식품DB_147999건.xlsx에서 제조사 정보를 추출하여
 food_clean_data.csv의 company_name을 업데이트하는 스크립트
+- 사용법: python scripts/extract_manufacturer_info.py --xlsx 원본.xlsx --food food_clean_data.csv --out food_clean_data_updated.csv
+- XLSX 파싱(openpyxl)이 느리므로 처음 한 번 필요한 컬럼만 parquet로 캐시하고, 이후에는 캐시를 읽음
+  (원본 파일 크기/수정 시각이 바뀌면 캐시를 다시 만듦)
 """
 
+import argparse
+import os
+import re
+
 import pandas as pd
 
+from columnar import read_table, write_table
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 원본 XLSX에서 필요한 컬럼만 읽음
+SOURCE_COLUMNS = ['식품코드', '제조사명', '수입업체명', '유통업체명']
+# 제조사명이 없으면 수입업체명, 그것도 없으면 유통업체명 사용
+MANUFACTURER_FALLBACK = ['제조사명', '수입업체명', '유통업체명']
+
+
+def cache_path_for(xlsx_path, cache_dir):
+    """원본 파일 크기/수정 시각을 키로 하는 캐시 경로"""
+    stat = os.stat(xlsx_path)
+    stem = os.path.splitext(os.path.basename(xlsx_path))[0]
+    return os.path.join(cache_dir, f"{stem}-{stat.st_size}-{stat.st_mtime_ns}.parquet")
+
+
+def load_source(xlsx_path, cache_dir):
+    """원본에서 SOURCE_COLUMNS만 읽음 (캐시가 있으면 XLSX를 열지 않음)"""
+    cache_path = cache_path_for(xlsx_path, cache_dir)
+    if os.path.exists(cache_path):
+        print(f"캐시 사용: {cache_path}")
+        return read_table(cache_path)
+
+    print(f"{os.path.basename(xlsx_path)} 로딩 중... (최초 1회, 이후 캐시 사용)")
+    df = read_table(xlsx_path, columns=SOURCE_COLUMNS)
+    os.makedirs(cache_dir, exist_ok=True)
+    # 같은 원본의 예전 캐시는 정리 (stem-크기-시각 모양만 → 'foo-2024.xlsx' 같은 다른 원본의 캐시는 남김)
+    stem = os.path.splitext(os.path.basename(xlsx_path))[0]
+    own_cache = re.compile(rf"{re.escape(stem)}-\d+-\d+\.parquet")
+    for name in os.listdir(cache_dir):
+        if own_cache.fullmatch(name):
+            os.remove(os.path.join(cache_dir, name))
+    write_table(df, cache_path)
+    return df
+
+
+def clean_text(s):
+    """공백 제거 후 빈 값/'nan'은 NA로"""
+    s = s.astype('string').str.strip()
+    return s.mask(s.isin(['', 'nan']))
+
+
+def build_manufacturer_map(df_original):
+    """식품코드 → 제조사 (food_id, manufacturer) DataFrame, 같은 식품코드는 마지막 행 기준"""
+    manufacturer = clean_text(df_original[MANUFACTURER_FALLBACK[0]])
+    for col in MANUFACTURER_FALLBACK[1:]:
+        manufacturer = manufacturer.fillna(clean_text(df_original[col]))
+    mapping = pd.DataFrame({
+        'food_id': df_original['식품코드'].astype('string').str.strip(),
+        'manufacturer': manufacturer,
+    })
+    mapping = mapping.dropna(subset=['manufacturer'])
+    return mapping.drop_duplicates(subset='food_id', keep='last')
+
+
+def apply_manufacturers(df_food, mapping):
+    """food_id로 한 번 merge 해서 제조사가 있는 행의 company_name을 덮어씀 → (결과, 업데이트된 행 수)"""
+    keys = df_food['food_id'].astype('string').str.strip()
+    merged = pd.DataFrame({'food_id': keys}).merge(mapping, on='food_id', how='left', validate='many_to_one')
+    manufacturer = pd.Series(merged['manufacturer'].to_numpy(), index=df_food.index)
+    found = manufacturer.notna()
+    df_food = df_food.copy()
+    if 'company_name' not in df_food.columns:
+        df_food['company_name'] = ''
+    df_food.loc[found, 'company_name'] = manufacturer[found].astype(str)
+    return df_food, int(found.sum())
+
+
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--xlsx", dest="xlsx_path",
+                        default=os.path.join(BASE_DIR, '20250327_가공식품DB_147999건.xlsx'), help="가공식품DB 원본 XLSX")
+    parser.add_argument("--food", dest="food_path", default=os.path.join(BASE_DIR, 'food_clean_data.csv'),
+                        help="업데이트할 식품 데이터 (.csv / .parquet)")
+    parser.add_argument("--out", dest="out_path", default=os.path.join(BASE_DIR, 'food_clean_data_updated.csv'))
+    parser.add_argument("--cache-dir", dest="cache_dir", default=None, help="XLSX 파싱 결과 캐시 위치 (기본: XLSX 옆 .cache)")
+    args = parser.parse_args()
+    cache_dir = args.cache_dir or os.path.join(os.path.dirname(os.path.abspath(args.xlsx_path)), '.cache')
+
     print("제조사 정보 추출 및 매핑 시작...")
-    
+
     try:
-        # 1. 원본 Excel 파일 읽기
-        print("20250327_가공식품DB_147999건.xlsx 로딩 중...")
-        df_original = pd.read_excel('/Users/kimminji/Desktop/Healthtant/20250327_가공식품DB_147999건.xlsx')
+        # 1. 원본 Excel 파일 읽기 (필요한 컬럼만, 캐시 우선)
+        df_original = load_source(args.xlsx_path, cache_dir)
         print(f"원본 데이터: {len(df_original)}개 행")
-        
+
         # 2. food_clean_data.csv 읽기
-        print("food_clean_data.csv 로딩 중...")
-        df_food = pd.read_csv('/Users/kimminji/Desktop/Healthtant/food_clean_data.csv')
+        print(f"{os.path.basename(args.food_path)} 로딩 중...")
+        df_food = read_table(args.food_path)
         print(f"현재 식품 데이터: {len(df_food)}개 행")
-        
+
         # 3. 제조사 정보 추출 (식품코드 -> 제조사명)
-        manufacturer_mapping = {}
-        for idx, row in df_original.iterrows():
-            food_code = str(row['식품코드']).strip()
-            manufacturer = str(row['제조사명']).strip() if pd.notna(row['제조사명']) else ''
-            
-            # 제조사명이 없으면 수입업체명이나 유통업체명 사용
-            if not manufacturer or manufacturer == 'nan':
-                manufacturer = str(row['수입업체명']).strip() if pd.notna(row['수입업체명']) else ''
-            if not manufacturer or manufacturer == 'nan':
-                manufacturer = str(row['유통업체명']).strip() if pd.notna(row['유통업체명']) else ''
-                
-            if manufacturer and manufacturer != 'nan':
-                manufacturer_mapping[food_code] = manufacturer
-        
-        print(f"제조사 정보를 찾은 식품: {len(manufacturer_mapping)}개")
-        
+        mapping = build_manufacturer_map(df_original)
+        print(f"제조사 정보를 찾은 식품: {len(mapping)}개")
+
         # 4. food_clean_data.csv의 company_name 업데이트
-        updated_count = 0
-        for idx, row in df_food.iterrows():
-            food_id = str(row['food_id']).strip()
-            if food_id in manufacturer_mapping:
-                df_food.at[idx, 'company_name'] = manufacturer_mapping[food_id]
-                updated_count += 1
-        
+        df_food, updated_count = apply_manufacturers(df_food, mapping)
         print(f"업데이트된 식품: {updated_count}개")
-        
-        # 5. 업데이트된 CSV 저장
-        output_file = '/Users/kimminji/Desktop/Healthtant/food_clean_data_updated.csv'
-        df_food.to_csv(output_file, index=False, encoding='utf-8')
-        print(f"업데이트된 파일 저장: {output_file}")
-        
+
+        # 5. 업데이트된 파일 저장
+        write_table(df_food, args.out_path)
+        print(f"업데이트된 파일 저장: {args.out_path}")
+
         # 6. 통계 출력
         total_foods = len(df_food)
-        foods_with_manufacturer = len(df_food[df_food['company_name'].notna() & (df_food['company_name'] != '') & (df_food['company_name'] != 'UNKNOWN')])
+        has_manufacturer = df_food['company_name'].notna() & (df_food['company_name'] != '') & (df_food['company_name'] != 'UNKNOWN')
+        foods_with_manufacturer = int(has_manufacturer.sum())
         print(f"\n=== 통계 ===")
         print(f"전체 식품: {total_foods}개")
         print(f"제조사 정보 있음: {foods_with_manufacturer}개 ({foods_with_manufacturer/total_foods*100:.1f}%)")
-        
+
         # 7. 샘플 데이터 확인
         print(f"\n=== 업데이트된 샘플 데이터 ===")
-        sample = df_food[df_food['company_name'].notna() & (df_food['company_name'] != '') & (df_food['company_name'] != 'UNKNOWN')].head(10)
-        for _, row in sample.iterrows():
-            print(f"ID: {row['food_id']}, 식품명: {row['food_name']}, 제조사: {row['company_name']}")
-        
+        sample = df_food[has_manufacturer].head(10)
+        for row in sample.itertuples(index=False):
+            print(f"ID: {row.food_id}, 식품명: {row.food_name}, 제조사: {row.company_name}")
+
     except Exception as e:
         print(f"오류 발생: {e}")
         import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
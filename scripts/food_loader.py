@@ -0,0 +1,260 @@
+"""
+food 테이블 적재 공용 함수 모음 (insert_food_postgresql.py / rebuild_clean_database.py 에서 사용)
+- 반드시 django.setup() 이후에 import 해야 합니다.
+"""
+import csv
+import hashlib
+import io
+
+import pandas as pd
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from foods.catalog import bump_catalog_version
+from foods.models import Food
+
+TABLE_NAME = Food._meta.db_table
+
+# 내용 해시에서 제외할 컬럼 (임포트 메타데이터 + 영양 점수처럼 원본에서 파생되는 값)
+# 점수 공식이 바뀐 경우는 `manage.py rescore_foods`로 다시 계산합니다.
+HASH_EXCLUDE = {'content_hash', 'is_active', 'retired_at', 'nutrition_score', 'nutri_score_grade', 'nrf_index', 'thumbnail_path'}
+
+# 새로 들어온 값이 비어있으면 기존 DB 값을 유지할 컬럼
+KEEP_EXISTING_IF_EMPTY = ('image_url', 'shop_url')
+
+# 로컬 썸네일 경로(manage.py build_thumbnails)는 CSV에 없음 → 기존 값 유지, image_url이 바뀐 행만 비워서 다시 만들게 함
+THUMBNAIL_COLUMN = 'thumbnail_path'
+
+
+def to_db_value(val):
+    """numpy/pandas 값을 DB 드라이버가 받을 수 있는 파이썬 기본 타입으로 변환"""
+    if val is None:
+        return None
+    try:
+        if pd.isna(val):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if str(val).lower() in ['none', 'nan', '']:
+        return None
+    if hasattr(val, 'item'):  # numpy scalar
+        return val.item()
+    return val
+
+
+def frame_records(out, cols):
+    """DataFrame을 executemany에 넘길 튜플 리스트로 변환 (iloc 행 단위 접근 대신 itertuples 사용)"""
+    return [
+        tuple(to_db_value(v) for v in row)
+        for row in out[cols].itertuples(index=False, name=None)
+    ]
+
+
+def quote(col):
+    col = col.strip('"')
+    return f'"{col}"'
+
+
+def build_upsert_sql(cols, source=None):
+    """
+    food_id 충돌 시 UPDATE 하는 UPSERT 문 생성
+    - source가 없으면 VALUES (%s, ...) 형태, 있으면 해당 테이블에서 SELECT 해서 넣음
+    """
+    quoted_cols = [quote(c) for c in cols]
+    set_parts = []
+    for c in cols:
+        c = c.strip('"')
+        if c in ('food_id', THUMBNAIL_COLUMN):
+            continue
+        qc = quote(c)
+        if c in KEEP_EXISTING_IF_EMPTY:
+            # 들어온 값이 NULL/빈 문자열이면 기존 DB 값 유지
+            set_parts.append(f"{qc}=COALESCE(NULLIF(excluded.{qc}, ''), {TABLE_NAME}.{qc})")
+        else:
+            set_parts.append(f"{qc}=excluded.{qc}")
+    if 'image_url' in [c.strip('"') for c in cols]:
+        set_parts.append(
+            f"{THUMBNAIL_COLUMN}=CASE WHEN NULLIF(excluded.image_url, '') IS NULL "
+            f"OR excluded.image_url = {TABLE_NAME}.image_url THEN {TABLE_NAME}.{THUMBNAIL_COLUMN} ELSE NULL END"
+        )
+    set_clause = ",\n".join(set_parts)
+    if source is None:
+        body = f"VALUES ({','.join(['%s'] * len(cols))})"
+    else:
+        body = f"SELECT {', '.join(quoted_cols)} FROM {source}"
+    return f"""
+    INSERT INTO {TABLE_NAME} ({", ".join(quoted_cols)})
+    {body}
+    ON CONFLICT("food_id") DO UPDATE SET
+    {set_clause};
+    """
+
+
+def upsert_frame(out, cols, batch_size=1000):
+    """executemany로 batch_size 행씩 UPSERT (batch마다 별도 트랜잭션 → 락을 짧게 유지)"""
+    sql = build_upsert_sql(cols)
+    records = frame_records(out, cols)
+    for i in range(0, len(records), batch_size):
+        with transaction.atomic():
+            with connection.cursor() as cur:
+                cur.executemany(sql, records[i:i + batch_size])
+    return len(records)
+
+
+# ---------------------------------------- COPY 적재 ----------------------------------------
+
+# 스키마를 pg_temp로 고정: 임시 테이블이 없을 때 DROP이 같은 이름의 일반 테이블(public.food_stage)을 지우지 않게 함
+STAGE_TABLE = 'pg_temp.food_stage'
+
+
+def _column_kind(col):
+    """컬럼을 COPY용 텍스트로 바꿀 때 필요한 타입 분류"""
+    try:
+        field = Food._meta.get_field(col)
+    except Exception:
+        return 'text'
+    if isinstance(field, (models.BigIntegerField, models.IntegerField)):
+        return 'int'
+    if isinstance(field, models.FloatField):
+        return 'float'
+    if isinstance(field, models.BooleanField):
+        return 'bool'
+    return 'text'
+
+
+def normalize_for_copy(out, cols):
+    """
+    to_db_value와 같은 규칙(빈 값/'None'/'nan' → NULL)을 컬럼 단위로 한 번에 적용
+    - 정수 컬럼은 '1000.0'처럼 쓰이면 COPY가 실패하므로 Int64로 변환
+    """
+    norm = pd.DataFrame(index=out.index)
+    for c in cols:
+        s = out[c.strip('"')]
+        kind = _column_kind(c.strip('"'))
+        if kind == 'int':
+            norm[c] = pd.to_numeric(s, errors='coerce').round().astype('Int64')
+        elif kind == 'float':
+            norm[c] = pd.to_numeric(s, errors='coerce')
+        elif kind == 'bool':
+            norm[c] = s.map(lambda v: None if v is None or pd.isna(v) else ('t' if v else 'f'))
+        else:
+            empty = s.isna() | s.astype(str).str.strip().str.lower().isin(['none', 'nan', ''])
+            norm[c] = s.astype(object).where(~empty, None)
+    return norm
+
+
+def _copy_from(cur, sql, buf):
+    """psycopg2(copy_expert) / psycopg3(copy) 모두 지원"""
+    raw = getattr(cur, 'cursor', cur)
+    if hasattr(raw, 'copy_expert'):
+        raw.copy_expert(sql, buf)
+    else:
+        with raw.copy(sql) as copy:
+            copy.write(buf.getvalue())
+
+
+def copy_upsert_frame(out, cols, chunk_rows=20000):
+    """
+    COPY FROM STDIN으로 임시 테이블에 적재한 뒤 INSERT ... SELECT ... ON CONFLICT 한 번으로 병합
+    - executemany처럼 행마다 왕복하지 않음
+    - 같은 food_id가 여러 번 나오면 마지막 행 기준 (executemany 결과와 동일)
+    """
+    plain_cols = [c.strip('"') for c in cols]
+    out = out.drop_duplicates(subset='food_id', keep='last')
+    col_list = ", ".join(quote(c) for c in plain_cols)
+
+    with transaction.atomic():
+        with connection.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {STAGE_TABLE}")
+            cur.execute(
+                f"CREATE TEMP TABLE {STAGE_TABLE} ON COMMIT DROP AS "
+                f"SELECT {col_list} FROM {TABLE_NAME} WITH NO DATA"
+            )
+            copy_sql = f"COPY {STAGE_TABLE} ({col_list}) FROM STDIN WITH (FORMAT csv)"
+            for i in range(0, len(out), chunk_rows):
+                chunk = normalize_for_copy(out.iloc[i:i + chunk_rows], plain_cols)
+                buf = io.StringIO()
+                # NULL은 따옴표 없는 빈 칸, 빈 문자열은 이미 NULL로 정규화됨
+                chunk.to_csv(buf, header=False, index=False, na_rep='', quoting=csv.QUOTE_MINIMAL)
+                buf.seek(0)
+                _copy_from(cur, copy_sql, buf)
+            cur.execute(build_upsert_sql(plain_cols, source=STAGE_TABLE))
+    return len(out)
+
+
+def load_frame(out, cols, loader='copy', batch_size=1000):
+    """loader 선택: 'copy'(기본) 또는 기존 방식 'executemany' (COPY는 PostgreSQL 전용이라 로컬 SQLite에서는 executemany)"""
+    if loader == 'copy' and connection.vendor == 'postgresql':
+        result = copy_upsert_frame(out, cols)
+    else:
+        result = upsert_frame(out, cols, batch_size=batch_size)
+    bump_catalog_version()  # 식품 카드 fragment 캐시 무효화
+    return result
+
+
+# ---------------------------------------- 증분 임포트 ----------------------------------------
+
+def row_hash(values):
+    """정규화된 행 값들로 만든 sha1 해시"""
+    payload = "\x1f".join(repr(to_db_value(v)) for v in values)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def add_content_hash(out, cols):
+    """out에 content_hash 컬럼 추가 (HASH_EXCLUDE 컬럼 제외)"""
+    hash_cols = [c for c in cols if c.strip('"') not in HASH_EXCLUDE]
+    out['content_hash'] = [row_hash(row) for row in out[hash_cols].itertuples(index=False, name=None)]
+    return out
+
+
+def fetch_existing_state():
+    """DB에 있는 {food_id: (content_hash, is_active)}"""
+    with connection.cursor() as cur:
+        cur.execute(f'SELECT food_id, content_hash, is_active FROM {TABLE_NAME}')
+        return {food_id: (h, active) for food_id, h, active in cur.fetchall()}
+
+
+def diff_frame(out, existing):
+    """
+    들어온 행(content_hash 포함)을 DB 상태 스냅샷과 비교
+    반환: (신규 행 mask, 변경 행 mask)
+    """
+    food_ids = out['food_id'].astype(str)
+    known = food_ids.isin(existing.keys())
+
+    def is_changed(food_id, content_hash):
+        old_hash, active = existing[food_id]
+        # 내용이 바뀌었거나, 퇴역했던 식품이 다시 들어온 경우
+        return old_hash != content_hash or not active
+
+    changed = pd.Series(False, index=out.index)
+    changed[known] = [
+        is_changed(fid, h) for fid, h in zip(food_ids[known], out.loc[known, 'content_hash'])
+    ]
+    return ~known, changed
+
+
+def missing_food_ids(existing, incoming):
+    """DB에서 활성 상태인데 이번 입력(incoming food_id 집합)에 없는 식품"""
+    return [fid for fid, (_, active) in existing.items() if active and fid not in incoming]
+
+
+def plan_sync(out):
+    """
+    들어온 행 전체와 DB 상태를 비교해서 변경 계획을 세움
+    반환: (신규 행 mask, 변경 행 mask, 사라진 food_id 리스트)
+    """
+    existing = fetch_existing_state()
+    is_new, changed = diff_frame(out, existing)
+    return is_new, changed, missing_food_ids(existing, set(out['food_id'].astype(str)))
+
+
+def retire_foods(food_ids, batch_size=1000):
+    """CSV에서 사라진 식품은 삭제하지 않고 is_active=False로 퇴역 처리 (Diet/FavoriteFood 기록 보존)"""
+    now = timezone.now()
+    for i in range(0, len(food_ids), batch_size):
+        with transaction.atomic():
+            Food.all_objects.filter(food_id__in=food_ids[i:i + batch_size]).update(is_active=False, retired_at=now)
+    if food_ids:
+        bump_catalog_version()
+    return len(food_ids)
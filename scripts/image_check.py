@@ -0,0 +1,159 @@
+"""
+이미지 URL 검증 단계 (rebuild_clean_database.py 에서 사용)
+- httpx.AsyncClient 하나로 연결을 재사용하면서 HEAD 요청을 병렬로 보냄
+- 호스트마다 동시 요청 수 제한 (한 CDN에 요청이 몰리지 않도록)
+- URL → 결과를 kv_cache(SQLite)에 저장해서 재실행 때는 다시 요청하지 않음
+- 중복 URL은 한 번만 확인
+
+벤치마크 (로컬 스텁 서버 사용):
+    python scripts/image_check.py --bench 2000
+"""
+import argparse
+import asyncio
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import httpx
+
+from kv_cache import MISSING, KVCache
+
+DEFAULT_TTL_DAYS = 7
+
+
+def is_http_url(url):
+    if not isinstance(url, str) or not url.strip():
+        return False
+    try:
+        parsed = urlparse(url.strip())
+    except ValueError:  # 'http://[::1/x.jpg' 같은 잘못된 IPv6 주소
+        return False
+    return parsed.scheme in ('http', 'https') and bool(parsed.netloc)
+
+
+async def _check(client, url, timeout):
+    """HEAD로 200 + image/* 인지 확인 (HEAD를 안 받는 서버는 GET으로 헤더만 보고 끊음)"""
+    try:
+        resp = await client.head(url, follow_redirects=True, timeout=timeout)
+        if resp.status_code in (405, 501):
+            async with client.stream('GET', url, follow_redirects=True, timeout=timeout) as resp:
+                pass
+        if resp.status_code != 200:
+            return False
+        return resp.headers.get('content-type', '').startswith('image/')
+    except (httpx.HTTPError, httpx.InvalidURL, ValueError):
+        # URL 하나가 잘못돼도(제어 문자 등) 전체 gather가 실패하지 않도록 그 URL만 실패 처리
+        return False
+
+
+class ImageChecker:
+    def __init__(self, cache_path=None, ttl_days=DEFAULT_TTL_DAYS, concurrency=64, per_host=8, timeout=3.0):
+        self.cache = KVCache(cache_path, ttl=ttl_days * 86400, table='image_url') if cache_path else None
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.requested = 0
+
+    async def _check_all(self, urls):
+        results = {}
+        global_limit = asyncio.Semaphore(self.concurrency)
+        host_limits = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+
+        async with httpx.AsyncClient(limits=limits) as client:
+            async def run(url):
+                async with host_limits[urlparse(url).netloc], global_limit:
+                    ok = await _check(client, url, self.timeout)
+                results[url] = ok
+                if self.cache is not None:
+                    self.cache.set(url, ok)
+
+            await asyncio.gather(*(run(url) for url in urls))
+        return results
+
+    def check(self, urls):
+        """URL 목록 → {url: 유효 여부} (형식이 잘못된 URL은 요청 없이 False)"""
+        results = {}
+        todo = []
+        for url in dict.fromkeys(urls):
+            if not is_http_url(url):
+                results[url] = False
+                continue
+            cached = self.cache.get(url) if self.cache is not None else MISSING
+            if cached is MISSING:
+                todo.append(url)
+            else:
+                results[url] = cached
+        if todo:
+            self.requested += len(todo)
+            results.update(asyncio.run(self._check_all(todo)))
+        return results
+
+    def stats_line(self):
+        line = f"이미지 URL 요청 {self.requested}개"
+        if self.cache is not None:
+            line += f", 캐시 {self.cache.stats_line()}"
+        return line
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.close()
+
+
+def _legacy_check(urls, workers=10):
+    """비교용: 기존 방식 (세션 없이 requests.head, 스레드 10개)"""
+    import requests
+
+    def head(url):
+        try:
+            resp = requests.head(url, timeout=3, allow_redirects=True)
+            return resp.status_code == 200 and resp.headers.get('content-type', '').startswith('image/')
+        except Exception:
+            return False
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(urls, executor.map(head, urls)))
+
+
+def main():
+    import os
+    import tempfile
+    import threading
+
+    from stub_server import make_server
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bench", type=int, default=2000, help="스텁 서버로 확인할 URL 수")
+    parser.add_argument("--latency-ms", dest="latency_ms", type=float, default=30)
+    parser.add_argument("--per-host", dest="per_host", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    server = make_server(port=0, latency_ms=args.latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    # 호스트 이름을 달리해서 호스트별 제한이 적용되는지 확인
+    hosts = [f"127.0.0.1:{port}", f"localhost:{port}"]
+    urls = [f"http://{hosts[i % 2]}/img/{i}.jpg" for i in range(args.bench)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checker = ImageChecker(os.path.join(tmp, 'image_cache.sqlite'), concurrency=args.concurrency, per_host=args.per_host)
+        for label in ("비동기 (캐시 없음)", "비동기 (캐시 적중)"):
+            started = time.perf_counter()
+            results = checker.check(urls)
+            elapsed = time.perf_counter() - started
+            print(f"{label}: {len(urls)}개 {elapsed:.2f}초 ({len(urls) / elapsed:,.0f} URLs/s), 유효 {sum(results.values())}개")
+        print(checker.stats_line())
+        checker.close()
+
+    sample = urls[:min(len(urls), 500)]
+    started = time.perf_counter()
+    _legacy_check(sample)
+    elapsed = time.perf_counter() - started
+    print(f"기존 방식 (requests.head, 스레드 10개): {len(sample)}개 {elapsed:.2f}초 ({len(sample) / elapsed:,.0f} URLs/s)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
 import os, sys
+import argparse
+from collections import Counter
+from itertools import chain
 import pandas as pd
 from django.db import connection, transaction
 import django
@@ -14,10 +17,58 @@ django.setup()
 # 모델/점수 함수 import
 from foods.models import Food
 from common.nutrition_score import NutritionalScore, letterGrade
+from food_loader import (
+    add_content_hash, diff_frame, fetch_existing_state, load_frame, missing_food_ids, retire_foods,
+)
+from columnar import iter_table_chunks, read_table
+from run_report import RunReport
 
 CSV_PATH = os.path.join(BASE_DIR, 'food_clean_data.csv')
 TABLE_NAME = Food._meta.db_table
 
+# CSV 컬럼 → DB 컬럼 매핑 - food_clean_data.csv 칼럼에 맞춰 수정
+# 입력 파일에서는 이 컬럼들만 읽음 (Parquet/Arrow 입력은 나머지 컬럼을 아예 디스크에서 읽지 않음)
+CSV_TO_DB = {
+    'food_id': 'food_id',
+    'price': 'lprice',
+    'discount_price': 'discount_price',
+    'shop_url': 'shop_url',
+    'image_url': 'image_url',
+    # 영양 점수 필드 추가
+    'nutrition_score': 'nutrition_score',
+    'nutri_score_grade': 'nutri_score_grade', 
+    'nrf_index': 'nrf_index',
+    # 기본값들
+    'food_name': 'food_name',
+    'food_category': 'food_category',
+    'representative_food': 'representative_food',
+    'company_name': 'company_name',
+    'calorie': 'calorie',
+    'moisture': 'moisture',
+    'protein': 'protein',
+    'fat': 'fat',
+    'carbohydrate': 'carbohydrate',
+    'nutritional_value_standard_amount': 'nutritional_value_standard_amount',
+    'weight': 'weight',
+    'food_img': 'food_img',
+    'sugar': 'sugar',
+    'dietary_fiber': 'dietary_fiber',
+    'calcium': 'calcium',
+    'iron_content': 'iron_content',
+    'phosphorus': 'phosphorus',
+    'potassium': 'potassium',
+    'salt': 'salt',
+    'VitaminA': 'VitaminA',
+    'VitaminB': 'VitaminB',
+    'VitaminC': 'VitaminC',
+    'VitaminD': 'VitaminD',
+    'VitaminE': 'VitaminE',
+    'cholesterol': 'cholesterol',
+    'saturated_fatty_acids': 'saturated_fatty_acids',
+    'trans_fatty_acids': 'trans_fatty_acids',
+    'serving_size': 'serving_size',
+}
+
 def safe_print(*args):
     try:
         s = " ".join(str(a) for a in args)
@@ -46,44 +97,11 @@ def to_bigint(s):
         return None
 
 def read_csv_smart(path):
-    # 1차: utf-8-sig, 자동 구분자
-    try:
-        df = pd.read_csv(path, sep=None, engine='python', dtype=str, encoding='utf-8-sig')
-        if df.shape[1] > 1:
-            return df
-    except Exception:
-        pass
-    # 2차: utf-8-sig, 탭
-    try:
-        df = pd.read_csv(path, sep='\t', engine='python', dtype=str, encoding='utf-8-sig')
-        if df.shape[1] > 1:
-            return df
-    except Exception:
-        pass
-    # 3차: utf-8-sig, 콤마
-    try:
-        df = pd.read_csv(path, sep=',', engine='python', dtype=str, encoding='utf-8-sig')
-        if df.shape[1] > 1:
-            return df
-    except Exception:
-        pass
-    # 4차: cp949, 자동 구분자
-    try:
-        df = pd.read_csv(path, sep=None, engine='python', dtype=str, encoding='cp949', on_bad_lines='skip')
-        if df.shape[1] > 1:
-            return df
-    except Exception:
-        pass
-    # 5차: cp949, 탭
-    try:
-        df = pd.read_csv(path, sep='\t', engine='python', dtype=str, encoding='cp949', on_bad_lines='skip')
-        if df.shape[1] > 1:
-            return df
-    except Exception:
-        pass
-    # 6차: cp949, 콤마
-    df = pd.read_csv(path, sep=',', engine='python', dtype=str, encoding='cp949', on_bad_lines='skip')
-    return df
+    """
+    CSV는 인코딩/구분자를 파일 앞부분만 보고 한 번 판별한 뒤 한 번만 읽음 (csv_stream.sniff_csv)
+    .parquet/.arrow/.xlsx도 같은 함수로 읽음 (columnar.read_table)
+    """
+    return read_table(path, columns=list(CSV_TO_DB))
 
 def purge_foods_and_children_auto():
     """
@@ -106,91 +124,52 @@ def purge_foods_and_children_auto():
                 # 일부 테이블이 실제로 없거나 마이그가 안 되어 있을 수 있음 → 무시
                 pass
 
-        # 2) 마지막으로 Food 삭제 (ordering 제거)
-        Food.objects.all().order_by().delete()
+        # 2) 마지막으로 Food 삭제 (퇴역 식품 포함)
+        # 자식 테이블은 이미 비었으므로 ORM delete()처럼 전체 행을 메모리로 모으지 않고 한 번에 삭제
+        with connection.cursor() as cur:
+            cur.execute(f"DELETE FROM {Food._meta.db_table}")
 
-def main():
-    # 0) 테이블 구조 확인
-    safe_print("=== 테이블 구조 확인 중... ===")
+def get_db_columns():
     with connection.cursor() as cur:
         cur.execute("SELECT column_name FROM information_schema.columns WHERE table_name = 'food' ORDER BY ordinal_position;")
-        db_columns = [row[0] for row in cur.fetchall()]
-        safe_print("실제 DB 컬럼 전체:", db_columns)
-    
-    # 1) 기존 DB 데이터 모두 삭제
-    safe_print("=== 기존 DB 데이터 삭제 중... ===")
-    purge_foods_and_children_auto()
-    safe_print("기존 데이터 삭제 완료")
-    
-    # 2) CSV 로드 
-    df = read_csv_smart(CSV_PATH).fillna('')
-    
-    # food_clean_data.csv는 헤더가 있으므로 컬럼명 매핑만 확인
-    
-    # BOM/공백 제거
-    df.columns = df.columns.str.replace('\ufeff', '', regex=False).str.strip()
+        return [row[0] for row in cur.fetchall()]
 
-    safe_print("shape:", df.shape)
-    safe_print("first columns:", df.columns.tolist()[:10])
+def clean_columns(df):
+    """빈 값 채우기 + 헤더 BOM/공백 제거"""
+    df = df.fillna('')
+    df.columns = df.columns.str.replace('\ufeff', '', regex=False).str.strip()
+    return df
 
+def check_csv(df):
+    """필수 컬럼/food_id 확인 (문제 있으면 False)"""
     required = {'food_id'}
     missing = required - set(df.columns)
     if missing:
         safe_print("ERROR: missing required columns:", missing)
-        return
+        return False
 
     non_empty_food_id = df['food_id'].astype(str).str.strip().ne('').sum()
     safe_print("non-empty food_id rows:", non_empty_food_id)
     if non_empty_food_id == 0:
         safe_print("ERROR: all food_id empty. Check CSV delimiter/header.")
-        return
+        return False
+    return True
 
-    # 2) 매핑 - food_clean_data.csv 칼럼에 맞춰 수정
-    csv_to_db = {
-        'food_id': 'food_id',
-        'price': 'lprice',
-        'discount_price': 'discount_price',
-        'shop_url': 'shop_url',
-        'image_url': 'image_url',
-        # 영양 점수 필드 추가
-        'nutrition_score': 'nutrition_score',
-        'nutri_score_grade': 'nutri_score_grade', 
-        'nrf_index': 'nrf_index',
-        # 기본값들
-        'food_name': 'food_name',
-        'food_category': 'food_category',
-        'representative_food': 'representative_food',
-        'company_name': 'company_name',
-        'calorie': 'calorie',
-        'moisture': 'moisture',
-        'protein': 'protein',
-        'fat': 'fat',
-        'carbohydrate': 'carbohydrate',
-        'nutritional_value_standard_amount': 'nutritional_value_standard_amount',
-        'weight': 'weight',
-        'food_img': 'food_img',
-        'sugar': 'sugar',
-        'dietary_fiber': 'dietary_fiber',
-        'calcium': 'calcium',
-        'iron_content': 'iron_content',
-        'phosphorus': 'phosphorus',
-        'potassium': 'potassium',
-        'salt': 'salt',
-        'VitaminA': 'VitaminA',
-        'VitaminB': 'VitaminB',
-        'VitaminC': 'VitaminC',
-        'VitaminD': 'VitaminD',
-        'VitaminE': 'VitaminE',
-        'cholesterol': 'cholesterol',
-        'saturated_fatty_acids': 'saturated_fatty_acids',
-        'trans_fatty_acids': 'trans_fatty_acids',
-        'serving_size': 'serving_size',
-    }
-    for src in csv_to_db:
+def load_csv(path):
+    """CSV 전체 로드 + 헤더 정리 + 필수 컬럼 확인 (문제 있으면 None 반환)"""
+    df = clean_columns(read_csv_smart(path))
+    safe_print("shape:", df.shape)
+    safe_print("first columns:", df.columns.tolist()[:10])
+    return df if check_csv(df) else None
+
+def prepare_frame(df, db_columns):
+    """CSV 컬럼 → DB 컬럼 매핑 및 타입/기본값 정규화 (영양 점수 계산 전 단계)"""
+    # 2) 매핑 - CSV_TO_DB
+    for src in CSV_TO_DB:
         if src not in df.columns:
             df[src] = ''
 
-    out = pd.DataFrame({dst: df[src] for src, dst in csv_to_db.items()})
+    out = pd.DataFrame({dst: df[src] for src, dst in CSV_TO_DB.items()})
     
     # image 컬럼을 food_img에도 복사 (메인페이지용)
     if 'image_url' in out.columns:
@@ -261,8 +240,25 @@ def main():
     # external_code 컬럼 추가 (DB에 있지만 CSV에는 없음)
     if 'external_code' not in out.columns:
         out['external_code'] = None
+
+    # 임포트 메타데이터 (다시 들어온 식품은 판매 중으로 되돌림)
+    out['is_active'] = True
+    out['retired_at'] = None
+
+    # 누락된 컬럼들을 None으로 추가
+    for c in db_columns:
+        if c not in out.columns:
+            out[c] = None
     
-    # 5) 영양 점수 계산 및 추가
+    # DB 컬럼 순서대로 정렬
+    out = out[db_columns]
+
+    # PK 비어있는 행 제거
+    out = out[out['food_id'].astype(str).str.strip().ne('')].copy()
+    return out
+
+def add_nutrition_scores(out):
+    """5) 영양 점수 계산 및 추가"""
     safe_print("영양 점수 계산 중...")
     
     def calculate_nutrition_scores(row):
@@ -315,6 +311,9 @@ def main():
                 safe_print(f"영양점수 계산 오류: {e}")
             return None, None, None
     
+    if out.empty:
+        return out
+
     # 각 행에 대해 영양 점수 계산
     nutrition_data = out.apply(calculate_nutrition_scores, axis=1, result_type='expand')
     out['nutrition_score'] = nutrition_data[0]
@@ -323,83 +322,126 @@ def main():
     
     safe_print(f"영양 점수 계산 완료! A급: {(out['nutri_score_grade'] == 'A').sum()}개")
     safe_print(f"B급: {(out['nutri_score_grade'] == 'B').sum()}개, C급: {(out['nutri_score_grade'] == 'C').sum()}개")
-    
-    # 실제 DB 컬럼과 일치하는 컬럼만 사용
-    cols = [col for col in db_columns if col in out.columns or col in ['nutrition_score', 'nutri_score_grade', 'nrf_index']]
-    
-    # 누락된 컬럼들을 None으로 추가
-    for c in db_columns:
-        if c not in out.columns:
-            out[c] = None
-    
-    # DB 컬럼 순서대로 정렬
-    out = out[db_columns]
-    cols = db_columns
-
-    # PK 비어있는 행 제거
-    out = out[out['food_id'].astype(str).str.strip().ne('')]
+    return out
+
+# ---------------------------------------- 스트리밍 파이프라인 ----------------------------------------
+# 읽기 → 정리(매핑/해시) → (증분: 변경 감지) → 점수 → 적재 를 chunk 단위 generator로 연결
+# 어느 시점에도 chunk 몇 개 분량만 메모리에 있으므로 CSV 크기와 상관없이 최대 메모리가 일정함
+
+def iter_frames(path, chunksize):
+    """1) 읽기: chunksize 행씩 헤더 정리된 DataFrame (첫 chunk에서 필수 컬럼 확인)"""
+    for i, df in enumerate(iter_table_chunks(path, chunksize, columns=list(CSV_TO_DB))):
+        df = clean_columns(df)
+        if i == 0:
+            safe_print("first columns:", df.columns.tolist()[:10])
+            if not check_csv(df):
+                return
+        yield df
+
+def clean_stage(frames, db_columns, stats):
+    """2) 정리: DB 컬럼 매핑 + 내용 해시"""
+    for df in frames:
+        stats['read'] += len(df)
+        out = prepare_frame(df, db_columns)
+        stats['no_food_id'] += len(df) - len(out)
+        yield add_content_hash(out, db_columns)
+
+def diff_stage(frames, existing, seen, stats):
+    """3) 증분 모드: DB 스냅샷과 비교해서 신규/변경 행만 통과 (퇴역 판단용 food_id는 seen에 모음)"""
+    for out in frames:
+        is_new, is_changed = diff_frame(out, existing)
+        seen.update(out['food_id'].astype(str))
+        stats['new'] += int(is_new.sum())
+        stats['changed'] += int(is_changed.sum())
+        todo = out[is_new | is_changed]
+        stats['unchanged'] += len(out) - len(todo)
+        yield todo.copy()
+
+def score_stage(frames):
+    """4) 영양 점수 계산"""
+    for out in frames:
+        yield add_nutrition_scores(out)
 
-    n = len(out)
-    safe_print("will upsert rows:", n)
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", dest="csv_path", default=CSV_PATH, help="임포트할 파일 경로 (.csv / .parquet / .arrow / .xlsx)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="전체 삭제 없이 바뀐 행만 반영 (사라진 식품은 퇴역 처리)")
+    parser.add_argument("--keep-missing", action="store_true", help="증분 모드에서 CSV에 없는 식품을 퇴역시키지 않음")
+    parser.add_argument("--batch-size", type=int, default=1000, help="executemany 모드의 batch 크기")
+    parser.add_argument("--chunksize", type=int, default=20000, help="CSV를 한 번에 읽고 처리하는 행 수")
+    parser.add_argument("--loader", choices=["copy", "executemany"], default="copy",
+                        help="copy: COPY로 임시 테이블 적재 후 한 번에 병합 (기본), executemany: 기존 방식")
+    parser.add_argument("--report", default=None, help="단계별 실행 리포트를 저장할 JSON 경로")
+    args = parser.parse_args()
+    report = RunReport('insert_food_postgresql', vars(args))
 
-    # Debug counters for incoming media fields
-    try:
-        _img_nonempty = ((out['image_url'].notna()) & (out['image_url'].astype(str).str.strip() != '')).sum()
-        _url_nonempty = int((out['shop_url'].notna()) & (out['shop_url'].astype(str).str.strip() != '')).sum()
-        safe_print("incoming non-empty image_url rows:", _img_nonempty)
-        safe_print("incoming non-empty shop_url rows:", _url_nonempty)
-    except Exception:
-        pass
+    # 0) 테이블 구조 확인
+    safe_print("=== 테이블 구조 확인 중... ===")
+    db_columns = get_db_columns()
+    safe_print("실제 DB 컬럼 전체:", db_columns)
 
-    if n == 0:
-        safe_print("ERROR: no rows to upsert.")
+    # 첫 chunk에서 CSV 헤더를 확인한 뒤에만 기존 데이터를 건드림
+    read_stage, frames = report.stream('read', iter_frames(args.csv_path, args.chunksize))
+    first = next(frames, None)
+    if first is None:
         return
+    frames = chain([first], frames)
+
+    stats = Counter()
+    if args.incremental:
+        safe_print("=== 증분 임포트: 변경 감지 중... ===")
+        with report.stage('snapshot') as st:
+            existing = fetch_existing_state()
+            st.rows_out = len(existing)
+        seen = set()
+    else:
+        # 1) 기존 DB 데이터 모두 삭제
+        safe_print("=== 기존 DB 데이터 삭제 중... ===")
+        with report.stage('purge'):
+            purge_foods_and_children_auto()
+        safe_print("기존 데이터 삭제 완료")
+
+    # 각 단계는 chunk마다 번갈아 실행되므로 stream()으로 감싸서 단계별 시간을 따로 잼
+    clean, pipeline = report.stream('clean', clean_stage(frames, db_columns, stats), upstream=read_stage)
+    upstream = clean
+    if args.incremental:
+        upstream, pipeline = report.stream('diff', diff_stage(pipeline, existing, seen, stats), upstream=clean)
+    score, pipeline = report.stream('score', score_stage(pipeline), upstream=upstream)
+
+    # 5) UPSERT - PostgreSQL에서 대소문자 구분을 위해 따옴표 사용 (food_loader.build_upsert_sql)
+    for out in pipeline:
+        for col in ('image_url', 'shop_url'):
+            stats[col] += int((out[col].notna() & (out[col].astype(str).str.strip() != '')).sum())
+        with report.stage('load') as st:
+            if len(out):
+                load_frame(out, db_columns, loader=args.loader, batch_size=args.batch_size)
+            st.rows_in = (st.rows_in or 0) + len(out)
+            st.rows_out += len(out)
+        stats['upserted'] += len(out)
+        safe_print(f"chunk 적재: {len(out)}행 (누적 {stats['upserted']}행 / 읽은 행 {stats['read']})")
+
+    safe_print("incoming non-empty image_url rows:", stats['image_url'])
+    safe_print("incoming non-empty shop_url rows:", stats['shop_url'])
+    clean.drop('food_id 없음', stats['no_food_id'])
+    if args.incremental:
+        upstream.drop('변경 없음', stats['unchanged'])
+
+    if args.incremental:
+        missing = missing_food_ids(existing, seen)
+        safe_print(f"신규: {stats['new']}개, 변경: {stats['changed']}개, "
+                   f"변경 없음: {stats['unchanged']}개, 사라진 식품: {len(missing)}개")
+        if not args.keep_missing and missing:
+            with report.stage('retire') as st:
+                retire_foods(missing, batch_size=args.batch_size)
+                st.rows_in = st.rows_out = len(missing)
+            safe_print("retired rows:", len(missing))
+    elif stats['upserted'] == 0:
+        safe_print("ERROR: no rows to upsert.")
 
-    # 6) UPSERT - PostgreSQL에서 대소문자 구분을 위해 따옴표 사용
-    placeholders = ",".join(["%s"] * len(cols))
-    # 컬럼명을 따옴표로 감싸기
-    quoted_cols = [f'"{c}"' for c in cols]
-    
-    # Build SET clause for UPSERT with "keep existing if incoming is empty/NULL" for selected columns
-    set_parts = []
-    for c in cols:
-        if c == 'food_id':
-            continue
-        quoted_c = f'"{c}"'
-        if c in ('image_url', 'shop_url'):
-            # If the incoming value is NULL or empty string, keep the existing DB value
-            set_parts.append(f'{quoted_c}=COALESCE(NULLIF(excluded.{quoted_c}, \'\'), {TABLE_NAME}.{quoted_c})')
-        else:
-            set_parts.append(f'{quoted_c}=excluded.{quoted_c}')
-    set_clause = ",\n".join(set_parts)
-    sql = f"""
-    INSERT INTO {TABLE_NAME} ({", ".join(quoted_cols)})
-    VALUES ({placeholders})
-    ON CONFLICT("food_id") DO UPDATE SET
-    {set_clause};
-    """
-
-    # numpy 타입을 Python 네이티브 타입으로 변환
-    def convert_value(val):
-        if pd.isna(val):
-            return None
-        if val is None:
-            return None
-        if str(val).lower() in ['none', 'nan', '']:
-            return None
-        if hasattr(val, 'item'):  # numpy scalar
-            return val.item()
-        return val
-    
-    records = [tuple(convert_value(val) for val in out.iloc[i].tolist()) for i in range(n)]
-
-    with transaction.atomic():
-        with connection.cursor() as cur:
-            chunk = 1000
-            for i in range(0, n, chunk):
-                cur.executemany(sql, records[i:i+chunk])
-
-    safe_print("DONE: food upsert rows:", n)
+    safe_print("DONE: food upsert rows:", stats['upserted'])
+    report.extra['counts'] = {k: stats[k] for k in ('read', 'upserted', 'new', 'changed', 'unchanged', 'image_url', 'shop_url')}
+    report.finish(args.report, printer=safe_print)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,73 @@
+"""
+SQLite 파일 하나로 된 영구 key-value 캐시 (crawl_naver.py 쿼리 결과 등에서 사용)
+- 값은 JSON으로 저장, 저장 시각(fetched_at)과 TTL로 만료 판단
+- 프로세스가 끝나도 남아있어서 재실행/부분 재실행 때 같은 요청을 다시 보내지 않음
+- 여러 스레드에서 하나의 인스턴스를 같이 써도 됨 (내부 락)
+"""
+import json
+import sqlite3
+import threading
+import time
+
+MISSING = object()
+
+
+class KVCache:
+    def __init__(self, path, ttl=None, table='kv'):
+        """ttl: 초 단위 유효 기간 (None이면 만료 없음)"""
+        self.path = path
+        self.ttl = ttl
+        self.table = table
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self.hits = self.misses = self.expired = self.writes = 0
+
+    def get(self, key, default=MISSING):
+        """저장된 값 (없거나 만료됐으면 default). None도 정상 값으로 저장/반환됨"""
+        with self.lock:
+            row = self.conn.execute(f"SELECT value, fetched_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            if self.ttl is not None and time.time() - row[1] > self.ttl:
+                self.expired += 1
+                return default
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        payload = json.dumps(value, ensure_ascii=False)
+        with self.lock:
+            self.conn.execute(
+                f"INSERT INTO {self.table} (key, value, fetched_at) VALUES (?, ?, ?) "
+                f"ON CONFLICT(key) DO UPDATE SET value = excluded.value, fetched_at = excluded.fetched_at",
+                (key, payload, time.time()),
+            )
+            self.writes += 1
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def purge_expired(self):
+        """만료된 항목 삭제 → 삭제된 개수"""
+        if self.ttl is None:
+            return 0
+        with self.lock:
+            cur = self.conn.execute(f"DELETE FROM {self.table} WHERE fetched_at < ?", (time.time() - self.ttl,))
+            return cur.rowcount
+
+    def stats_line(self):
+        lookups = self.hits + self.misses + self.expired
+        rate = self.hits / lookups * 100 if lookups else 0
+        return (f"적중 {self.hits}/{lookups} ({rate:.1f}%), 없음 {self.misses}, "
+                f"만료 {self.expired}, 저장 {self.writes}, 전체 {len(self)}개")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
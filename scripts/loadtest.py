@@ -0,0 +1,211 @@
+"""
+부하 테스트: 동기(WSGI) vs 비동기(ASGI) 배포 비교
+- --mode wsgi asgi: 모드마다 gunicorn -c gunicorn.conf.py 서버를 직접 띄워서 같은 요청 목록으로 측정 후 종료
+  (DJANGO_SETTINGS_MODULE, POSTGRES_* 등은 현재 환경변수를 그대로 넘김)
+- --url: 이미 떠 있는 서버 측정 (여러 번 지정 가능, 이름=주소 형식이면 그 이름으로 출력)
+  → nginx 앞단과 gunicorn 직접 요청을 같은 경로로 비교하면 마이크로캐시/압축 효과(offload)가 보임
+- 결과: 처리량(req/s), p50/p99 지연, 오류 수, 응답당 전송 바이트(압축 후),
+  nginx X-Cache-Status 분포와 Django까지 간 요청 비율, Set-Cookie가 붙은 응답 수(nginx가 저장하지 않음),
+  서버 프로세스 RSS 합계 최대치(MB, 직접 띄운 경우만)
+  → 같은 메모리 예산으로 비교하려면 --wsgi-workers / --asgi-workers로 워커 수를 맞춰서 RSS가 비슷하게
+- 사용법:
+    python scripts/loadtest.py --mode wsgi asgi --path / --path "/search/normal/?keyword=우유" --path /products/<food_id>/
+    python scripts/loadtest.py --url http://127.0.0.1:8000 --concurrency 64 --duration 30
+    python scripts/loadtest.py --url nginx=https://localhost --url direct=http://127.0.0.1:8000 --insecure \
+        --path / --path /search/ --path /products/<food_id>/ --path /static/base/base.<hash>.css
+"""
+import os, sys
+import argparse
+import asyncio
+import itertools
+import json
+import subprocess
+import threading
+import time
+
+import httpx
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATHS = ['/', '/search/normal/?keyword=우유', '/search/normal/?keyword=과자&page=2']
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def tree_rss_mb(pid):
+    """pid와 자식 프로세스들의 RSS 합계(MB) - Linux /proc 기준"""
+    total, pids = 0, [pid]
+    while pids:
+        current = pids.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1])
+            with open(f"/proc/{current}/task/{current}/children") as f:
+                pids += [int(child) for child in f.read().split()]
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+    return total / 1024
+
+
+class RssSampler(threading.Thread):
+    """측정하는 동안 서버 RSS 최대치 기록"""
+
+    def __init__(self, pid, interval=0.2):
+        super().__init__(daemon=True)
+        self.pid, self.interval, self.peak = pid, interval, 0.0
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.peak = max(self.peak, tree_rss_mb(self.pid))
+
+
+async def run_load(base_url, paths, concurrency, duration, headers, warmup=2.0, verify=True):
+    """concurrency개의 클라이언트가 duration초 동안 paths를 돌아가며 요청 → 결과 dict"""
+    latencies, errors, statuses, cache_statuses = [], 0, {}, {}
+    wire_bytes, set_cookie = 0, 0
+    cycle = itertools.cycle(paths)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=30, verify=verify) as client:
+        # 워밍업 (첫 요청의 import/연결 비용 제외)
+        warm_until = time.perf_counter() + warmup
+        while time.perf_counter() < warm_until:
+            await asyncio.gather(*(client.get(p) for p in paths), return_exceptions=True)
+
+        deadline = time.perf_counter() + duration
+
+        async def client_loop():
+            nonlocal errors, wire_bytes, set_cookie
+            while time.perf_counter() < deadline:
+                path = next(cycle)
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                cache_status = response.headers.get('X-Cache-Status', '-')
+                cache_statuses[cache_status] = cache_statuses.get(cache_status, 0) + 1
+                wire_bytes += response.num_bytes_downloaded
+                set_cookie += 'set-cookie' in response.headers
+                if response.status_code >= 400:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+        'errors': errors,
+        'statuses': statuses,
+        'avg_kb': round(wire_bytes / max(1, len(latencies)) / 1024, 1),
+        'cache': cache_statuses,
+        'set_cookie': set_cookie,
+        # HIT/STALE/UPDATING 외에는 Django까지 감 (X-Cache-Status가 없는 경로 포함)
+        'upstream_ratio': round(
+            1 - sum(n for k, n in cache_statuses.items() if k in ('HIT', 'STALE', 'UPDATING')) / max(1, len(latencies)), 3
+        ),
+    }
+
+
+def start_server(mode, workers, port):
+    env = {**os.environ, 'SERVER_MODE': mode, 'WEB_CONCURRENCY': str(workers), 'GUNICORN_BIND': f"127.0.0.1:{port}"}
+    proc = subprocess.Popen(
+        ['gunicorn', '-c', 'gunicorn.conf.py', '--log-level', 'warning'],
+        cwd=BASE_DIR, env=env,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            if proc.poll() is not None:
+                raise SystemExit(f"{mode} 서버가 시작하지 못했습니다 (exit {proc.returncode})")
+            time.sleep(0.3)
+    proc.terminate()
+    raise SystemExit(f"{mode} 서버가 30초 안에 응답하지 않습니다")
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def print_row(name, result, rss=None):
+    rss_text = f", RSS {rss:.0f}MB" if rss else ""
+    print(f"{name:>6}: {result['rps']:>8} req/s, p50 {result['p50_ms']}ms, p99 {result['p99_ms']}ms, "
+          f"요청 {result['requests']}개, 오류 {result['errors']}개{rss_text}  {result['statuses']}")
+    print(f"{'':>6}  응답당 {result['avg_kb']}KB 전송, Django까지 간 요청 {result['upstream_ratio'] * 100:.1f}%  "
+          f"X-Cache-Status {result['cache']}, Set-Cookie {result['set_cookie']}개")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", nargs="+", choices=['wsgi', 'asgi'], default=['wsgi', 'asgi'])
+    parser.add_argument("--url", dest="urls", action="append", default=None,
+                        help="이미 떠 있는 서버 주소, 이름=주소 가능 (여러 번 지정 가능, 지정하면 --mode 무시)")
+    parser.add_argument("--insecure", action="store_true", help="https 인증서 검증 생략 (로컬 자체 서명 인증서)")
+    parser.add_argument("--path", dest="paths", action="append", default=None, help="요청할 경로 (여러 번 지정 가능)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--wsgi-workers", type=int, default=2)
+    parser.add_argument("--asgi-workers", type=int, default=2)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cookie", default=None, help="로그인이 필요한 경로용 Cookie 헤더 (예: sessionid=...)")
+    parser.add_argument("--json", dest="json_path", default=None, help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    paths = args.paths or DEFAULT_PATHS
+    # 운영 설정은 https로 리다이렉트하므로 nginx처럼 프록시 헤더를 붙여서 요청
+    headers = {'X-Forwarded-Proto': 'https', 'Accept': 'text/html,application/json'}
+    if args.cookie:
+        headers['Cookie'] = args.cookie
+
+    results = {}
+    if args.urls:
+        for i, url in enumerate(args.urls):
+            name, _, address = url.partition('=') if '=' in url.split('://')[0] else ('', '', url)
+            name = name or ('server' if len(args.urls) == 1 else f'server{i + 1}')
+            results[name] = asyncio.run(
+                run_load(address, paths, args.concurrency, args.duration, headers, verify=not args.insecure)
+            )
+            print_row(name, results[name])
+    else:
+        for mode in args.mode:
+            workers = args.wsgi_workers if mode == 'wsgi' else args.asgi_workers
+            proc = start_server(mode, workers, args.port)
+            sampler = RssSampler(proc.pid)
+            sampler.start()
+            try:
+                result = asyncio.run(run_load(f"http://127.0.0.1:{args.port}", paths, args.concurrency, args.duration, headers))
+            finally:
+                sampler.stopped.set()
+                sampler.join()
+                stop_server(proc)
+            result.update(workers=workers, peak_rss_mb=round(sampler.peak, 1))
+            results[mode] = result
+            print_row(mode, result, sampler.peak)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'paths': paths, 'concurrency': args.concurrency, 'results': results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,10 @@
 import os, sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
-import requests
-from urllib.parse import urlparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
 import django
-from django.db import connection, transaction
+from django.db import connection, connections, transaction
 
 # 프로젝트 루트 경로 추가
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -18,6 +17,11 @@ django.setup()
 # 모델/점수 함수 import
 from foods.models import Food
 from common.nutrition_score import NutritionalScore, letterGrade
+from food_loader import add_content_hash, load_frame, plan_sync, retire_foods
+from columnar import read_table
+from run_report import RunReport
+from image_check import ImageChecker
+from blocklist import BlocklistMatcher
 
 def safe_print(*args):
     try:
@@ -27,151 +31,117 @@ def safe_print(*args):
         s = " ".join(str(a) for a in args)
         sys.stdout.write(s.encode('utf-8', 'replace').decode('utf-8') + "\n")
 
-def is_valid_image_url(url):
-    """이미지 URL이 유효한지 확인"""
-    if pd.isna(url) or url == '' or url.strip() == '':
-        return False
-    
-    try:
-        parsed = urlparse(url)
-        if not parsed.scheme or not parsed.netloc:
-            return False
-        
-        # HEAD 요청으로 이미지 존재 여부 확인 (타임아웃 짧게)
-        response = requests.head(url, timeout=3, allow_redirects=True)
-        if response.status_code == 200:
-            content_type = response.headers.get('content-type', '')
-            return content_type.startswith('image/')
-        return False
-    except:
-        return False
+# 더 정교한 비식품 키워드 리스트
+NON_FOOD_KEYWORDS = [
+    'bs1', 'st1', '브레이버스', '쿠키런', '카드', '게임', '토이', '장난감', 
+    '피규어', '스티커', '굿즈', '액세서리', '컵', '텀블러', '머그', 
+    '그릇', '접시', '수저', '포스터', '엽서', '키링', '배지', '펜', 
+    '노트', '다이어리', '포켓몬', '디즈니', '케이스', '파우치', '가방',
+    '지갑', '의류', '옷', '모자', '책', '매뉴얼', '가이드', 'dvd', 
+    'cd', '음반', '앨범', '와펜', '패치', '다림질', '데코덴', '탑로더',
+    '폰케이스', '슬리퍼', '샌달', '자비츠', '풀빵', '쿠키', 'cookie',
+    # 추가 키워드들
+    '마그넷', '뱃지', '홀더', '파우치', '세트', '한정판', 'vol', '시즌',
+    '컬렉션', '한정', '특별판', '프리미엄', '에디션', '버전',
+    # 바나나 관련 키워드들
+    '나라사랑 족발편육', '연세대학교연세바나나우유', '뽀로로가 좋아하는 바나나우유',
+    '붕장어(아나고)회/필렛', '새송이버섯나물 밀키트', '애호박나물', '취나물무침 (2개)',
+    '선물세트 달보드레_하나', '몽키나나', '쇼콜라 판나코타', '앙버터모나카 (2개)',
+    '가나슈데니쉬식빵', '가나소프트콘', '연세우유 초코 모나카', '주문하신 카페라떼 나왔습니다',
+    '마켓진양호 시나몬라떼', '다크나이트(DARK KNIGHT)', '오나의살들아',
+    '데일리슬림쉐이크 바나나', '양수면옥 건호박나물볶음', '칼집요리비엔나',
+    '연세바나나우유', '나는 미니김', '정월대보름나물', '미니콘 바나나',
+    '만나마카롱3구SET', '바나나머랭쿠키 (2개)', '바나나샌드웨이퍼',
+    # 추가 키워드들
+    '이삭시그니처', '버터롤', '미라클 블렌드', '요거트비스켓', '백합막장용메주가루',
+    '한입 우리콩 두부과자', '두부바게트', '야채두부버터빵', '프로틴플러스두유두부식빵',
+    '두부 치즈케이크', '곰곰 우리콩두부', '소이요 백태 전두부', '순두부 치즈 그라탕 볼로네제',
+    '우리 쌀콩 미숫가루', '못말림 블렌드', '월넛 브레드', '스키니팝콘', '보리바게트',
+    '찐크 프로틴 크래커(참깨맛)', '17곡미숫가루A+', '포시즌블렌드', '알바 블랜드'
+]
 
-def is_non_food_item(naver_title, food_name):
-    """비식품 상품인지 확인"""
-    if pd.isna(naver_title):
-        naver_title = ''
-    if pd.isna(food_name):
-        food_name = ''
-    
-    combined_text = (str(naver_title) + ' ' + str(food_name)).lower()
-    
-    # 더 정교한 비식품 키워드 리스트
-    non_food_keywords = [
-        'bs1', 'st1', '브레이버스', '쿠키런', '카드', '게임', '토이', '장난감', 
-        '피규어', '스티커', '굿즈', '액세서리', '컵', '텀블러', '머그', 
-        '그릇', '접시', '수저', '포스터', '엽서', '키링', '배지', '펜', 
-        '노트', '다이어리', '포켓몬', '디즈니', '케이스', '파우치', '가방',
-        '지갑', '의류', '옷', '모자', '책', '매뉴얼', '가이드', 'dvd', 
-        'cd', '음반', '앨범', '와펜', '패치', '다림질', '데코덴', '탑로더',
-        '폰케이스', '슬리퍼', '샌달', '자비츠', '풀빵', '쿠키', 'cookie',
-        # 추가 키워드들
-        '마그넷', '뱃지', '홀더', '파우치', '세트', '한정판', 'vol', '시즌',
-        '컬렉션', '한정', '특별판', '프리미엄', '에디션', '버전',
-        # 바나나 관련 키워드들
-        '나라사랑 족발편육', '연세대학교연세바나나우유', '뽀로로가 좋아하는 바나나우유',
-        '붕장어(아나고)회/필렛', '새송이버섯나물 밀키트', '애호박나물', '취나물무침 (2개)',
-        '선물세트 달보드레_하나', '몽키나나', '쇼콜라 판나코타', '앙버터모나카 (2개)',
-        '가나슈데니쉬식빵', '가나소프트콘', '연세우유 초코 모나카', '주문하신 카페라떼 나왔습니다',
-        '마켓진양호 시나몬라떼', '다크나이트(DARK KNIGHT)', '오나의살들아',
-        '데일리슬림쉐이크 바나나', '양수면옥 건호박나물볶음', '칼집요리비엔나',
-        '연세바나나우유', '나는 미니김', '정월대보름나물', '미니콘 바나나',
-        '만나마카롱3구SET', '바나나머랭쿠키 (2개)', '바나나샌드웨이퍼',
-        # 추가 키워드들
-        '이삭시그니처', '버터롤', '미라클 블렌드', '요거트비스켓', '백합막장용메주가루',
-        '한입 우리콩 두부과자', '두부바게트', '야채두부버터빵', '프로틴플러스두유두부식빵',
-        '두부 치즈케이크', '곰곰 우리콩두부', '소이요 백태 전두부', '순두부 치즈 그라탕 볼로네제',
-        '우리 쌀콩 미숫가루', '못말림 블렌드', '월넛 브레드', '스키니팝콘', '보리바게트',
-        '찐크 프로틴 크래커(참깨맛)', '17곡미숫가루A+', '포시즌블렌드', '알바 블랜드'
-    ]
-    
-    # 의심스러운 패턴들
-    suspicious_patterns = [
-        '풀빵', '쿠키 런', '게임용', '게임 아이템', '캐릭터', '콜라보',
-        '한정 상품', '특별 상품', '이벤트', '기념품'
-    ]
-    
-    # 키워드 체크
-    for keyword in non_food_keywords:
-        if keyword in combined_text:
-            return True
-    
-    # 패턴 체크
-    for pattern in suspicious_patterns:
-        if pattern in combined_text:
-            return True
-    
-    return False
+# 의심스러운 패턴들
+SUSPICIOUS_PATTERNS = [
+    '풀빵', '쿠키 런', '게임용', '게임 아이템', '캐릭터', '콜라보',
+    '한정 상품', '특별 상품', '이벤트', '기념품'
+]
 
-def has_valid_price(lprice, hprice, category):
-    """가격 정보가 유효한지 확인 (카테고리별 기준 적용)"""
-    lprice_numeric = pd.to_numeric(lprice, errors='coerce')
-    hprice_numeric = pd.to_numeric(hprice, errors='coerce')
-    
-    # 둘 다 NaN이면 False
-    if pd.isna(lprice_numeric) and pd.isna(hprice_numeric):
-        return False
-    
-    # 유효한 가격 선택 (lprice 우선)
-    price = lprice_numeric if not pd.isna(lprice_numeric) else hprice_numeric
-    
-    # 너무 높은 가격도 필터링 (100만원 이상)
-    if price > 1000000:
-        return False
-    
-    # 카테고리별 최소 가격 기준
-    category_thresholds = {
-        '빵류': 300,         
-        '과자': 300,         
-        '캔디류': 300,       
-        '소스': 400,         
-        '즉석조리식품': 800, 
-        '즉석섭취식품': 600,  
-        '과·채주스': 600,    
-        '혼합음료': 600,     
-        '양념육': 600,       
-    }
-    
-    # 기본 최소 가격 (더 엄격하게)
-    min_price = category_thresholds.get(category, 500)
-    
-    return price >= min_price
+# 키워드/패턴 전체를 정규식 하나로 컴파일 (행마다 키워드 수만큼 비교하지 않음)
+NON_FOOD_MATCHER = BlocklistMatcher(NON_FOOD_KEYWORDS + SUSPICIOUS_PATTERNS)
 
-def has_valid_nutrition_data(row):
-    """필수 영양소 데이터가 있는지 확인"""
-    required_nutrients = ['calorie', 'protein', 'fat', 'carbohydrate']
-    
-    for nutrient in required_nutrients:
-        value = pd.to_numeric(row.get(nutrient, 0), errors='coerce')
-        if pd.isna(value) or value < 0:
-            return False
-    
-    # 칼로리가 너무 높거나 낮은 경우 (100g 기준)
-    calorie = pd.to_numeric(row.get('calorie', 0), errors='coerce')
-    if calorie > 800 or calorie < 1:  # 100g 기준 800칼로리 초과 또는 1칼로리 미만
-        return False
-    
-    return True
+def text_column(df, col):
+    if col not in df.columns:
+        return pd.Series('', index=df.index)
+    return df[col].fillna('').astype(str)
 
-def validate_and_clean_row(args):
-    """행의 모든 검증을 수행하고 정리된 데이터 반환"""
-    idx, row = args
-    
-    # 1. 비식품 상품 필터링
-    if is_non_food_item(row.get('naver_title', ''), row.get('food_name', '')):
-        return idx, None, "비식품 상품"
-    
-    # 2. 필수 영양소 데이터 확인
-    if not has_valid_nutrition_data(row):
-        return idx, None, "영양소 데이터 부족"
-    
-    # 3. 가격 확인
-    if not has_valid_price(row.get('lprice'), row.get('hprice'), row.get('food_category')):
-        return idx, None, "가격 정보 부족"
-    
-    # 4. 이미지 URL 확인 (시간이 가장 오래 걸림)
-    if not is_valid_image_url(row.get('image')):
-        return idx, None, "이미지 URL 무효"
-    
+def numeric_column(df, col, default=0):
+    if col not in df.columns:
+        return pd.Series(default, index=df.index, dtype=float)
+    return pd.to_numeric(df[col], errors='coerce')
+
+def non_food_mask(df):
+    """비식품 상품인지 (naver_title + food_name 소문자에 키워드/패턴 포함)"""
+    combined = (text_column(df, 'naver_title') + ' ' + text_column(df, 'food_name')).str.lower()
+    return NON_FOOD_MATCHER.mask(combined)
+
+# 카테고리별 최소 가격 기준
+CATEGORY_MIN_PRICE = {
+    '빵류': 300,         
+    '과자': 300,         
+    '캔디류': 300,       
+    '소스': 400,         
+    '즉석조리식품': 800, 
+    '즉석섭취식품': 600,  
+    '과·채주스': 600,    
+    '혼합음료': 600,     
+    '양념육': 600,       
+}
+# 기본 최소 가격 (더 엄격하게)
+DEFAULT_MIN_PRICE = 500
+# 너무 높은 가격도 필터링 (100만원 이상)
+MAX_PRICE = 1000000
+
+def valid_price_mask(df):
+    """가격 정보가 유효한지 (카테고리별 기준 적용)"""
+    lprice = numeric_column(df, 'lprice', np.nan)
+    hprice = numeric_column(df, 'hprice', np.nan)
+    
+    # 유효한 가격 선택 (lprice 우선), 둘 다 NaN이면 아래 비교가 모두 False
+    price = lprice.fillna(hprice)
+    
+    if 'food_category' in df.columns:
+        min_price = df['food_category'].map(CATEGORY_MIN_PRICE).fillna(DEFAULT_MIN_PRICE)
+    else:
+        min_price = DEFAULT_MIN_PRICE
+    return price.notna() & (price <= MAX_PRICE) & (price >= min_price)
+
+REQUIRED_NUTRIENTS = ['calorie', 'protein', 'fat', 'carbohydrate']
+
+def valid_nutrition_mask(df):
+    """필수 영양소 데이터가 있는지"""
+    valid = pd.Series(True, index=df.index)
+    for nutrient in REQUIRED_NUTRIENTS:
+        value = numeric_column(df, nutrient)
+        valid &= value.notna() & (value >= 0)
+    
+    # 칼로리가 너무 높거나 낮은 경우 (100g 기준 800칼로리 초과 또는 1칼로리 미만)
+    calorie = numeric_column(df, 'calorie')
+    return valid & (calorie <= 800) & (calorie >= 1)
+
+def check_rows(df):
+    """
+    CPU만 쓰는 검증 (비식품/영양소/가격)을 컬럼 단위 mask로 한 번에 수행
+    반환: 행별 첫 번째 실패 사유 Series (통과한 행은 None)
+    """
+    reasons = np.select(
+        [non_food_mask(df), ~valid_nutrition_mask(df), ~valid_price_mask(df)],
+        ["비식품 상품", "영양소 데이터 부족", "가격 정보 부족"],
+        default=None,
+    )
+    return pd.Series(reasons, index=df.index, dtype=object)
+
+def clean_row(row):
+    """검증을 통과한 행 정리 (4. 이미지 URL 확인은 main에서 생존 행만 모아서 한 번에 수행)"""
     # 5. 데이터 정리
     cleaned_row = {}
     
@@ -243,7 +213,7 @@ def validate_and_clean_row(args):
         food_id = food_id[:50]
     cleaned_row['food_id'] = food_id
     
-    return idx, cleaned_row, "유효"
+    return cleaned_row
 
 def to_float(s):
     try:
@@ -264,33 +234,8 @@ def to_bigint(s):
         return None
 
 def read_csv_smart(path):
-    """기존 스크립트의 CSV 읽기 함수 사용"""
-    try:
-        df = pd.read_csv(path, sep=None, engine='python', dtype=str, encoding='utf-8-sig')
-        if df.shape[1] > 1:
-            return df
-    except Exception:
-        pass
-    try:
-        df = pd.read_csv(path, sep='\t', engine='python', dtype=str, encoding='utf-8-sig')
-        if df.shape[1] > 1:
-            return df
-    except Exception:
-        pass
-    try:
-        df = pd.read_csv(path, sep=',', engine='python', dtype=str, encoding='utf-8-sig')
-        if df.shape[1] > 1:
-            return df
-    except Exception:
-        pass
-    try:
-        df = pd.read_csv(path, sep=None, engine='python', dtype=str, encoding='cp949', on_bad_lines='skip')
-        if df.shape[1] > 1:
-            return df
-    except Exception:
-        pass
-    df = pd.read_csv(path, sep=',', engine='python', dtype=str, encoding='cp949', on_bad_lines='skip')
-    return df
+    """CSV는 인코딩/구분자를 앞부분만 보고 판별해서 한 번만 읽고, .parquet/.arrow/.xlsx도 같은 함수로 읽음"""
+    return read_table(path)
 
 def purge_foods_and_children_auto():
     """기존 DB 데이터 삭제"""
@@ -306,7 +251,10 @@ def purge_foods_and_children_auto():
                 qs.delete()
             except Exception:
                 pass
-        Food.objects.all().order_by().delete()
+        # 2) 마지막으로 Food 삭제 (퇴역 식품 포함)
+        # 자식 테이블은 이미 비었으므로 ORM delete()처럼 전체 행을 메모리로 모으지 않고 한 번에 삭제
+        with connection.cursor() as cur:
+            cur.execute(f"DELETE FROM {Food._meta.db_table}")
 
 def calculate_nutrition_scores(row):
     """영양 점수 계산"""
@@ -338,79 +286,144 @@ def calculate_nutrition_scores(row):
     except:
         return None, None, None
 
+def finish_chunk(rows):
+    """행 단위로만 할 수 있는 정리 + 영양 점수 계산 (프로세스 풀에서 chunk 단위로 실행)"""
+    cleaned = []
+    for row in rows:
+        row = clean_row(row)
+        row['nutrition_score'], row['nutri_score_grade'], row['nrf_index'] = calculate_nutrition_scores(row)
+        cleaned.append(row)
+    return cleaned
+
+def finish_rows(rows, workers, chunk_size):
+    """rows를 chunk로 나눠 finish_chunk 실행 (입력 순서 유지)"""
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+    if workers <= 1 or len(chunks) <= 1:
+        return [row for chunk in chunks for row in finish_chunk(chunk)]
+    # fork된 자식이 부모의 DB 연결을 공유하지 않도록 먼저 닫음 (적재할 때 다시 연결됨)
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [row for chunk in executor.map(finish_chunk, chunks) for row in chunk]
+
+def rows_frame(valid_rows, cols):
+    """검증된 행(dict 리스트)을 DB 컬럼 순서의 DataFrame으로 변환 ("VitaminA" 처럼 따옴표로 감싼 컬럼도 원래 키로 매핑)"""
+    plain_cols = [c.strip('"') for c in cols] + ['content_hash', 'is_active', 'retired_at']
+    out = pd.DataFrame(valid_rows)
+    out['is_active'] = True
+    out['retired_at'] = None
+    out['content_hash'] = None
+    out = out.reindex(columns=plain_cols)
+    return add_content_hash(out, plain_cols), plain_cols
+
+def sync_incremental(out, cols, loader='copy', batch_size=1000, retire_missing=True):
+    """전체 삭제 대신 바뀐 행만 반영하고 사라진 식품은 퇴역 처리 (Diet/FavoriteFood 보존) → 반영한 행 수"""
+    is_new, is_changed, missing = plan_sync(out)
+    todo = out[is_new | is_changed]
+    safe_print(f"신규: {int(is_new.sum())}개, 변경: {int(is_changed.sum())}개, "
+               f"변경 없음: {len(out) - len(todo)}개, 사라진 식품: {len(missing)}개")
+    load_frame(todo, cols, loader=loader, batch_size=batch_size)
+    if retire_missing and missing:
+        retire_foods(missing, batch_size=batch_size)
+    return len(todo)
+
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", dest="csv_path", default=os.path.join(BASE_DIR, 'food_clean_data.csv'),
+                        help="입력 파일 경로 (.csv / .parquet / .arrow / .xlsx)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="전체 삭제 없이 바뀐 행만 반영 (사라진 식품은 퇴역 처리)")
+    parser.add_argument("--keep-missing", action="store_true", help="증분 모드에서 CSV에 없는 식품을 퇴역시키지 않음")
+    parser.add_argument("--loader", choices=["copy", "executemany"], default="copy",
+                        help="copy: COPY로 임시 테이블 적재 후 한 번에 병합 (기본), executemany: 기존 방식")
+    parser.add_argument("--image-cache", dest="image_cache", default=os.path.join(BASE_DIR, 'image_url_cache.sqlite'),
+                        help="이미지 URL 확인 결과 캐시(SQLite) 경로")
+    parser.add_argument("--no-image-cache", action="store_true", help="이미지 URL 캐시 사용 안 함")
+    parser.add_argument("--image-concurrency", dest="image_concurrency", type=int, default=64,
+                        help="이미지 URL 동시 확인 수")
+    parser.add_argument("--per-host", dest="per_host", type=int, default=8, help="호스트 하나당 동시 요청 수")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="행 정리/영양 점수 계산 프로세스 수 (1이면 현재 프로세스에서 계산)")
+    parser.add_argument("--chunk-size", dest="chunk_size", type=int, default=5000, help="프로세스 하나에 넘기는 행 수")
+    parser.add_argument("--report", default=None, help="단계별 실행 리포트를 저장할 JSON 경로")
+    args = parser.parse_args()
+    report = RunReport('rebuild_clean_database', vars(args))
+
     safe_print("=== 깨끗한 데이터베이스 재구축 시작 ===")
     
-    # 1. 기존 데이터 삭제
-    safe_print("기존 DB 데이터 삭제 중...")
-    purge_foods_and_children_auto()
-    safe_print("기존 데이터 삭제 완료")
+    # 1. 기존 데이터 삭제 (증분 모드에서는 건너뜀)
+    if not args.incremental:
+        safe_print("기존 DB 데이터 삭제 중...")
+        with report.stage('purge'):
+            purge_foods_and_children_auto()
+        safe_print("기존 데이터 삭제 완료")
     
     # 2. 클린 CSV 파일 읽기
-    clean_csv_path = os.path.join(BASE_DIR, 'food_clean_data.csv')
+    clean_csv_path = args.csv_path
     if not os.path.exists(clean_csv_path):
         safe_print(f"ERROR: {clean_csv_path} 파일이 존재하지 않습니다.")
         return
     
     safe_print("클린 CSV 파일 읽는 중...")
-    df = read_csv_smart(clean_csv_path).fillna('')
-    
-    # BOM/공백 제거
-    df.columns = df.columns.str.replace('\ufeff', '', regex=False).str.strip()
+    with report.stage('read') as st:
+        df = read_csv_smart(clean_csv_path).fillna('')
+        # BOM/공백 제거
+        df.columns = df.columns.str.replace('\ufeff', '', regex=False).str.strip()
+        st.rows_out = len(df)
     
     safe_print(f"원본 데이터: {len(df)}개 행")
     safe_print("첫 10개 컬럼:", df.columns.tolist()[:10])
     
-    # 3. 멀티스레딩으로 데이터 검증 및 정리
-    safe_print("데이터 검증 및 정리 중... (멀티스레딩)")
+    # 3. CPU 검증 (비식품/영양소/가격): 컬럼 단위 mask로 전체를 한 번에 → 통과한 행만 이미지 URL 확인
+    safe_print("데이터 검증 및 정리 중...")
     
-    valid_rows = []
     stats = {'비식품 상품': 0, '영양소 데이터 부족': 0, '가격 정보 부족': 0, '이미지 URL 무효': 0, '유효': 0}
     
-    completed_count = [0]
-    lock = threading.Lock()
-    
-    def update_progress():
-        with lock:
-            completed_count[0] += 1
-            if completed_count[0] % 500 == 0:
-                safe_print(f"진행률: {completed_count[0]}/{len(df)} ({completed_count[0]/len(df)*100:.1f}%)")
-    
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        future_to_idx = {
-            executor.submit(validate_and_clean_row, (idx, row)): idx 
-            for idx, row in df.iterrows()
-        }
-        
-        for future in as_completed(future_to_idx):
-            idx, cleaned_row, status = future.result()
-            stats[status] += 1
-            
-            if cleaned_row:
-                valid_rows.append(cleaned_row)
-            
-            update_progress()
+    with report.stage('check') as st:
+        reasons = check_rows(df)
+        for status, count in reasons.value_counts().items():
+            stats[status] += int(count)
+            st.drop(status, count)
+        survivors = df[reasons.isna()]
+        st.rows_in, st.rows_out = len(df), len(survivors)
+    safe_print(f"CPU 검증 통과: {len(survivors)}/{len(df)}개 → 이미지 URL 확인")
+    
+    # 4. 이미지 URL 확인 (시간이 가장 오래 걸림): 연결 재사용 + 호스트별 동시 요청 제한 + URL 결과 캐시
+    checker = ImageChecker(
+        None if args.no_image_cache else args.image_cache,
+        concurrency=args.image_concurrency,
+        per_host=args.per_host,
+    )
+    with report.stage('image_check') as st:
+        images = text_column(survivors, 'image')
+        image_ok = checker.check(images.tolist())
+        has_image = images.map(image_ok).fillna(False).astype(bool)
+        stats['이미지 URL 무효'] = int((~has_image).sum())
+        stats['유효'] = int(has_image.sum())
+        st.rows_in, st.rows_out = len(survivors), stats['유효']
+        st.drop('이미지 URL 무효', stats['이미지 URL 무효'])
+        st.extra['requested'] = checker.requested
+    safe_print(f"{checker.stats_line()}, {report.stages['image_check'].seconds:.1f}초")
+    checker.close()
+    report.extra['stats'] = dict(stats)
     
     safe_print("\n=== 검증 결과 ===")
     for status, count in stats.items():
         safe_print(f"{status}: {count}개")
     
-    if not valid_rows:
+    if not stats['유효']:
         safe_print("ERROR: 유효한 데이터가 없습니다.")
         return
     
-    # 4. 영양 점수 계산
-    safe_print("영양 점수 계산 중...")
-    for row in valid_rows:
-        nutrition_score, nutri_grade, nrf_index = calculate_nutrition_scores(row)
-        row['nutrition_score'] = nutrition_score
-        row['nutri_score_grade'] = nutri_grade
-        row['nrf_index'] = nrf_index
+    # 데이터 정리 + 영양 점수 계산 (행 단위 → 프로세스 풀)
+    safe_print("데이터 정리 및 영양 점수 계산 중...")
+    with report.stage('finish') as st:
+        valid_rows = finish_rows(survivors[has_image].to_dict('records'), args.workers, args.chunk_size)
+        st.rows_in = stats['유효']
+        st.rows_out = len(valid_rows)
     
     # 5. 데이터베이스에 삽입
     safe_print(f"데이터베이스에 {len(valid_rows)}개 행 삽입 중...")
     
-    TABLE_NAME = Food._meta.db_table
     cols = [
         'food_id','food_img','food_name','food_category','representative_food',
         'nutritional_value_standard_amount','calorie','moisture','protein','fat',
@@ -421,31 +434,23 @@ def main():
         'lprice','discount_price','shop_url','image_url'
     ]
     
-    placeholders = ",".join(["%s"] * len(cols))
-    sql = f"INSERT INTO {TABLE_NAME} ({', '.join(cols)}) VALUES ({placeholders})"
-    
-    records = []
-    for row in valid_rows:
-        record = []
-        for col in cols:
-            value = row.get(col)
-            if hasattr(value, 'item'):  # numpy 타입 변환
-                record.append(value.item())
-            else:
-                record.append(value)
-        records.append(tuple(record))
-    
-    with transaction.atomic():
-        with connection.cursor() as cur:
-            chunk_size = 1000
-            for i in range(0, len(records), chunk_size):
-                cur.executemany(sql, records[i:i+chunk_size])
+    with report.stage('load') as st:
+        out, plain_cols = rows_frame(valid_rows, cols)
+        st.rows_in = len(out)
+        if args.incremental:
+            st.rows_out = sync_incremental(out, plain_cols, loader=args.loader, retire_missing=not args.keep_missing)
+            st.drop('변경 없음', len(out) - st.rows_out)
+        else:
+            load_frame(out, plain_cols, loader=args.loader)
+            st.rows_out = len(out)
     
     # 6. 정리된 CSV 파일 저장
     clean_csv_path = os.path.join(BASE_DIR, 'food_clean_data_rebuild.csv')
     
-    clean_df = pd.DataFrame(valid_rows)
-    clean_df.to_csv(clean_csv_path, index=False, encoding='utf-8')
+    with report.stage('write_csv') as st:
+        clean_df = pd.DataFrame(valid_rows)
+        clean_df.to_csv(clean_csv_path, index=False, encoding='utf-8')
+        st.rows_in = st.rows_out = len(clean_df)
     
     safe_print(f"\n=== 완료 ===")
     safe_print(f"데이터베이스에 {len(valid_rows)}개 행 삽입 완료")
@@ -453,6 +458,7 @@ def main():
     safe_print(f"A급 영양소: {sum(1 for row in valid_rows if row.get('nutri_score_grade') == 'A')}개")
     safe_print(f"B급 영양소: {sum(1 for row in valid_rows if row.get('nutri_score_grade') == 'B')}개")
     safe_print(f"C급 영양소: {sum(1 for row in valid_rows if row.get('nutri_score_grade') == 'C')}개")
+    report.finish(args.report, printer=safe_print)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
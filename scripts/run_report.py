@@ -0,0 +1,156 @@
+"""
+데이터 스크립트 공용 실행 리포트 (crawl_naver / clean_food_data / rebuild_clean_database / insert_food_postgresql)
+- 단계별 소요 시간, 입력/출력 행 수, rows/s, 그 시점까지의 최대 RSS, 제외 사유별 행 수 기록
+- 종료 시 표로 출력하고 --report 경로가 있으면 JSON으로 저장 → 데이터 갱신 때마다 비교 가능
+- django를 import 하지 않음
+
+사용 예:
+    report = RunReport('rebuild_clean_database', vars(args))
+    with report.stage('read') as st:
+        df = read_table(path)
+        st.rows_out = len(df)
+    ...
+    report.finish(args.report)
+
+generator로 이어진 단계는 stream()으로 감싸면 각 단계 자체에서 쓴 시간만 기록됨 (앞 단계 시간 제외)
+"""
+import json
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+from csv_stream import peak_rss_mb
+
+
+class Stage:
+    def __init__(self, name):
+        self.name = name
+        self.rows_in = None
+        self.rows_out = 0
+        self.drops = Counter()
+        self.extra = {}
+        self.upstream = None
+        self._seconds = 0.0
+        self.peak_rss_mb = 0.0
+
+    def drop(self, reason, count=1):
+        """reason 때문에 제외된 행 수 누적"""
+        if count:
+            self.drops[reason] += int(count)
+
+    @property
+    def seconds(self):
+        """이 단계 자체에서 쓴 시간 (stream 단계는 앞 단계 시간을 뺌)"""
+        if self.upstream is not None:
+            return max(0.0, self._seconds - self.upstream._seconds)
+        return self._seconds
+
+    def to_dict(self):
+        rows_in = self.rows_in
+        if rows_in is None and self.upstream is not None:
+            rows_in = self.upstream.rows_out
+        seconds = self.seconds
+        basis = rows_in if rows_in is not None else self.rows_out
+        return {
+            'name': self.name,
+            'seconds': round(seconds, 3),
+            'rows_in': rows_in,
+            'rows_out': self.rows_out,
+            'rows_per_sec': round(basis / seconds, 1) if seconds and basis else None,
+            'peak_rss_mb': round(self.peak_rss_mb, 1),
+            'drops': dict(self.drops),
+            **({'extra': self.extra} if self.extra else {}),
+        }
+
+
+class RunReport:
+    def __init__(self, script, params=None):
+        self.script = script
+        self.params = {k: v for k, v in (params or {}).items() if isinstance(v, (str, int, float, bool, type(None)))}
+        self.started_at = datetime.now().astimezone()
+        self._started = time.perf_counter()
+        self.stages = {}
+        self.extra = {}
+
+    def _get(self, name):
+        if name not in self.stages:
+            self.stages[name] = Stage(name)
+        return self.stages[name]
+
+    @contextmanager
+    def stage(self, name):
+        """with 블록 시간을 name 단계에 누적 (같은 이름으로 여러 번 들어가면 합산)"""
+        stage = self._get(name)
+        started = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage._seconds += time.perf_counter() - started
+            stage.peak_rss_mb = max(stage.peak_rss_mb, peak_rss_mb())
+
+    def stream(self, name, iterable, upstream=None, rows=len):
+        """
+        generator 단계 감싸기 → (Stage, 감싼 iterator)
+        - 항목마다 next()에 걸린 시간과 rows(항목) 수를 누적
+        - upstream(앞 단계 Stage)을 주면 앞 단계 시간을 빼고, rows_in은 앞 단계 rows_out
+        """
+        stage = self._get(name)
+        stage.upstream = upstream
+
+        def wrapped():
+            it = iter(iterable)
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    return
+                finally:
+                    stage._seconds += time.perf_counter() - started
+                    stage.peak_rss_mb = max(stage.peak_rss_mb, peak_rss_mb())
+                stage.rows_out += rows(item)
+                yield item
+
+        return stage, wrapped()
+
+    def to_dict(self):
+        stages = [s.to_dict() for s in self.stages.values()]
+        wall = time.perf_counter() - self._started
+        return {
+            'script': self.script,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'finished_at': datetime.now().astimezone().isoformat(timespec='seconds'),
+            'wall_seconds': round(wall, 3),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+            'drops': dict(sum((s.drops for s in self.stages.values()), Counter())),
+            'params': self.params,
+            'stages': stages,
+            **({'extra': self.extra} if self.extra else {}),
+        }
+
+    def summary_lines(self):
+        data = self.to_dict()
+        lines = [f"=== 실행 리포트: {self.script} ===",
+                 f"{'stage':<14}{'sec':>9}{'in':>10}{'out':>10}{'rows/s':>11}{'RSS(MB)':>9}  drops"]
+        for s in data['stages']:
+            drops = ", ".join(f"{k} {v}" for k, v in s['drops'].items())
+            rate = f"{s['rows_per_sec']:,.0f}" if s['rows_per_sec'] else '-'
+            rows_in = s['rows_in'] if s['rows_in'] is not None else '-'
+            lines.append(f"{s['name']:<14}{s['seconds']:>9.2f}{rows_in:>10}{s['rows_out']:>10}{rate:>11}{s['peak_rss_mb']:>9.0f}  {drops}")
+        lines.append(f"전체 {data['wall_seconds']:.1f}초, 최대 메모리(RSS) {data['peak_rss_mb']:.0f}MB")
+        return lines
+
+    def finish(self, path=None, printer=print):
+        """요약 출력 + path가 있으면 JSON 저장 → 리포트 dict"""
+        for line in self.summary_lines():
+            printer(line)
+        data = self.to_dict()
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            printer(f"리포트 저장: {path}")
+        return data
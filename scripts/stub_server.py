@@ -0,0 +1,232 @@
+"""
+네이버 쇼핑 API 로컬 스텁 서버 (오프라인 테스트/처리량 측정용)
+- GET /v1/search/shop.json : 키(X-Naver-Client-Id)마다 초당 --qps개까지 응답, 넘으면 429
+- 응답마다 --latency-ms 근처의 지연, --error-rate 확률로 무작위 429
+- --throttle-first N: 키마다 처음 N개 요청은 항상 429 (재시도 동작을 결정적으로 확인할 때)
+- HEAD/GET /img/<n>.jpg : 이미지 CDN 흉내 (n이 10의 배수면 404, 끝자리 1이면 text/html → 이미지 아님)
+  그 외에는 실제 JPEG (n % IMAGE_VARIANTS 로 색이 정해져서 URL이 달라도 내용이 같은 이미지가 생김 → 썸네일 중복 제거 확인용)
+- GET /get-only/img/<n>.jpg : 위와 같지만 HEAD는 405 (HEAD를 받지 않는 CDN 흉내)
+- HEAD/GET /broken/img/<n>.jpg : Content-Type은 image/jpeg인데 본문은 이미지가 아님 (디코딩 실패 확인용)
+- GET /stats : 키별 요청/성공/429 수 (JSON)
+- 종료(Ctrl+C) 시 키별 처리량 출력
+
+사용법:
+    python scripts/stub_server.py --port 8765 --qps 10 --latency-ms 80
+    NAVER_CLIENT_IDS=k1,k2 NAVER_CLIENT_SECRETS=s1,s2 \
+        python scripts/crawl_naver.py --in in.csv --out out.parquet --async --api-url http://127.0.0.1:8765/v1/search/shop.json
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+from io import BytesIO
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class KeyQuota:
+    """서버 쪽 키별 토큰 버킷 (스레드 안전)"""
+    def __init__(self, qps, burst):
+        self.qps = qps
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.qps)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class StubState:
+    def __init__(self, qps, burst, latency_ms, error_rate, throttle_first=0):
+        self.qps = qps
+        self.burst = burst
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.throttle_first = throttle_first
+        self.quotas = {}
+        self.stats = defaultdict(lambda: {"requests": 0, "ok": 0, "throttled": 0})
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+
+    def quota(self, key):
+        with self.lock:
+            if key not in self.quotas:
+                self.quotas[key] = KeyQuota(self.qps, self.burst)
+            return self.quotas[key]
+
+    def count(self, key, field):
+        """key의 field를 1 올리고 올린 값을 반환"""
+        with self.lock:
+            self.stats[key][field] += 1
+            return self.stats[key][field]
+
+    def snapshot(self):
+        elapsed = time.monotonic() - self.started
+        with self.lock:
+            return {
+                "elapsed": round(elapsed, 2),
+                "keys": {
+                    key: dict(s, ok_per_sec=round(s["ok"] / elapsed, 2) if elapsed else 0)
+                    for key, s in self.stats.items()
+                },
+            }
+
+
+IMAGE_VARIANTS = 50
+
+
+@lru_cache(maxsize=IMAGE_VARIANTS)
+def fake_jpeg(variant, size=800):
+    """variant마다 항상 같은 바이트의 JPEG (Pillow가 없으면 JPEG 헤더만 있는 가짜 바이트)"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return b"\xff\xd8\xff\xe0" + bytes(252)
+    rng = random.Random(variant)
+    img = Image.new("RGB", (size, size * 3 // 4), tuple(rng.randint(0, 255) for _ in range(3)))
+    buf = BytesIO()
+    img.save(buf, "JPEG", quality=90)
+    return buf.getvalue()
+
+
+def fake_items(query, host):
+    """쿼리마다 항상 같은 결과가 나오도록 query로 시드"""
+    rng = random.Random(query)
+    items = []
+    for i in range(3):
+        n = rng.randint(1, 10**6)
+        items.append({
+            "title": f"<b>{query}</b> {i}",
+            "link": f"http://{host}/product/{n}",
+            "image": f"http://{host}/img/{n}.jpg",
+            "lprice": str(rng.randint(1, 500) * 100),
+            "hprice": "",
+            "mallName": "스텁몰",
+        })
+    return items
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        # HEAD 응답에 본문을 쓰면 keep-alive 연결이 깨짐
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        url = urlparse(self.path)
+        if url.path.startswith(("/img/", "/broken/img/")):
+            self.image(url)
+        else:
+            self.send_json(405, {"errorMessage": "method not allowed"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.startswith(("/img/", "/get-only/img/", "/broken/img/")):
+            self.image(url)
+        elif url.path == "/stats":
+            self.send_json(200, self.state.snapshot())
+        elif url.path == "/v1/search/shop.json":
+            self.search(url)
+        else:
+            self.send_json(404, {"errorMessage": "not found"})
+
+    def image(self, url):
+        self.state.count("images", "requests")
+        if self.state.latency_ms:
+            time.sleep(random.uniform(0.5, 1.5) * self.state.latency_ms / 1000)
+        name = url.path.rsplit("/", 1)[-1].split(".")[0]
+        n = int(name) if name.isdigit() else 0
+        if n % 10 == 0:
+            self.send_json(404, {"errorMessage": "not found"})
+            return
+        if url.path.startswith("/broken/"):
+            body, content_type = b"not really a jpeg", "image/jpeg"
+        elif n % 10 == 1:
+            body, content_type = b"<html></html>", "text/html"
+        else:
+            body, content_type = fake_jpeg(n % IMAGE_VARIANTS), "image/jpeg"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+        self.state.count("images", "ok")
+
+    def search(self, url):
+        state = self.state
+        key = self.headers.get("X-Naver-Client-Id", "")
+        if not key:
+            self.send_json(401, {"errorMessage": "Not Exist Client ID", "errorCode": "024"})
+            return
+        nth = state.count(key, "requests")
+
+        if state.latency_ms:
+            time.sleep(random.uniform(0.5, 1.5) * state.latency_ms / 1000)
+
+        if nth <= state.throttle_first or not state.quota(key).take() or random.random() < state.error_rate:
+            state.count(key, "throttled")
+            self.send_json(429, {"errorMessage": "Rate limit exceeded", "errorCode": "012"})
+            return
+
+        query = parse_qs(url.query).get("query", [""])[0]
+        state.count(key, "ok")
+        self.send_json(200, {"items": fake_items(query, self.headers.get("Host", "127.0.0.1"))})
+
+
+def make_server(host="127.0.0.1", port=8765, qps=10.0, burst=None, latency_ms=80, error_rate=0.0, throttle_first=0):
+    """다른 스크립트에서 스레드로 띄울 때 사용: server.serve_forever() / server.shutdown()"""
+    handler = type("BoundStubHandler", (StubHandler,), {
+        "state": StubState(qps, burst or qps, latency_ms, error_rate, throttle_first),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--qps", type=float, default=10.0, help="키 하나당 초당 허용 요청 수")
+    parser.add_argument("--burst", type=float, default=None, help="순간 허용량 (기본: qps)")
+    parser.add_argument("--latency-ms", dest="latency_ms", type=float, default=80, help="평균 응답 지연(ms)")
+    parser.add_argument("--error-rate", dest="error_rate", type=float, default=0.0, help="무작위 429 확률")
+    parser.add_argument("--throttle-first", dest="throttle_first", type=int, default=0, help="키마다 처음 N개 요청은 429")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.qps, args.burst, args.latency_ms, args.error_rate, args.throttle_first)
+    print(f"stub server: http://{args.host}:{args.port} (qps/key={args.qps}, latency≈{args.latency_ms}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.RequestHandlerClass.state.snapshot(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
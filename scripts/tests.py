@@ -0,0 +1,198 @@
+"""
+데이터 파이프라인 스크립트 테스트 (manage.py test가 scripts.tests로 찾음)
+- 스크립트끼리는 scripts/ 를 sys.path에 두고 import 하므로 여기서도 같은 방식으로 import
+- 외부 서비스(네이버 API, 이미지 CDN)는 stub_server.py를 스레드로 띄워서 대신함
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+import httpx
+import pandas as pd
+from django.test import SimpleTestCase
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from csv_stream import SNIFF_BYTES, iter_csv_chunks, sniff_csv  # noqa: E402
+from extract_manufacturer_info import SOURCE_COLUMNS, load_source  # noqa: E402
+from image_check import ImageChecker, is_http_url  # noqa: E402
+from kv_cache import KVCache  # noqa: E402
+from stub_server import make_server  # noqa: E402
+
+
+def start_stub(test, **options):
+    """stub_server를 빈 포트에 띄우고 테스트가 끝나면 종료 → http://127.0.0.1:<port>"""
+    server = make_server(port=0, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test.addCleanup(server.server_close)
+    test.addCleanup(server.shutdown)
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def import_crawler():
+    """crawl_naver는 import 시점에 키 환경변수를 읽으므로 스텁용 키 2개로 import"""
+    with mock.patch.dict(os.environ, {'NAVER_CLIENT_IDS': 'stub-key-1,stub-key-2', 'NAVER_CLIENT_SECRETS': 's1,s2'}):
+        import crawl_naver
+    return crawl_naver
+
+
+class CsvStreamTests(SimpleTestCase):
+
+    def write_late_korean_csv(self, encoding):
+        """앞부분(SNIFF_BYTES 이상)은 ASCII뿐이고 한글 행은 뒤에 있는 파일"""
+        rows = [f"F{i:06d},snack {i},100" for i in range(SNIFF_BYTES // 16)]
+        rows.append("K000001,새우깡,90")
+        f = tempfile.NamedTemporaryFile(suffix='.csv', delete=False)
+        self.addCleanup(os.unlink, f.name)
+        f.write(("food_id,food_name,calorie\n" + "\n".join(rows) + "\n").encode(encoding))
+        f.close()
+        self.assertGreater(os.path.getsize(f.name), SNIFF_BYTES)
+        return f.name, len(rows)
+
+    def test_cp949_with_ascii_head(self):
+        path, n_rows = self.write_late_korean_csv('cp949')
+        self.assertEqual(sniff_csv(path), ('cp949', ','))
+        chunks = list(iter_csv_chunks(path, chunksize=1000))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), n_rows)
+        self.assertEqual(chunks[-1]['food_name'].iloc[-1], '새우깡')
+
+    def test_utf8_with_ascii_head(self):
+        path, _ = self.write_late_korean_csv('utf-8')
+        self.assertEqual(sniff_csv(path), ('utf-8-sig', ','))
+
+
+class ManufacturerCacheTests(SimpleTestCase):
+
+    def write_xlsx(self, path, maker):
+        pd.DataFrame([['F1', maker, '', '']], columns=SOURCE_COLUMNS).to_excel(path, index=False)
+
+    def test_refresh_keeps_other_sources_cache(self):
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+            cache_dir = os.path.join(tmp, 'cache')
+            source, other = os.path.join(tmp, 'foo.xlsx'), os.path.join(tmp, 'foo-2024.xlsx')
+            self.write_xlsx(source, '농심')
+            self.write_xlsx(other, '오리온')
+            load_source(source, cache_dir)
+            load_source(other, cache_dir)
+            before = set(os.listdir(cache_dir))
+
+            # foo.xlsx가 바뀌면 foo의 예전 캐시만 교체
+            self.write_xlsx(source, '롯데')
+            os.utime(source, ns=(time.time_ns(), time.time_ns() + 10**9))
+            self.assertEqual(load_source(source, cache_dir)['제조사명'].tolist(), ['롯데'])
+            after = set(os.listdir(cache_dir))
+
+        self.assertEqual(len(after), 2)
+        self.assertEqual(len(before & after), 1)
+        self.assertTrue(any(name.startswith('foo-2024-') for name in before & after))
+
+
+class CrawlCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.crawler = import_crawler()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cache = KVCache(os.path.join(tmp.name, 'query_cache.sqlite'))
+        self.addCleanup(cache.close)
+        patcher = mock.patch.multiple(self.crawler, QUERY_CACHE=cache, RESULT_CACHE={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_exclude_used_does_not_share_cache(self):
+        def search_shop(query, display=3, sort="asc", exclude_used=False):
+            return [{"title": "새우깡 중고" if not exclude_used else "새우깡", "lprice": "1000", "link": "", "image": ""}]
+
+        row = {"food_name": "새우깡", "company_name": "농심"}
+        with mock.patch.object(self.crawler, 'search_shop', side_effect=search_shop) as api:
+            _, used, _ = self.crawler.process_row(0, row, False, 0)
+            self.crawler.RESULT_CACHE.clear()  # 다른 실행 (영구 캐시만 남음)
+            _, new, _ = self.crawler.process_row(0, row, True, 0)
+        self.assertEqual(api.call_count, 2)
+        self.assertNotEqual(used, new)
+        self.assertNotEqual(self.crawler.query_key("농심 새우깡", False), self.crawler.query_key("농심 새우깡", True))
+
+
+class ImageCheckTests(SimpleTestCase):
+
+    def test_malformed_urls_are_invalid(self):
+        # 잘못된 URL 하나 때문에 배치 전체가 실패하면 안 됨 (예전 방식은 URL마다 예외를 잡았음)
+        urls = ['http://a\tb.example/x.jpg', 'http://[::1/x.jpg', 'http://127.0.0.1:1/ok.jpg', 'not a url', None]
+        results = ImageChecker(timeout=0.5).check(urls)
+        self.assertEqual(results, dict.fromkeys(urls, False))
+
+    def test_stub_cases_and_cache(self):
+        base = start_stub(self, latency_ms=0)
+        expected = {
+            f'{base}/img/3.jpg': True,               # 이미지
+            f'{base}/img/20.jpg': False,             # 404
+            f'{base}/img/11.jpg': False,             # text/html
+            f'{base}/get-only/img/7.jpg': True,      # HEAD 405 → GET으로 확인
+            'http://a\tb.example/x.jpg': False,      # 잘못된 URL (요청 단계에서 실패)
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            checker = ImageChecker(os.path.join(tmp, 'image_cache.sqlite'), timeout=5)
+            self.addCleanup(checker.close)
+            self.assertEqual(checker.check(list(expected)), expected)
+            self.assertEqual(checker.requested, 5)
+
+            # 두 번째 실행은 모두 캐시에서
+            self.assertEqual(checker.check(list(expected)), expected)
+            self.assertEqual(checker.requested, 5)
+            self.assertEqual(checker.cache.hits, 5)
+
+    def test_throughput_with_stub(self):
+        # 지연 20ms 스텁에서 200개 → 하나씩 요청하면 4초 이상 걸림
+        base = start_stub(self, latency_ms=20)
+        urls = [f'{base}/img/{i}.jpg' for i in range(200)]
+        started = time.perf_counter()
+        results = ImageChecker(concurrency=64, per_host=32, timeout=5).check(urls)
+        elapsed = time.perf_counter() - started
+        self.assertEqual(sum(results.values()), 160)  # 끝자리 0(404), 1(html) 제외
+        self.assertLess(elapsed, 3.0, f"{len(urls) / elapsed:.0f} URLs/s")
+
+    def test_is_http_url(self):
+        self.assertTrue(is_http_url(' https://example.com/a.jpg '))
+        self.assertFalse(is_http_url('http://[::1/x.jpg'))
+        self.assertFalse(is_http_url('ftp://example.com/a.jpg'))
+        self.assertFalse(is_http_url(''))
+
+
+class CrawlAsyncStubTests(SimpleTestCase):
+    """--async 모드를 stub_server에 돌려서 키별 토큰 버킷/429 재시도/중복 쿼리 처리를 확인"""
+
+    QUERIES = 40
+
+    def test_enrich_async_against_stub(self):
+        crawler = import_crawler()
+        base = start_stub(self, qps=100, latency_ms=5, throttle_first=1)  # 키마다 첫 요청은 429
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cache = KVCache(os.path.join(tmp.name, 'query_cache.sqlite'))
+        self.addCleanup(cache.close)
+
+        # 40개 쿼리 + 같은 쿼리 20행 (동시에 요청 중인 쿼리는 API를 다시 부르지 않음)
+        names = [f"과자{i}" for i in range(self.QUERIES)] + [f"과자{i}" for i in range(0, self.QUERIES, 2)]
+        df = pd.DataFrame({"food_name": names, "company_name": "테스트"})
+        with mock.patch.multiple(crawler, API_URL=f"{base}/v1/search/shop.json", QUERY_CACHE=cache,
+                                 RESULT_CACHE={}, QPS_LIST=[50.0]), \
+                contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            crawler.enrich_async(df, concurrency=8, max_concurrency=16, checkpoint_dir=os.path.join(tmp.name, 'parts'))
+
+        # 모든 행 완료 (429를 받은 요청도 재시도해서 성공)
+        self.assertTrue(df["naver_title"].ne("").all(), df[df["naver_title"].eq("")])
+        keys = httpx.get(f"{base}/stats").json()["keys"]
+        self.assertEqual(sorted(keys), ["stub-key-1", "stub-key-2"])
+        self.assertEqual(sum(k["throttled"] for k in keys.values()), 2)
+        self.assertEqual(sum(k["ok"] for k in keys.values()), self.QUERIES)
+        # 두 키에 고르게 분산
+        for key in keys.values():
+            self.assertGreaterEqual(key["ok"], self.QUERIES // 4, keys)
+        # 캐시 없음 횟수 = 실제로 요청한 쿼리 수
+        self.assertEqual(cache.writes, self.QUERIES)
+        self.assertEqual(cache.misses, self.QUERIES)
@@ -1,3 +1,59 @@
+import datetime
+from unittest import mock
+
 from django.test import TestCase
+from django.utils.http import http_date
+
+from diets.models import Diet
+from foods.models import FavoriteFood
+from monitoring.tests import QueryBudgetTestCase, clear_caches, make_food
+
+from .views import RECOMMEND_ROTATE_SECONDS
+
+
+class SearchQueryBudgetTests(QueryBudgetTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # 즐겨찾기/식단이 많아도 식품마다 따로 조회하지 않는지 (N+1이면 STRICT에서 실패)
+        for food in cls.foods:
+            FavoriteFood.objects.create(user=cls.user, food=food)
+            Diet.objects.create(user=cls.user, food=food, meal='아침', date=datetime.date.today())
+
+    def test_search_before(self):
+        self.assertWithinBudget('/search/', 'search:search_before')
+        self.assertWithinBudget('/search/', 'search:search_before', user=self.user)
+
+    def test_normal_search(self):
+        cold, _ = self.assertWithinBudget('/search/normal/?keyword=테스트', 'search:normal_search', user=self.user)
+        foods = cold.json()['foods']
+        self.assertEqual(len(foods), self.FOODS)
+        self.assertTrue(all(food['is_favorite'] for food in foods))
+
+    def test_diet_search(self):
+        self.assertWithinBudget('/search/advanced/page/', 'search:diet_search', user=self.user,
+                                HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+
+class SearchBeforeConditionalTests(TestCase):
+
+    def setUp(self):
+        for i in range(12):
+            make_food(i)
+        clear_caches()
+
+    def test_new_window_is_not_modified_only_by_etag(self):
+        # 추천 목록은 10분 구간마다 바뀜 → Last-Modified(버전 시각)로는 알 수 없으므로 보내지 않음
+        now = 1_800_000_000
+        with mock.patch('search.views.time.time', return_value=now):
+            first = self.client.get('/search/')
+            self.assertNotIn('Last-Modified', first)
+            cached = self.client.get('/search/', HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(cached.status_code, 304)
 
-# Create your tests here.
+        with mock.patch('search.views.time.time', return_value=now + RECOMMEND_ROTATE_SECONDS):
+            since = self.client.get('/search/', HTTP_IF_MODIFIED_SINCE=http_date(now))
+            self.assertEqual(since.status_code, 200)
+            stale = self.client.get('/search/', HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(stale.status_code, 200)
@@ -8,8 +8,12 @@ from django.core.cache import cache
 from django.core.paginator import Paginator, EmptyPage
 from django.db.models import Q, Case, When
 from datetime import datetime, timedelta, date
+from foods.catalog import card_grid_key, catalog_version, lazy_cards, record_cards
+from foods.conditional import catalog_conditional
+from foods.snapshot import get_snapshot
+from monitoring.metrics import record_cache
 from analysis.views import make_evaluation, calculate_recommendation, get_real_nutrient
-import functools, random, uuid
+import functools, random, time, uuid
 
 # bytes 타입을 문자열로 변환하는 헬퍼 함수
 def safe_str(value):
@@ -61,6 +65,19 @@ def foods_to_dict(foods, user):
         food_to_dict(food, user=user, favorite_ids=favorite_ids)
         for food in foods
     ]
+
+async def afoods_to_dict(foods, user):
+    """foods_to_dict의 비동기 버전 (foods는 이미 가져온 리스트, user는 await request.auser())"""
+    favorite_ids = set()
+    if user and user.is_authenticated and foods:
+        favorite_ids = {
+            food_id async for food_id in
+            FavoriteFood.objects.filter(user=user, food__in=foods).values_list("food_id", flat=True)
+        }
+    return [
+        food_to_dict(food, user=user, favorite_ids=favorite_ids)
+        for food in foods
+    ]
         
 #to FE: food를 이런 형태의 데이터로 넘겨줄겁니다! 더 필요한 값 있거나 문제있는 값 있으면 바로 연락해주세요!!
 def food_to_dict(food, user=None, favorite_ids=None):
@@ -73,7 +90,7 @@ def food_to_dict(food, user=None, favorite_ids=None):
             
     ret = {
         "food_id": safe_str(getattr(food, "food_id", "")),
-        "food_img": safe_str(getattr(food, "image_url", "") or getattr(food, "food_img", "") or ""),
+        "food_img": safe_str(getattr(food, "display_image_url", "") or getattr(food, "food_img", "") or ""),
         "food_name": safe_str(getattr(food, "food_name", "") or ""),
         "food_category": safe_str(getattr(food, "food_category", "") or ""),
         "calorie": safe_float(getattr(food, "calorie", 0)),
@@ -109,15 +126,28 @@ def search_page(request):
     
     # 검색어가 있으면 검색 결과 반환 (서버 사이드 렌더링용)
     filtered_list = Food.objects.filter(food_name__icontains=keyword).order_by("-nutrition_score")
-    
-    # 반환할 값 구성하는 부분
-    context = {"foods": foods_to_dict(filtered_list, request.user), "keyword": keyword}
-    
-    return render(request, "search/search_page.html", context)
+    food_ids = list(filtered_list.values_list("food_id", flat=True))
+    favorite_ids = set()
+    if request.user.is_authenticated and food_ids:
+        favorite_ids = set(
+            FavoriteFood.objects.filter(user=request.user, food__in=filtered_list)
+            .values_list("food_id", flat=True)
+        )
+
+    # 카드 묶음은 (식품 ID 목록, 즐겨찾기 표시, 카탈로그 버전)으로 fragment 캐시 → hit이면 식품 행을 읽지 않음
+    foods = lazy_cards(lambda: [
+        food_to_dict(food, user=request.user, favorite_ids=favorite_ids) for food in filtered_list
+    ])
+    context = {"foods": foods, "keyword": keyword, "cards_key": card_grid_key(food_ids, favorite_ids)}
+
+    response = render(request, "search/search_page.html", context)
+    record_cards('search_cards', foods)
+    return response
 
 #실제 검색 기능을 구현한 뷰
 #Ajax 쓰라는 의미에서 JsonResponse로 드렸습니다 ^^
-def normal_search(request):
+@catalog_conditional(json=True)
+async def normal_search(request):
     keyword = request.GET.get('keyword')
     page = int(request.GET.get('page', 1))
     limit = int(request.GET.get('limit', 30))
@@ -131,22 +161,31 @@ def normal_search(request):
     # 페이지네이션 적용
     start_index = (page - 1) * limit
     end_index = start_index + limit
-    paginated_list = filtered_list[start_index:end_index]
+    paginated_list = [food async for food in filtered_list[start_index:end_index]]
 
     # 반환 값을 구성하는 부분
-    context = {"foods": foods_to_dict(paginated_list, request.user)}
+    context = {"foods": await afoods_to_dict(paginated_list, await request.auser())}
 
     # to FE: AJAX로 검색 결과를 노출해야 하므로 Json 데이터를 반환하게 구현했습니다.
     # to FE: 만약 렌더링 해야 할 페이지가 따로 있다면 얘기해주세요!!
     return JsonResponse(context, json_dumps_params={'ensure_ascii': False})
 
+RECOMMEND_ROTATE_SECONDS = 600
+
+def recommend_window(request):
+    # 추천 묶음은 10분 구간마다 바뀜 → 같은 구간 안에서는 같은 응답이라 ETag/proxy 캐시가 가능
+    return [int(time.time() // RECOMMEND_ROTATE_SECONDS)]
+
 #추천 제품 페이지 렌더링 뷰
 #영양 점수가 높은 음식들을 랜덤으로 선택해서 프론트로 전달합니다!
+@catalog_conditional(extra=recommend_window)
 def search_before(request):
     
-    top_foods = list(Food.objects.order_by('-nutrition_score')[:50]) # 영양 점수가 높은 식품이 앞에 오도록 정렬
+    top_foods = list(get_snapshot().top_foods) # 영양 점수가 높은 식품이 앞에 오도록 정렬 (카탈로그 스냅샷)
 
-    random_foods = random.sample(top_foods, min(10, len(top_foods)))
+    # 구간 + 카탈로그 버전을 시드로 써서 같은 구간에는 같은 식품을 보여줌
+    rng = random.Random(f"{catalog_version()}:{recommend_window(request)[0]}")
+    random_foods = rng.sample(top_foods, min(10, len(top_foods)))
 
     # 반환할 값 구성하는 부분
     context = {"foods":foods_to_dict(random_foods, request.user)}
@@ -235,19 +274,18 @@ def advanced_search_page(request):
         append_order(ORDER_BY, fat_evaluation, 'fat')
         append_order(ORDER_BY, salt_evaluation, 'salt')
 
-        # 페이지네이션 적용
+        # 페이지네이션 적용 (limit + 1개를 가져와서 다음 페이지가 있는지 확인 → COUNT 쿼리 없음)
         start = (page - 1) * limit
-        end = start + limit
-        foods_sorted = Food.objects.order_by(*ORDER_BY)[start:end]
+        foods_sorted = list(Food.objects.order_by(*ORDER_BY)[start:start + limit + 1])
+        has_more = len(foods_sorted) > limit
 
-        foods_data = []
-        for food in foods_sorted:
-            foods_data.append(food_to_dict(food))
+        # 즐겨찾기 여부는 foods_to_dict에서 한 번에 조회
+        foods_data = foods_to_dict(foods_sorted[:limit], request.user)
         
         return JsonResponse({
             'foods': foods_data,
             'page': page,
-            'has_more': foods_sorted.count() == limit
+            'has_more': has_more
         })
 
     # 일반 HTML 요청 처리 (기존 로직)
@@ -412,6 +450,8 @@ def search_refine(request):
 
     # 1) 토큰이 있으면 캐시에서 베이스 ID 목록 복구
     ids = cache.get(f'search:{request.user.id}:{token}') if token else None
+    if token:
+        record_cache('search_token', ids is not None)
 
     # 2) 없으면 새로 초기화(키워드가 없어도 전체셋으로 가능)
     if ids is None: